@@ -1,63 +1,35 @@
-import json
-import re
+"""
+Strict hidden prerequisite check: Python keywords in starter/solution code.
 
-# Load data
-base_path = '/Users/elijahang/Python-Game-2/frontend/public/data/'
-with open(base_path + 'lessons.json', 'r') as f:
-    lessons = json.load(f)
-with open(base_path + 'course-python-basics.json', 'r') as f:
-    python_course = json.load(f)
+Like audit_curriculum.py, but only reports language keywords (if, for, def,
+import, ...), the concepts the original keyword table covered. The concept
+graph (scripts/concept_graph.py) lexes code with the tokenize module, so
+keywords in comments and strings are never counted. Run from the repo root.
+"""
 
-# Concept Map (Keyword -> Earliest Valid Chapter Index)
-# 0: Variables
-# 1: Logic
-# 2: Loops
-# 3: Functions
-# 5: Data Structures
-# 7: Modules
-keyword_to_min_chapter_idx = {
-    'if': 1, 'else': 1, 'elif': 1,
-    'for': 2, 'while': 2, 'break': 2, 'continue': 2,
-    'def': 3, 'return': 3, 'lambda': 3,
-    'import': 7, 
-}
+import keyword
+import sys
+from pathlib import Path
 
-# Chapter sequence mapping
-chapter_sequence = {}
-for idx, chapter in enumerate(python_course['chapters']):
-    chapter_sequence[chapter['id']] = idx
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
 
-issues = []
+from concept_graph import concept_graph  # noqa: E402
+from lesson_store import LessonStore  # noqa: E402
 
-for lesson_id, lesson in lessons.items():
-    if not lesson.get('chapter_id'): continue
-    if int(lesson_id) >= 1000: continue # Skip SQL/R for now
+store = LessonStore.load()
+graph = concept_graph(store)
 
-    chapter_id = lesson['chapter_id']
-    if chapter_id not in chapter_sequence: continue
-    
-    current_idx = chapter_sequence[chapter_id]
-    
-    # CHECK ONLY CODE FIELDS
-    code_content = (lesson.get('starter_code', '') + '\n' + lesson.get('solution_code', ''))
-    
-    # Remove comments from code
-    code_content = re.sub(r'#.*', '', code_content)
-    
-    for keyword, min_idx in keyword_to_min_chapter_idx.items():
-        if min_idx > current_idx:
-            # Found a future keyword in CODE!
-            if re.search(r'\b' + re.escape(keyword) + r'\b', code_content):
-                issues.append({
-                    'lesson': lesson_id,
-                    'title': lesson['title'],
-                    'chapter': chapter_id,
-                    'current_idx': current_idx,
-                    'keyword': keyword,
-                    'min_idx': min_idx,
-                    'snippet': code_content[:500] # Debug
-                })
+issues = []
+for lesson_id, lesson in store.ordered_lessons('python'):
+    for concept in sorted(graph.hidden_prerequisites(lesson_id)):
+        if keyword.iskeyword(concept):
+            issues.append({
+                'lesson': lesson_id,
+                'title': lesson['title'],
+                'keyword': concept,
+                'introduced_in': graph.introduced_in(lesson_id, concept),
+            })
 
 print(f"Found {len(issues)} code issues.")
 for i in issues:
-    print(f"Lesson {i['lesson']} '{i['title']}' uses '{i['keyword']}' (Intro at Index {i['min_idx']})")
+    print(f"Lesson {i['lesson']} '{i['title']}' uses '{i['keyword']}' (taught in lesson {i['introduced_in'] or '-'})")
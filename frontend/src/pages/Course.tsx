@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import { ChevronDown, ChevronUp, Trophy } from 'lucide-react';
+import { fetchDataFile } from '../utils/dataFiles';
 
 interface LessonItem {
     id: number;
@@ -37,8 +38,7 @@ export const Course: React.FC = () => {
     const [expandedChapter, setExpandedChapter] = useState<number | null>(1);
 
     useEffect(() => {
-        fetch(`${import.meta.env.BASE_URL}data/course-${slug}.json?t=${Date.now()}`)
-            .then(res => res.json())
+        fetchDataFile<CourseDetails>(`course-${slug}.json`)
             .then(data => setCourse(data))
             .catch(err => console.error(err));
     }, [slug]);
@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { Play, Lock } from 'lucide-react';
+import { fetchDataFile } from '../utils/dataFiles';
 
 interface Course {
     id: number;
@@ -16,8 +17,7 @@ export const Dashboard: React.FC = () => {
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        fetch(`${import.meta.env.BASE_URL}data/courses.json?t=${Date.now()}`)
-            .then(res => res.json())
+        fetchDataFile<Course[]>('courses.json')
             .then(data => {
                 setCourses(data);
                 setLoading(false);
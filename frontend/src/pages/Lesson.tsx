@@ -7,7 +7,8 @@ import remarkGfm from 'remark-gfm';
 import rehypeRaw from 'rehype-raw';
 import { InteractiveProvider, useInteractive } from '../context/InteractiveContext';
 import confetti from 'canvas-confetti';
-import { verifyCode, verifySql, verifyR } from '../utils/verifier';
+import { verifyCode, verifySql, verifyR, type ExpectedResult } from '../utils/verifier';
+import { fetchDataFile, fetchLesson } from '../utils/dataFiles';
 
 interface LessonData {
     id: number;
@@ -16,6 +17,7 @@ interface LessonData {
     starter_code: string;
     solution_code: string;
     expected_output: string;
+    expected_result?: ExpectedResult;
     chapter_id: number;
     concept_tags?: string[];
 }
@@ -190,9 +192,7 @@ const LessonContent: React.FC = () => {
         const loadLessonData = async () => {
             try {
                 // Fetch lesson content
-                const lessonsRes = await fetch(`${import.meta.env.BASE_URL}data/lessons.json?t=${Date.now()}`);
-                const lessonsData = await lessonsRes.json();
-                const lessonData = lessonsData[id as string];
+                const lessonData = await fetchLesson<LessonData>(id as string);
 
                 if (lessonData) {
                     setLesson(lessonData);
@@ -222,11 +222,11 @@ const LessonContent: React.FC = () => {
                     }
 
                     // Fetch course data to get the lesson order
-                    let courseFile = `${import.meta.env.BASE_URL}data/course-python-basics.json`;
-                    if (isSql) courseFile = `${import.meta.env.BASE_URL}data/course-sql-fundamentals.json`;
-                    if (isR) courseFile = `${import.meta.env.BASE_URL}data/course-r-fundamentals.json`;
-                    const courseRes = await fetch(`${courseFile}?t=${Date.now()}`);
-                    const courseData = await courseRes.json();
+                    let courseFile = 'course-python-basics.json';
+                    if (isSql) courseFile = 'course-sql-fundamentals.json';
+                    if (isR) courseFile = 'course-r-fundamentals.json';
+                    // eslint-disable-next-line @typescript-eslint/no-explicit-any
+                    const courseData = await fetchDataFile<any>(courseFile);
 
                     // Build ordered list of lesson IDs from course structure
                     const orderedIds: number[] = [];
@@ -530,10 +530,11 @@ ${code}
 
         let result;
         if (isSql) {
-            // For SQL, compare user code against solution code
+            // For SQL, compare user code against solution code and its result's columns
             result = verifySql(
                 lesson?.solution_code || '',
-                code
+                code,
+                lesson?.expected_result
             );
         } else if (currentId >= 2000) {
             // For R, run code and compare output
@@ -545,12 +546,13 @@ ${code}
                 !!graphOutput
             );
         } else {
-            // For Python, run code and compare output
+            // For Python, run code and compare output with the solution's
             const executionOutput = await runCode();
-            result = verifyCode(
+            result = await verifyCode(
                 lesson?.expected_output || '',
                 executionOutput,
-                code
+                code,
+                lesson?.expected_result
             );
         }
 
@@ -0,0 +1,49 @@
+// Loads lesson and course data through the sharded export
+// (scripts/export_lesson_shards.py): a small manifest maps lesson ids to
+// content-hashed per-lesson shards and data files to hashed copies, which
+// never change and can be cached forever. Only production builds use it:
+// prebuild leaves an export in public/ that the dev server would keep serving
+// after lessons.json changes, so dev (and a build without an export) reads the
+// unsharded files, cache-busted on every request.
+
+interface DataManifest {
+    version: number;
+    lessons: Record<string, string>;
+    files: Record<string, string>;
+}
+
+const DATA_URL = `${import.meta.env.BASE_URL}data/`;
+const SHARDS_URL = `${DATA_URL}shards/`;
+
+let manifestPromise: Promise<DataManifest | null> | null = null;
+
+function loadManifest(): Promise<DataManifest | null> {
+    if (!import.meta.env.PROD) return Promise.resolve(null);
+    if (!manifestPromise) {
+        // Revalidate the manifest; everything it points to is immutable
+        manifestPromise = fetch(`${SHARDS_URL}manifest.json`, { cache: 'no-cache' })
+            .then(res => (res.ok ? res.json() : null))
+            .catch(() => null);
+    }
+    return manifestPromise;
+}
+
+export async function fetchLesson<T>(id: string): Promise<T | undefined> {
+    const manifest = await loadManifest();
+    if (manifest) {
+        const hash = manifest.lessons[id];
+        if (!hash) return undefined;
+        const res = await fetch(`${SHARDS_URL}lessons/${id}.${hash}.json`);
+        return res.json();
+    }
+    const res = await fetch(`${DATA_URL}lessons.json?t=${Date.now()}`);
+    const lessons = await res.json();
+    return lessons[id];
+}
+
+export async function fetchDataFile<T>(name: string): Promise<T> {
+    const manifest = await loadManifest();
+    const hashed = manifest?.files[name];
+    const res = await fetch(hashed ? `${SHARDS_URL}${hashed}` : `${DATA_URL}${name}?t=${Date.now()}`);
+    return res.json();
+}
@@ -8,6 +8,19 @@ interface VerifyResult {
     expectedVsActual?: { expected: string; actual: string };
 }
 
+// What the lesson's solution produced when the site was built
+// (scripts/build_expected_outputs.py): Python stdout ("stdout"), an SQL
+// result as a text table ("table") or an R plot ("plot"). Long outputs
+// ship as their hash only.
+export interface ExpectedResult {
+    kind: 'stdout' | 'table' | 'plot';
+    hash: string;
+    output?: string;
+}
+
+// Must match HASH_LENGTH in scripts/build_expected_outputs.py
+const RESULT_HASH_LENGTH = 16;
+
 // ============ SQL VERIFICATION ============
 
 // Normalize SQL query for comparison
@@ -68,7 +81,8 @@ function extractAfter(str: string, keyword: string): string {
 // Main SQL verification function
 export function verifySql(
     solutionCode: string,
-    userCode: string
+    userCode: string,
+    expectedResult?: ExpectedResult
 ): VerifyResult {
     // Basic checks
     if (!userCode || userCode.trim().length < 5 || userCode.trim() === '-- Write your SQL here') {
@@ -130,6 +144,19 @@ export function verifySql(
         }
     }
 
+    // Check the columns the query returns against the solution's result
+    const resultColumns = expectedColumns(expectedResult);
+    const userColumns = resultColumnNames(userCode);
+    if (userColumns && resultColumns.length > 0 && resultColumns.every(c => /^[A-Za-z_][A-Za-z0-9_]*$/.test(c))) {
+        if (userColumns.join(',') !== resultColumns.map(c => c.toLowerCase()).join(',')) {
+            return {
+                correct: false,
+                feedback: "Your query returns different columns than the expected result.",
+                suggestions: [`The result should have the columns: ${resultColumns.join(', ')}`]
+            };
+        }
+    }
+
     // Check table names
     if (solutionStructure.tables.length > 0 && userStructure.tables.length > 0) {
         const solutionTable = solutionStructure.tables[0];
@@ -174,6 +201,56 @@ export function verifySql(
     };
 }
 
+// Column names of the expected result table's header line
+function expectedColumns(expectedResult?: ExpectedResult): string[] {
+    if (expectedResult?.kind !== 'table' || !expectedResult.output) return [];
+    return expectedResult.output.split('\n')[0].split(' | ').map(c => c.trim());
+}
+
+// Split the select list at top-level commas, up to the top-level FROM
+function selectListItems(normalized: string): string[] | null {
+    const start = /^select\s+(distinct\s+)?/.exec(normalized);
+    if (!start) return null;
+    const items: string[] = [];
+    let depth = 0;
+    let quoted = false;
+    let itemStart = start[0].length;
+    let end = normalized.length;
+    for (let i = itemStart; i < normalized.length; i++) {
+        const char = normalized[i];
+        if (char === "'") quoted = !quoted;
+        if (quoted) continue;
+        if (char === '(') depth++;
+        else if (char === ')') depth--;
+        else if (depth === 0 && char === ',') {
+            items.push(normalized.slice(itemStart, i).trim());
+            itemStart = i + 1;
+        } else if (depth === 0 && normalized.startsWith(' from ', i)) {
+            end = i;
+            break;
+        }
+    }
+    items.push(normalized.slice(itemStart, end).trim());
+    return items;
+}
+
+// Names of the columns a query returns, or null when the database would
+// have to name one (SELECT *, unaliased expressions, compound queries)
+function resultColumnNames(sql: string): string[] | null {
+    const normalized = normalizeSql(sql);
+    if (/\b(union|intersect|except)\b/.test(normalized)) return null;
+    const items = selectListItems(normalized);
+    if (!items) return null;
+    const names: string[] = [];
+    for (const item of items) {
+        const name = /\sas\s+'?([a-z_][a-z0-9_]*)'?$/.exec(item)?.[1]
+            ?? /^(?:[a-z_][a-z0-9_]*\.)?([a-z_][a-z0-9_]*)$/.exec(item)?.[1];
+        if (!name) return null;
+        names.push(name);
+    }
+    return names;
+}
+
 function arraysMatch(a: string[], b: string[]): boolean {
     if (a.length !== b.length) return false;
     const setA = new Set(a);
@@ -358,60 +435,35 @@ function generateComparisonFeedback(expected: string, actual: string): string[]
     return suggestions;
 }
 
-// Main verification function
-export function verifyCode(
-    expectedOutput: string,
-    actualOutput: string,
-    userCode: string
-): VerifyResult {
-    // Check for errors first
-    if (isErrorOutput(actualOutput)) {
-        const errorType = extractErrorType(actualOutput);
-        return {
-            correct: false,
-            feedback: `Your code has an error: ${errorType}`,
-            suggestions: getErrorSuggestions(errorType)
-        };
-    }
-
-    // Check if code is too short
-    if (userCode.trim().length < 10) {
-        return {
-            correct: false,
-            feedback: "It looks like you haven't written any code yet!",
-            suggestions: ["Read the instructions on the left", "Write code to solve the task"]
-        };
-    }
-
-    // Special handling for graph exercises
-    if (isGraphExercise(expectedOutput)) {
-        const graphResult = validateGraphCode(userCode);
-        if (graphResult) return graphResult;
+// Same normalization as canonical_stdout in scripts/build_expected_outputs.py
+function canonicalOutput(output: string): string {
+    return output
+        .replace("✓ Code executed successfully (no output)", "")
+        .replace(/^\n+|\n+$/g, '')
+        .split(/\r?\n|\r/)
+        .map(line => line.trimEnd())
+        .join('\n');
+}
 
-        // Graph code is valid
-        return {
-            correct: true,
-            feedback: "Great job! Your graph looks good! 🎉",
-            suggestions: []
-        };
-    }
+// crypto.subtle only exists in secure contexts (HTTPS or localhost); a site
+// served over plain HTTP, e.g. on a LAN address, has no way to hash
+async function resultHash(text: string): Promise<string | null> {
+    if (!globalThis.crypto?.subtle) return null;
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+    return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('').slice(0, RESULT_HASH_LENGTH);
+}
 
-    // No expected output - just check if code ran
-    if (!expectedOutput || expectedOutput === "Run your code to see the output!") {
-        if (actualOutput && !isErrorOutput(actualOutput)) {
-            return {
-                correct: true,
-                feedback: "Your code ran successfully! 🎉",
-                suggestions: []
-            };
-        }
-        return {
-            correct: false,
-            feedback: "Your code didn't produce any output.",
-            suggestions: ["Make sure to use print() to display results"]
-        };
-    }
+// Does the output equal what the solution printed? Long outputs ship as a hash
+// only; null when that hash can't be computed here
+async function matchesExpectedResult(expectedResult: ExpectedResult, actualOutput: string): Promise<boolean | null> {
+    const actual = canonicalOutput(actualOutput);
+    if (expectedResult.output !== undefined) return actual === expectedResult.output;
+    const hash = await resultHash(actual);
+    return hash === null ? null : hash === expectedResult.hash;
+}
 
+// Grade an output against an expected one, with feedback on near misses
+function gradeOutput(expectedOutput: string, actualOutput: string): VerifyResult {
     // Compare outputs with STRICTER matching
     const { match, percent, exactMatch } = compareOutputs(expectedOutput, actualOutput);
 
@@ -461,6 +513,86 @@ export function verifyCode(
         };
     }
 }
+
+// Main verification function
+export async function verifyCode(
+    expectedOutput: string,
+    actualOutput: string,
+    userCode: string,
+    expectedResult?: ExpectedResult
+): Promise<VerifyResult> {
+    // Check for errors first
+    if (isErrorOutput(actualOutput)) {
+        const errorType = extractErrorType(actualOutput);
+        return {
+            correct: false,
+            feedback: `Your code has an error: ${errorType}`,
+            suggestions: getErrorSuggestions(errorType)
+        };
+    }
+
+    // Check if code is too short
+    if (userCode.trim().length < 10) {
+        return {
+            correct: false,
+            feedback: "It looks like you haven't written any code yet!",
+            suggestions: ["Read the instructions on the left", "Write code to solve the task"]
+        };
+    }
+
+    // Special handling for graph exercises
+    if (isGraphExercise(expectedOutput)) {
+        const graphResult = validateGraphCode(userCode);
+        if (graphResult) return graphResult;
+
+        // Graph code is valid
+        return {
+            correct: true,
+            feedback: "Great job! Your graph looks good! 🎉",
+            suggestions: []
+        };
+    }
+
+    // Compare against what the lesson's solution printed; if its hash can't be
+    // checked, grade against the authored expected output below instead
+    const matched = expectedResult?.kind === 'stdout' ? await matchesExpectedResult(expectedResult, actualOutput) : null;
+    if (expectedResult && matched !== null) {
+        if (matched) {
+            return {
+                correct: true,
+                feedback: "Perfect! Your output matches exactly! 🎉",
+                suggestions: []
+            };
+        }
+        if (expectedResult.output) return gradeOutput(expectedResult.output, actualOutput);
+        return {
+            correct: false,
+            feedback: "Your output doesn't match the expected result.",
+            suggestions: [
+                "Read the instructions carefully",
+                "Make sure you're using the correct values and operations"
+            ]
+        };
+    }
+
+    // No expected output - just check if code ran
+    if (!expectedOutput || expectedOutput === "Run your code to see the output!") {
+        if (actualOutput && !isErrorOutput(actualOutput)) {
+            return {
+                correct: true,
+                feedback: "Your code ran successfully! 🎉",
+                suggestions: []
+            };
+        }
+        return {
+            correct: false,
+            feedback: "Your code didn't produce any output.",
+            suggestions: ["Make sure to use print() to display results"]
+        };
+    }
+
+    return gradeOutput(expectedOutput, actualOutput);
+}
 // ============ R VERIFICATION ============
 
 // Check if R code is missing assignment or pipe
@@ -5,6 +5,8 @@ This will update both lessons.json and course-python-basics.json.
 import json
 import os
 
+from lesson_patches import PatchSet, apply_patch_sets
+
 # Define paths
 LESSONS_PATH = "/Users/elijahang/Python-Game-2/frontend/public/data/lessons.json"
 COURSE_PATH = "/Users/elijahang/Python-Game-2/frontend/public/data/course-python-basics.json"
@@ -1363,29 +1365,16 @@ else:
     }
 }
 
+PATCHES = PatchSet("add_curriculum_chapters")
+for lesson_id, lesson in {**OOP_LESSONS, **ERROR_HANDLING_LESSONS}.items():
+    PATCHES.set(lesson_id, lesson)
+
 def update_lessons_json():
     """Add new lessons to lessons.json"""
-    print("Loading lessons.json...")
-    with open(LESSONS_PATH, 'r') as f:
-        lessons = json.load(f)
-    
-    print(f"Current lesson count: {len(lessons)}")
-    
-    # Add OOP lessons
-    for lesson_id, lesson in OOP_LESSONS.items():
-        lessons[lesson_id] = lesson
+    print("Patching lessons.json...")
+    apply_patch_sets([PATCHES], LESSONS_PATH)
+    for lesson_id, lesson in {**OOP_LESSONS, **ERROR_HANDLING_LESSONS}.items():
         print(f"  Added lesson {lesson_id}: {lesson['title']}")
-    
-    # Add Error Handling lessons
-    for lesson_id, lesson in ERROR_HANDLING_LESSONS.items():
-        lessons[lesson_id] = lesson
-        print(f"  Added lesson {lesson_id}: {lesson['title']}")
-    
-    print(f"New lesson count: {len(lessons)}")
-    
-    # Save
-    with open(LESSONS_PATH, 'w') as f:
-        json.dump(lessons, f, indent=2)
     print("✅ lessons.json updated!")
 
 def update_course_json():
@@ -3,6 +3,8 @@ Script to add SQL Database Design and Advanced Objects chapters.
 """
 import json
 
+from lesson_patches import PatchSet, apply_patch_sets
+
 LESSONS_PATH = "/Users/elijahang/Python-Game-2/frontend/public/data/lessons.json"
 COURSE_PATH = "/Users/elijahang/Python-Game-2/frontend/public/data/course-sql-fundamentals.json"
 
@@ -889,28 +891,16 @@ Print understanding of SQL injection prevention.
     }
 }
 
+PATCHES = PatchSet("add_sql_chapters")
+for lesson_id, lesson in {**SQL_DB_DESIGN_LESSONS, **SQL_ADVANCED_LESSONS}.items():
+    PATCHES.set(lesson_id, lesson)
+
 def update_sql_curriculum():
     """Add new SQL lessons"""
-    print("Loading lessons.json...")
-    with open(LESSONS_PATH, 'r') as f:
-        lessons = json.load(f)
-    
-    print(f"Current lesson count: {len(lessons)}")
-    
-    # Add SQL Database Design lessons
-    for lesson_id, lesson in SQL_DB_DESIGN_LESSONS.items():
-        lessons[lesson_id] = lesson
+    print("Patching lessons.json...")
+    apply_patch_sets([PATCHES], LESSONS_PATH)
+    for lesson_id, lesson in {**SQL_DB_DESIGN_LESSONS, **SQL_ADVANCED_LESSONS}.items():
         print(f"  Added lesson {lesson_id}: {lesson['title']}")
-    
-    # Add SQL Advanced lessons
-    for lesson_id, lesson in SQL_ADVANCED_LESSONS.items():
-        lessons[lesson_id] = lesson
-        print(f"  Added lesson {lesson_id}: {lesson['title']}")
-    
-    print(f"New lesson count: {len(lessons)}")
-    
-    with open(LESSONS_PATH, 'w') as f:
-        json.dump(lessons, f, indent=2)
     print("✅ lessons.json updated!")
 
 def update_sql_course():
@@ -0,0 +1,255 @@
+"""
+Curriculum Audit Engine
+
+Runs every audit rule in a single traversal of lessons.json. Each lesson is
+parsed once into an AuditLesson (text, code, section outline from
+lesson_sections.py, chapter position) and handed to every registered rule
+that applies to its curriculum. Findings from
+all rules go to one machine-readable file, scripts/audit_findings.json.
+
+Most rules only look at the lesson itself. Rules registered with
+``corpus=True`` also depend on other lessons (course order, reinforcer
+sets). Given the ids of the lessons that changed since the last run (the
+pipeline passes them), only corpus rules run over every lesson; per-lesson
+rules rerun for the changed lessons and keep the previous findings for the
+rest, so the output matches a full run.
+
+Rules ported from:
+- batch_c_quality_audit.py: numbered_steps, expected_output, common_mistake
+- verify_batch_r1.py / verify_batch_r2.py: required_headers, solution_leakage
+- audit_curriculum.py / audit_curriculum_strict.py: future_keyword, now a lookup
+  in the concept graph (concept_graph.py) instead of a keyword table
+- r_reinforcer_integrity.py: reinforcer_count
+
+Usage:
+    python scripts/audit_engine.py                     # all rules
+    python scripts/audit_engine.py required_headers    # selected rules
+"""
+
+import json
+import re
+import sys
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from concept_graph import concept_graph
+from lesson_sections import LessonOutline, outline
+from lesson_store import LessonStore, curriculum_for, is_reinforcer_id
+
+FINDINGS_PATH = Path("scripts/audit_findings.json")
+
+REQUIRED_HEADERS = [
+    "What You'll Learn", "Why This Matters", "Example", "Your Task",
+    "Expected Output", "Common Mistake", "No Hidden Prerequisites"
+]
+
+# Prose phrases that count as an expected output when no heading or label does
+EXPECTED_OUTPUT_PHRASES = re.compile(r'should see|will output|returns:', re.IGNORECASE)
+COMMON_MISTAKE_MARKERS = ['⚠️', 'Wrong:', 'Careful:', 'Gotcha:']
+NUMBERED_STEP_RE = re.compile(r'^\s*\d+[.)]\s', re.MULTILINE)
+
+Finding = Dict[str, Any]
+
+
+class AuditLesson:
+    """Parsed view of one lesson, shared by every rule."""
+
+    def __init__(self, lesson_id: int, lesson: Dict[str, Any], store: LessonStore):
+        self.id = lesson_id
+        self.lesson = lesson
+        self.store = store
+        self.curriculum = curriculum_for(lesson_id)
+        self.title = lesson.get('title', '')
+        self.title_lower = self.title.lower()
+        self.content = lesson.get('content', '') or ''
+        self.content_lower = self.content.lower()
+        self.starter_code = lesson.get('starter_code', '') or ''
+        self.solution_code = lesson.get('solution_code', '') or ''
+
+        chapter_id = lesson.get('chapter_id')
+        self.chapter_idx = store.chapter_index(self.curriculum, chapter_id) if chapter_id else None
+
+    # Parsed on first use, so corpus rules over unchanged lessons skip it
+    @cached_property
+    def sections(self) -> LessonOutline:
+        return outline(self.content)
+
+    @cached_property
+    def headers(self) -> List[str]:
+        return self.sections.titles
+
+    @cached_property
+    def code_blocks(self) -> List[Tuple[str, str]]:
+        return [(block.language, block.code) for block in self.sections.code_blocks]
+
+    @property
+    def is_r_concept(self) -> bool:
+        return self.curriculum == 'r' and not is_reinforcer_id(self.id)
+
+    @property
+    def is_r_reinforcer(self) -> bool:
+        return is_reinforcer_id(self.id)
+
+
+RuleFunc = Callable[[AuditLesson], Iterable[Finding]]
+RULES: Dict[str, Tuple[Tuple[str, ...], RuleFunc]] = {}
+# Rules whose findings for a lesson depend on other lessons
+CORPUS_RULES: Set[str] = set()
+
+
+def rule(name: str, curricula: Tuple[str, ...] = ('python', 'sql', 'r'),
+         corpus: bool = False) -> Callable[[RuleFunc], RuleFunc]:
+    """Register an audit rule for the given curricula."""
+    def register(func: RuleFunc) -> RuleFunc:
+        RULES[name] = (curricula, func)
+        if corpus:
+            CORPUS_RULES.add(name)
+        return func
+    return register
+
+
+def finding(message: str, severity: str = 'warning', **details: Any) -> Finding:
+    return {'severity': severity, 'message': message, **details}
+
+
+@rule('numbered_steps')
+def check_numbered_steps(lesson: AuditLesson) -> Iterable[Finding]:
+    if lesson.content and not NUMBERED_STEP_RE.search(lesson.sections.prose):
+        yield finding('No numbered steps', severity='info')
+
+
+@rule('expected_output')
+def check_expected_output(lesson: AuditLesson) -> Iterable[Finding]:
+    sections = lesson.sections
+    if not lesson.content or sections.has('output') or sections.find_label('expected'):
+        return
+    if not EXPECTED_OUTPUT_PHRASES.search(sections.prose):
+        yield finding('No expected output section')
+
+
+@rule('common_mistake')
+def check_common_mistake(lesson: AuditLesson) -> Iterable[Finding]:
+    sections = lesson.sections
+    if not lesson.content or sections.has('common mistake'):
+        return
+    if not any(marker in sections.prose for marker in COMMON_MISTAKE_MARKERS):
+        yield finding('No common mistake section', severity='info')
+
+
+@rule('required_headers', curricula=('r',))
+def check_required_headers(lesson: AuditLesson) -> Iterable[Finding]:
+    if not lesson.is_r_reinforcer:
+        return
+    missing = lesson.sections.missing(REQUIRED_HEADERS)
+    if missing:
+        yield finding(f'Missing {len(missing)} required headers', severity='error', missing=missing)
+
+
+@rule('solution_leakage', curricula=('r',))
+def check_solution_leakage(lesson: AuditLesson) -> Iterable[Finding]:
+    if not lesson.is_r_reinforcer:
+        return
+    if 'Solution:' in lesson.content or 'Solution Code:' in lesson.content:
+        yield finding('Solution shown in lesson content', severity='error')
+    elif 'challenge' in lesson.title_lower and 'solution_code' in lesson.content_lower:
+        yield finding('Challenge content references solution_code', severity='error')
+
+
+@rule('future_keyword', corpus=True)
+def check_future_keywords(lesson: AuditLesson) -> Iterable[Finding]:
+    graph = concept_graph(lesson.store)
+    for concept in sorted(graph.hidden_prerequisites(lesson.id)):
+        introduced = graph.introduced_in(lesson.id, concept)
+        where = f'lesson {introduced}' if introduced is not None else 'no lesson'
+        yield finding(f"Uses '{concept}' before it is taught ({where})", concept=concept, introduced_in=introduced)
+
+
+@rule('reinforcer_count', curricula=('r',), corpus=True)
+def check_reinforcer_count(lesson: AuditLesson) -> Iterable[Finding]:
+    if not lesson.is_r_concept:
+        return
+    count = len(lesson.store.reinforcers.get(lesson.id, []))
+    if count != 4:
+        yield finding(f'Has {count} reinforcers, expected 4', severity='error' if count < 4 else 'info', count=count)
+
+
+def run_audit(store: LessonStore, rule_names: Optional[Iterable[str]] = None,
+              previous: Optional[List[Finding]] = None, changed: Optional[Set[int]] = None) -> List[Finding]:
+    """Run the selected rules (default: all) in one pass over the corpus.
+
+    With ``previous`` findings from a run of the same rules and the
+    ``changed`` lesson ids since then, per-lesson rules reuse the previous
+    findings of unchanged lessons.
+    """
+    names = list(rule_names) if rule_names else list(RULES)
+    unknown = [name for name in names if name not in RULES]
+    if unknown:
+        raise SystemExit(f"Unknown rules: {', '.join(unknown)} (known: {', '.join(RULES)})")
+
+    by_curriculum: Dict[str, List[Tuple[str, RuleFunc]]] = {}
+    for name in names:
+        curricula, func = RULES[name]
+        for curriculum in curricula:
+            by_curriculum.setdefault(curriculum, []).append((name, func))
+
+    reusable: Optional[Dict[Tuple[int, str], List[Finding]]] = None
+    if previous is not None and changed is not None:
+        reusable = {}
+        for item in previous:
+            reusable.setdefault((item['lesson_id'], item['rule']), []).append(item)
+
+    findings: List[Finding] = []
+    for curriculum, rules in by_curriculum.items():
+        for lesson_id, lesson in store.curriculum_lessons(curriculum):
+            parsed = AuditLesson(lesson_id, lesson, store)
+            for name, func in rules:
+                if reusable is not None and name not in CORPUS_RULES and lesson_id not in changed:
+                    findings.extend(reusable.get((lesson_id, name), []))
+                    continue
+                for item in func(parsed):
+                    findings.append({'lesson_id': lesson_id, 'title': parsed.title, 'rule': name, **item})
+    return findings
+
+
+def summarize(findings: List[Finding]) -> Dict[str, Any]:
+    by_rule: Dict[str, int] = {}
+    by_severity: Dict[str, int] = {}
+    for item in findings:
+        by_rule[item['rule']] = by_rule.get(item['rule'], 0) + 1
+        by_severity[item['severity']] = by_severity.get(item['severity'], 0) + 1
+    return {'total_findings': len(findings), 'by_rule': by_rule, 'by_severity': by_severity}
+
+
+def load_previous(rule_names: List[str]) -> Optional[List[Finding]]:
+    """Findings of the last run, if it ran exactly these rules."""
+    if not FINDINGS_PATH.exists():
+        return None
+    try:
+        previous = json.loads(FINDINGS_PATH.read_text())
+    except ValueError:
+        return None
+    return previous['findings'] if previous.get('rules') == rule_names else None
+
+
+def main(changed_ids: Optional[Iterable[str]] = None) -> None:
+    """Audit the corpus; ``changed_ids`` (lesson id strings, passed by the
+    pipeline) limits per-lesson rules to those lessons."""
+    rule_names = [arg for arg in sys.argv[1:] if not arg.startswith('--')] or list(RULES)
+    store = LessonStore.load()
+    previous = load_previous(rule_names) if changed_ids is not None else None
+    changed = {int(lesson_id) for lesson_id in changed_ids} if changed_ids is not None else None
+    findings = run_audit(store, rule_names, previous, changed)
+    output = {'summary': summarize(findings), 'rules': rule_names, 'findings': findings}
+    FINDINGS_PATH.write_text(json.dumps(output, indent=2, ensure_ascii=False))
+
+    print("=" * 60)
+    print("CURRICULUM AUDIT")
+    print("=" * 60)
+    for name, count in sorted(output['summary']['by_rule'].items()):
+        print(f"  {name:<20} {count}")
+    print(f"\nTotal findings: {len(findings)} -> {FINDINGS_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,8 @@ reads lesson content to enable scoring.
 import json
 from pathlib import Path
 
+from lesson_store import curriculum_for, is_reinforcer_id
+
 def load_r_course_structure():
     """Load the R course structure file."""
     with open('frontend/public/data/course-r-fundamentals.json', 'r') as f:
@@ -42,9 +44,9 @@ def extract_concept_reinforcer_mappings(course_data):
                 lesson = lessons[i]
                 lesson_id = lesson['id']
                 
-                # A concept lesson has a 4-digit ID starting with 2
+                # A concept lesson is any R id that is not a reinforcer id
                 # Check if next 4 lessons are reinforcers
-                if 2000 <= lesson_id <= 2999:  # Main concept lesson
+                if curriculum_for(lesson_id) == 'r' and not is_reinforcer_id(lesson_id):  # Main concept lesson
                     reinforcers = []
                     
                     # Look for the next 4 lessons as potential reinforcers
@@ -3,39 +3,33 @@ Batch C: Mass Quality Update
 Add numbered steps, expected output, and common mistakes where missing
 """
 
-import json
 import re
 
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+from lesson_sections import outline
+from lesson_store import LessonStore
+
+lessons = LessonStore.load().lessons
+
+EXPECTED_OUTPUT_PHRASES = re.compile(r'should see|will output|returns:', re.IGNORECASE)
+COMMON_MISTAKE_MARKERS = ['⚠️', 'Wrong:', 'Careful:', 'Gotcha:']
 
 def has_numbered_steps(content):
-    """Check if content has numbered steps (1., 2., etc.)"""
-    return bool(re.search(r'^\s*\d+[.)]\s', content, re.MULTILINE))
+    """Check if content has numbered steps (1., 2., etc.) outside code blocks"""
+    return bool(re.search(r'^\s*\d+[.)]\s', outline(content).prose, re.MULTILINE))
 
 def has_expected_output(content):
     """Check if content has expected output section"""
-    patterns = [
-        r'\*\*Expected Output[:\*]',
-        r'##.*Expected Output',
-        r'##.*Output',
-        r'\*\*Expected:',
-        r'should see',
-        r'will output',
-        r'returns:',
-    ]
-    for p in patterns:
-        if re.search(p, content, re.IGNORECASE):
-            return True
-    return False
+    sections = outline(content)
+    if sections.has('output') or sections.find_label('expected'):
+        return True
+    return bool(EXPECTED_OUTPUT_PHRASES.search(sections.prose))
 
 def has_common_mistake(content):
     """Check if content has common mistake section"""
-    patterns = [r'Common Mistake', r'⚠️', r'Wrong:', r'Careful:', r'Gotcha:']
-    for p in patterns:
-        if p in content:
-            return True
-    return False
+    sections = outline(content)
+    if sections.has('common mistake'):
+        return True
+    return any(marker in sections.prose for marker in COMMON_MISTAKE_MARKERS)
 
 def get_curriculum(lid):
     try:
@@ -71,12 +65,13 @@ for lid, lesson in lessons.items():
     needs_mistake = not has_common_mistake(content)
     
     # Only update if content is substantial (has task section)
-    has_task = 'task' in content.lower() or 'your turn' in content.lower()
+    sections = outline(content)
+    has_task = sections.has('task', 'your turn')
     
     # Add expected output section if missing and has a task
-    if needs_output and has_task and '## ' in content:
+    if needs_output and has_task and sections.sections:
         # Try to add after task section
-        if '## 🎯 Your Task' in content or '## Your Task' in content:
+        if sections.find('your task'):
             # Already has task header, add expected output after it
             pass  # Will be added by the comprehensive template fix
         
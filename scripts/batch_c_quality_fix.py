@@ -6,6 +6,8 @@ Adds expected output to more lessons using various detection patterns
 import json
 import re
 
+from lesson_sections import insert_at, outline
+
 with open('frontend/public/data/lessons.json', 'r') as f:
     lessons = json.load(f)
 
@@ -22,14 +24,14 @@ def get_curriculum(lid):
         return 'R'
     return 'Unknown'
 
+EXPECTED_OUTPUT_PHRASES = re.compile(r'should see|should print|will output|returns:|should return|result:',
+                                     re.IGNORECASE)
+
 def has_expected_output(content):
-    patterns = [r'\*\*Expected', r'Expected Output', r'Expected:', r'## Output',
-                r'should see', r'should print', r'will output', r'returns:', 
-                r'should return', r'result:', r'Result:']
-    for p in patterns:
-        if re.search(p, content, re.IGNORECASE):
-            return True
-    return False
+    sections = outline(content)
+    if sections.has('output', 'result') or sections.find_label('expected'):
+        return True
+    return bool(EXPECTED_OUTPUT_PHRASES.search(sections.prose))
 
 def infer_expected_output(content, starter_code, solution_code, expected_field):
     """Try to infer what the expected output should be."""
@@ -64,22 +66,15 @@ def add_expected_output_section(content, expected_text):
     # Create the section
     output_section = f"\n\n**Expected Output:**\n{expected_text}\n"
     
-    # Strategy 1: Add before Common Mistake or No Hidden Prerequisites
-    for marker in ['## ⚠️', '## Common', '✅ **No Hidden']:
-        if marker in content:
-            pos = content.find(marker)
-            content = content[:pos] + output_section + content[pos:]
-            return content, True
-    
-    # Strategy 2: Add at end before horizontal rule
-    if '\n---\n' in content:
-        pos = content.rfind('\n---\n')
-        content = content[:pos] + output_section + content[pos:]
-        return content, True
-    
-    # Strategy 3: Add at the very end
-    content = content.rstrip() + output_section
-    return content, True
+    # Add before Common Mistake or No Hidden Prerequisites, else before the
+    # last horizontal rule, else at the very end
+    sections = outline(content)
+    pos = sections.position_of('common mistake', 'no hidden prerequisites')
+    if pos is None:
+        pos = sections.last_rule()
+    if pos is None:
+        content = content.rstrip()
+    return insert_at(content, pos, output_section), True
 
 changes = {'Python': 0, 'SQL': 0, 'R': 0}
 
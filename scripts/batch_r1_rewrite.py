@@ -3,11 +3,9 @@ Batch R-1 Reinforcer Rewrite Script
 Updates lessons.json with properly aligned reinforcers.
 """
 
-import json
+from lesson_patches import PatchSet, apply_patch_sets
 
-# Load lessons
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+PATCHES = PatchSet("batch_r1_rewrite")
 
 # ============================================
 # CONCEPT 2002: The Empty Canvas
@@ -15,8 +13,7 @@ with open('frontend/public/data/lessons.json', 'r') as f:
 # ============================================
 
 # R1: Analogy - relate ggplot canvas to real-world painting
-lessons["20021"] = {
-    **lessons["20021"],
+PATCHES.update("20021", {
     "title": "Analogy: The Artist's Canvas",
     "content": """# 🎨 The Artist's Canvas
 
@@ -63,11 +60,10 @@ ggplot(data = penguins)
     "starter_code": "# Create an empty canvas using the penguins dataset\n",
     "solution_code": "ggplot(data = penguins)",
     "expected_output": "[Graph: Empty gray canvas]"
-}
+})
 
 # R2: Variation - try with different dataset
-lessons["20022"] = {
-    **lessons["20022"],
+PATCHES.update("20022", {
     "title": "Variation: Different Dataset",
     "content": """# 🔄 Different Dataset, Same Canvas
 
@@ -117,11 +113,10 @@ ggplot(data = mpg)
     "starter_code": "# Create a canvas using the mpg (cars) dataset\n",
     "solution_code": "ggplot(data = mpg)",
     "expected_output": "[Graph: Empty gray canvas]"
-}
+})
 
 # R3: Fix the Code - fix a broken ggplot call
-lessons["20023"] = {
-    **lessons["20023"],
+PATCHES.update("20023", {
     "title": "Fix the Code: Missing Data",
     "content": """# 🔧 Fix the Code
 
@@ -170,11 +165,10 @@ ggplot(data = penguins)
     "starter_code": "# Fix this code by adding 'data = '\nggplot(penguins)",
     "solution_code": "ggplot(data = penguins)",
     "expected_output": "[Graph: Empty gray canvas]"
-}
+})
 
 # R4: Challenge - create canvas on your own
-lessons["20024"] = {
-    **lessons["20024"],
+PATCHES.update("20024", {
     "title": "Challenge: Your Own Canvas",
     "content": """# 🦸 Challenge: Your Own Canvas
 
@@ -214,10 +208,8 @@ ggplot(data = diamonds)
     "starter_code": "# Create a blank canvas using the diamonds dataset\n# Hint: ggplot(data = ...)\n",
     "solution_code": "ggplot(data = diamonds)",
     "expected_output": "[Graph: Empty gray canvas]"
-}
+})
 
-# Save updated lessons
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("✅ Updated concept 2002 reinforcers (20021-20024)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("✅ Updated concept 2002 reinforcers (20021-20024)")
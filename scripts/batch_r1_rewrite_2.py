@@ -3,11 +3,9 @@ Batch R-1 Reinforcer Rewrite Script - Concepts 2003, 2001, 2201
 Updates lessons.json with properly aligned reinforcers.
 """
 
-import json
+from lesson_patches import PatchSet, apply_patch_sets
 
-# Load lessons
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+PATCHES = PatchSet("batch_r1_rewrite_2")
 
 # ============================================
 # CONCEPT 2003: Mapping Data to Axes
@@ -15,8 +13,7 @@ with open('frontend/public/data/lessons.json', 'r') as f:
 # Current reinforcers teach data frames (WRONG)
 # ============================================
 
-lessons["20031"] = {
-    **lessons["20031"],
+PATCHES.update("20031", {
     "title": "Analogy: The Coordinate System",
     "content": """# 📍 The Coordinate System
 
@@ -65,10 +62,9 @@ aes(x = flipper_length_mm)  # Column names without quotes
     "starter_code": "# Map flipper_length_mm to x and body_mass_g to y\n",
     "solution_code": "ggplot(data = penguins, mapping = aes(x = flipper_length_mm, y = body_mass_g))",
     "expected_output": "[Graph: Canvas with labeled axes]"
-}
+})
 
-lessons["20032"] = {
-    **lessons["20032"],
+PATCHES.update("20032", {
     "title": "Variation: Different Columns",
     "content": """# 🔄 Different Columns
 
@@ -116,10 +112,9 @@ aes(x = bill_length_mm, y = bill_depth_mm)
     "starter_code": "# Map bill_length_mm to x and bill_depth_mm to y\nggplot(data = penguins, mapping = aes(x = ___, y = ___))",
     "solution_code": "ggplot(data = penguins, mapping = aes(x = bill_length_mm, y = bill_depth_mm))",
     "expected_output": "[Graph: Canvas with bill measurement axes]"
-}
+})
 
-lessons["20033"] = {
-    **lessons["20033"],
+PATCHES.update("20033", {
     "title": "Fix the Code: Mapping Typo",
     "content": """# 🔧 Fix the Code
 
@@ -167,10 +162,9 @@ y = body_mass_g  # All lowercase except after underscores
     "starter_code": "# Fix the capitalization error\nggplot(data = penguins, mapping = aes(x = flipper_length_mm, y = Body_mass_g))",
     "solution_code": "ggplot(data = penguins, mapping = aes(x = flipper_length_mm, y = body_mass_g))",
     "expected_output": "[Graph: Canvas with labeled axes]"
-}
+})
 
-lessons["20034"] = {
-    **lessons["20034"],
+PATCHES.update("20034", {
     "title": "Challenge: Map Your Own Axes",
     "content": """# 🦸 Challenge: Map Your Own Axes
 
@@ -210,7 +204,7 @@ ggplot(data = mpg, mapping = aes(x = displ, y = hwy))  # Explicit is clearer
     "starter_code": "# Create a ggplot with mpg data, mapping displ to x and hwy to y\n",
     "solution_code": "ggplot(data = mpg, mapping = aes(x = displ, y = hwy))",
     "expected_output": "[Graph: Canvas with displ and hwy axes]"
-}
+})
 
 # ============================================
 # CONCEPT 2001: Meet the Penguins  
@@ -218,8 +212,7 @@ ggplot(data = mpg, mapping = aes(x = displ, y = hwy))  # Explicit is clearer
 # Current reinforcers teach variables (WRONG)
 # ============================================
 
-lessons["20011"] = {
-    **lessons["20011"],
+PATCHES.update("20011", {
     "title": "Analogy: A Picture is Worth 344 Rows",
     "content": """# 📊 A Picture is Worth 344 Rows
 
@@ -266,10 +259,9 @@ penguins  # All lowercase
     "starter_code": "# View the penguins dataset\n",
     "solution_code": "penguins",
     "expected_output": "# A tibble: 344 × 8"
-}
+})
 
-lessons["20012"] = {
-    **lessons["20012"],
+PATCHES.update("20012", {
     "title": "Variation: Explore the Columns",
     "content": """# 🔍 Explore the Columns
 
@@ -315,10 +307,9 @@ names(penguins)  # Use 'names' to see column names
     "starter_code": "# Get the column names of the penguins dataset\n",
     "solution_code": "names(penguins)",
     "expected_output": '[1] "species" "island" "bill_length_mm" "bill_depth_mm" "flipper_length_mm" "body_mass_g" "sex" "year"'
-}
+})
 
-lessons["20013"] = {
-    **lessons["20013"],
+PATCHES.update("20013", {
     "title": "Fix the Code: Dataset Name",
     "content": """# 🔧 Fix the Code
 
@@ -364,10 +355,9 @@ penguins  # Exactly as defined
     "starter_code": "# Fix the capitalization error\nPenguins",
     "solution_code": "penguins",
     "expected_output": "# A tibble: 344 × 8"
-}
+})
 
-lessons["20014"] = {
-    **lessons["20014"],
+PATCHES.update("20014", {
     "title": "Challenge: Find the Range",
     "content": """# 🦸 Challenge: Find the Range
 
@@ -405,7 +395,7 @@ range(penguins$body_mass_g, na.rm = TRUE)  # Specify dataset$column
     "starter_code": "# Find the range of body_mass_g in penguins\n# Hint: range(dataset$column, na.rm = TRUE)\n",
     "solution_code": "range(penguins$body_mass_g, na.rm = TRUE)",
     "expected_output": "[1] 2700 6300"
-}
+})
 
 # ============================================
 # CONCEPT 2201: Conditional Logic
@@ -413,8 +403,7 @@ range(penguins$body_mass_g, na.rm = TRUE)  # Specify dataset$column
 # Current reinforcers teach &/| operators (WRONG)
 # ============================================
 
-lessons["22011"] = {
-    **lessons["22011"],
+PATCHES.update("22011", {
     "title": "Analogy: The Sorting Hat",
     "content": """# 🎩 The Sorting Hat
 
@@ -462,10 +451,9 @@ if_else(body_mass_g > 4000, "Heavy", "Light")  # Text needs quotes
     "starter_code": '# Label penguins as "Heavy" (> 4000g) or "Light"\npenguins %>% mutate(\n  size = if_else(____)\n)',
     "solution_code": 'penguins %>% mutate(size = if_else(body_mass_g > 4000, "Heavy", "Light"))',
     "expected_output": "# A tibble with new 'size' column"
-}
+})
 
-lessons["22012"] = {
-    **lessons["22012"],
+PATCHES.update("22012", {
     "title": "Variation: Three or More Categories",
     "content": """# 🎯 Three or More Categories
 
@@ -519,10 +507,9 @@ case_when(
     "starter_code": '# Create size categories: Small, Medium, Large\npenguins %>% mutate(\n  size_category = case_when(\n    body_mass_g < 3500 ~ "Small",\n    body_mass_g <= 4500 ~ "Medium",\n    .default = "Large"\n  )\n)',
     "solution_code": 'penguins %>% mutate(size_category = case_when(body_mass_g < 3500 ~ "Small", body_mass_g <= 4500 ~ "Medium", .default = "Large"))',
     "expected_output": "# A tibble with 'size_category' column"
-}
+})
 
-lessons["22013"] = {
-    **lessons["22013"],
+PATCHES.update("22013", {
     "title": "Fix the Code: Syntax Errors",
     "content": """# 🔧 Fix the Code
 
@@ -570,10 +557,9 @@ if_else(x > 0, "yes", "no")  # All three required
     "starter_code": '# Fix the missing argument\npenguins %>% mutate(\n  heavy = if_else(body_mass_g > 4000, "Heavy")\n)',
     "solution_code": 'penguins %>% mutate(heavy = if_else(body_mass_g > 4000, "Heavy", "Light"))',
     "expected_output": "# A tibble with 'heavy' column"
-}
+})
 
-lessons["22014"] = {
-    **lessons["22014"],
+PATCHES.update("22014", {
     "title": "Challenge: Classify Flipper Length",
     "content": """# 🦸 Challenge: Classify Flipper Length
 
@@ -615,10 +601,8 @@ if_else(flipper_length_mm >= 200, "Long", "Short")  # Strings need quotes
     "starter_code": '# Create flipper_size column ("Long" if >= 200mm, else "Short")\npenguins %>% mutate(\n  flipper_size = ____\n)',
     "solution_code": 'penguins %>% mutate(flipper_size = if_else(flipper_length_mm >= 200, "Long", "Short"))',
     "expected_output": "# A tibble with 'flipper_size' column"
-}
+})
 
-# Save updated lessons
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("✅ Updated concepts 2003, 2001, 2201 reinforcers (12 lessons)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("✅ Updated concepts 2003, 2001, 2201 reinforcers (12 lessons)")
@@ -3,11 +3,9 @@ Batch R-1 Reinforcer Rewrite Script - Concepts 2030, 2050, 2500, 2010
 Priority 5-8: Hidden prereqs / Missing scaffolding
 """
 
-import json
+from lesson_patches import PatchSet, apply_patch_sets
 
-# Load lessons
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+PATCHES = PatchSet("batch_r1_rewrite_3")
 
 # ============================================
 # CONCEPT 2030: Names & Spaces
@@ -15,8 +13,7 @@ with open('frontend/public/data/lessons.json', 'r') as f:
 # Issues: R2 uses pipes (hidden prereq), all very thin
 # ============================================
 
-lessons["20301"] = {
-    **lessons["20301"],
+PATCHES.update("20301", {
     "title": "Analogy: Grammar for Code",
     "content": """# 📖 Grammar for Code
 
@@ -66,10 +63,9 @@ x <- 10  # Space on both sides of arrow
     "starter_code": "# Add spaces around operators\nx<-10+10\nprint(x)",
     "solution_code": "x <- 10 + 10\nprint(x)",
     "expected_output": "[1] 20"
-}
+})
 
-lessons["20302"] = {
-    **lessons["20302"],
+PATCHES.update("20302", {
     "title": "Variation: snake_case Naming",
     "content": """# 🐍 snake_case Naming
 
@@ -119,10 +115,9 @@ my_data  # All lowercase, underscores only
     "starter_code": "# Rename using snake_case\nMyData <- penguins\nMyData",
     "solution_code": "my_data <- penguins\nmy_data",
     "expected_output": "# A tibble: 344 × 8"
-}
+})
 
-lessons["20303"] = {
-    **lessons["20303"],
+PATCHES.update("20303", {
     "title": "Fix the Code: Spacing Issues",
     "content": """# 🔧 Fix the Spacing
 
@@ -175,10 +170,9 @@ mean(x)  # No space inside, space after commas
     "starter_code": "# Fix the spacing\nmean(penguins$body_mass_g,na.rm=TRUE)",
     "solution_code": "mean(penguins$body_mass_g, na.rm = TRUE)",
     "expected_output": "[1] 4201.754"
-}
+})
 
-lessons["20304"] = {
-    **lessons["20304"],
+PATCHES.update("20304", {
     "title": "Challenge: Clean Up This Code",
     "content": """# 🦸 Challenge: Clean Up This Code
 
@@ -217,7 +211,7 @@ my_result <- 10 + 15  # Spaces around operators
     "starter_code": "# Clean up this messy code\nMyResult<-10+15\nprint(MyResult)",
     "solution_code": "my_result <- 10 + 15\nprint(my_result)",
     "expected_output": "[1] 25"
-}
+})
 
 # ============================================
 # CONCEPT 2050: Scripts vs Console
@@ -225,8 +219,7 @@ my_result <- 10 + 15  # Spaces around operators
 # Issues: R2 off-topic (ggplot), R4 no scaffold
 # ============================================
 
-lessons["20501"] = {
-    **lessons["20501"],
+PATCHES.update("20501", {
     "title": "Analogy: The Recipe Card",
     "content": """# 📜 The Recipe Card
 
@@ -268,10 +261,9 @@ Forgetting to save your script! Use `Cmd/Ctrl + S` frequently.
     "starter_code": "# Write a simple script with a comment and calculation\n",
     "solution_code": "# My first script\n1 + 1",
     "expected_output": "[1] 2"
-}
+})
 
-lessons["20502"] = {
-    **lessons["20502"],
+PATCHES.update("20502", {
     "title": "Variation: Running Line by Line",
     "content": """# ▶️ Running Line by Line
 
@@ -316,10 +308,9 @@ Trying to use a variable before creating it. Run lines in order!
     "starter_code": "# Run these lines one at a time\nx <- 5\ny <- x * 2\nprint(y)\nprint(\"Done!\")",
     "solution_code": "x <- 5\ny <- x * 2\nprint(y)\nprint(\"Done!\")",
     "expected_output": '[1] 10\n[1] "Done!"'
-}
+})
 
-lessons["20503"] = {
-    **lessons["20503"],
+PATCHES.update("20503", {
     "title": "Fix the Code: Typo in Function",
     "content": """# 🔧 Fix the Typo
 
@@ -367,10 +358,9 @@ library(tidyverse)  # All lowercase
     "starter_code": "# Fix the typo in the function name\nlibary(tidyverse)",
     "solution_code": "library(tidyverse)",
     "expected_output": "# Loading tidyverse"
-}
+})
 
-lessons["20504"] = {
-    **lessons["20504"],
+PATCHES.update("20504", {
     "title": "Challenge: Script Header",
     "content": """# 🦸 Challenge: Script Header
 
@@ -402,7 +392,7 @@ Forgetting the `#` symbol—R will try to run "Penguin Analysis" as code!
     "starter_code": "# Write your script header below\n# Title:\n# Author:\n# Date:\n\n# Then view the data\n",
     "solution_code": "# Penguin Analysis\n# Author: Me\n# Date: 2024-01-18\n\npenguins",
     "expected_output": "# A tibble: 344 × 8"
-}
+})
 
 # ============================================
 # CONCEPT 2500: Quarto Basics
@@ -410,8 +400,7 @@ Forgetting the `#` symbol—R will try to run "Penguin Analysis" as code!
 # Issues: All reinforcers extremely thin
 # ============================================
 
-lessons["25001"] = {
-    **lessons["25001"],
+PATCHES.update("25001", {
     "title": "Analogy: The Lab Notebook",
     "content": """# 📓 The Lab Notebook
 
@@ -456,10 +445,9 @@ Type `"I understand Quarto structure"` and run.
     "starter_code": "# Confirm you understand the 3 parts of Quarto\n",
     "solution_code": '"I understand Quarto structure"',
     "expected_output": '[1] "I understand Quarto structure"'
-}
+})
 
-lessons["25002"] = {
-    **lessons["25002"],
+PATCHES.update("25002", {
     "title": "Variation: Code Chunk Options",
     "content": """# ⚙️ Code Chunk Options
 
@@ -499,10 +487,9 @@ Mean bill length (around 43.9)
     "starter_code": "# Calculate mean bill length\nmean(penguins$bill_length_mm, na.rm = TRUE)",
     "solution_code": "mean(penguins$bill_length_mm, na.rm = TRUE)",
     "expected_output": "[1] 43.92193"
-}
+})
 
-lessons["25003"] = {
-    **lessons["25003"],
+PATCHES.update("25003", {
     "title": "Fix the Code: Chunk Syntax",
     "content": """# 🔧 Fix the Chunk Syntax
 
@@ -542,10 +529,9 @@ This exercise tests your understanding. Type the correct number of backticks nee
     "starter_code": "# How many backticks for chunk opening?\n3\n# How many for closing?\n3",
     "solution_code": "3\n3",
     "expected_output": "[1] 3\n[1] 3"
-}
+})
 
-lessons["25004"] = {
-    **lessons["25004"],
+PATCHES.update("25004", {
     "title": "Challenge: YAML Header",
     "content": """# 🦸 Challenge: YAML Header
 
@@ -582,7 +568,7 @@ In a real `.qmd` file, this would go between the `---` delimiters.
     "starter_code": "# Write a YAML title line as a string\n",
     "solution_code": '"title: Penguin Analysis"',
     "expected_output": '[1] "title: Penguin Analysis"'
-}
+})
 
 # ============================================
 # CONCEPT 2010: Coding Basics
@@ -590,8 +576,7 @@ In a real `.qmd` file, this would go between the `---` delimiters.
 # Issues: Reinforcers only test function calls
 # ============================================
 
-lessons["20101"] = {
-    **lessons["20101"],
+PATCHES.update("20101", {
     "title": "Analogy: The Calculator",
     "content": """# 🧮 R is a Fancy Calculator
 
@@ -631,10 +616,9 @@ Assuming left-to-right order. R follows PEMDAS!
     "starter_code": "# Compare these two calculations\n2 + 3 * 4\n(2 + 3) * 4",
     "solution_code": "2 + 3 * 4\n(2 + 3) * 4",
     "expected_output": "[1] 14\n[1] 20"
-}
+})
 
-lessons["20102"] = {
-    **lessons["20102"],
+PATCHES.update("20102", {
     "title": "Variation: Saving Results",
     "content": """# 💾 Saving Results
 
@@ -681,10 +665,9 @@ Use `<-` for assignment in R (not `=`).
     "starter_code": "# Save a calculation, then use it\nmy_sum <- 50 + 50\nmy_sum * 2",
     "solution_code": "my_sum <- 50 + 50\nmy_sum * 2",
     "expected_output": "[1] 200"
-}
+})
 
-lessons["20103"] = {
-    **lessons["20103"],
+PATCHES.update("20103", {
     "title": "Fix the Code: Broken Assignment",
     "content": """# 🔧 Fix the Assignment
 
@@ -724,10 +707,9 @@ Typing `<-` too quickly and getting `< -` (comparison to negative).
     "starter_code": "# Fix the broken assignment arrow\nx < - 10\nprint(x)",
     "solution_code": "x <- 10\nprint(x)",
     "expected_output": "[1] 10"
-}
+})
 
-lessons["20104"] = {
-    **lessons["20104"],
+PATCHES.update("20104", {
     "title": "Challenge: Vector Math",
     "content": """# 🦸 Challenge: Vector Math
 
@@ -773,10 +755,8 @@ prices <- c(10, 20, 30)  # Use c() to create vectors
     "starter_code": "# Create prices and apply 20% discount\nprices <- c(10, 20, 30)\nprices * 0.8",
     "solution_code": "prices <- c(10, 20, 30)\nprices * 0.8",
     "expected_output": "[1]  8 16 24"
-}
+})
 
-# Save updated lessons
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("✅ Updated concepts 2030, 2050, 2500, 2010 reinforcers (16 lessons)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("✅ Updated concepts 2030, 2050, 2500, 2010 reinforcers (16 lessons)")
@@ -3,11 +3,9 @@ Batch R-1 Reinforcer Rewrite Script - Priority 9-12
 Concepts 2040, 2023, 2021, 2121 (Missing why-how / thin content)
 """
 
-import json
+from lesson_patches import PatchSet, apply_patch_sets
 
-# Load lessons
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+PATCHES = PatchSet("batch_r1_rewrite_4")
 
 # ============================================
 # CONCEPT 2040: Tidy Data
@@ -15,8 +13,7 @@ with open('frontend/public/data/lessons.json', 'r') as f:
 # Issues: Analogy doesn't explain tidy rules
 # ============================================
 
-lessons["20401"] = {
-    **lessons["20401"],
+PATCHES.update("20401", {
     "title": "Analogy: Stacking Pancakes",
     "content": """# 🥞 Stacking Pancakes
 
@@ -55,10 +52,9 @@ Look at the "wide" table above. Count:
     "starter_code": "# How many columns in wide table?\n3\n# How many rows in tidy version?\n2",
     "solution_code": "3\n2",
     "expected_output": "[1] 3\n[1] 2"
-}
+})
 
-lessons["20402"] = {
-    **lessons["20402"],
+PATCHES.update("20402", {
     "title": "Variation: Naming New Columns",
     "content": """# 📋 Naming New Columns
 
@@ -97,10 +93,9 @@ Type the answers as strings.
     "starter_code": '# What would you name these new columns?\n"month"\n"sales"',
     "solution_code": '"month"\n"sales"',
     "expected_output": '[1] "month"\n[1] "sales"'
-}
+})
 
-lessons["20403"] = {
-    **lessons["20403"],
+PATCHES.update("20403", {
     "title": "Fix the Code: Missing Quote",
     "content": """# 🔧 Fix the Quote
 
@@ -136,10 +131,9 @@ pivot_longer(..., names_to = "year")
     "starter_code": '# Fix by adding quotes\n\'names_to = "year", values_to = "value"\'',
     "solution_code": '\'names_to = "year", values_to = "value"\'',
     "expected_output": '[1] "names_to = \\"year\\", values_to = \\"value\\""'
-}
+})
 
-lessons["20404"] = {
-    **lessons["20404"],
+PATCHES.update("20404", {
     "title": "Challenge: Pivot It",
     "content": """# 🦸 Challenge: Pivot It
 
@@ -172,7 +166,7 @@ A tidy tibble with country, year, and cases columns
     "starter_code": "# Pivot table4a from wide to long\n# table4a %>% pivot_longer(...)\n# Note: column names with numbers need backticks: `1999`",
     "solution_code": 'table4a %>% pivot_longer(cols = c(`1999`, `2000`), names_to = "year", values_to = "cases")',
     "expected_output": "# A tibble: 6 × 3"
-}
+})
 
 # ============================================
 # CONCEPT 2023: Add Columns (Mutate)
@@ -180,8 +174,7 @@ A tidy tibble with country, year, and cases columns
 # Issues: Missing why-how
 # ============================================
 
-lessons["20231"] = {
-    **lessons["20231"],
+PATCHES.update("20231", {
     "title": "Analogy: The Transformation Ray",
     "content": """# 🔮 The Transformation Ray
 
@@ -217,10 +210,9 @@ A tibble with a new `double_mass` column
     "starter_code": "# Create a new column: double_mass\npenguins %>% mutate(\n  double_mass = body_mass_g * 2\n)",
     "solution_code": "penguins %>% mutate(double_mass = body_mass_g * 2)",
     "expected_output": "# A tibble with double_mass column"
-}
+})
 
-lessons["20232"] = {
-    **lessons["20232"],
+PATCHES.update("20232", {
     "title": "Variation: Math with Columns",
     "content": """# ➗ Math with Columns
 
@@ -260,10 +252,9 @@ Penguins with `mass_kg` column (values like 3.75, 5.0, etc.)
     "starter_code": "# Convert body mass to kilograms\npenguins %>% mutate(\n  mass_kg = ____\n)",
     "solution_code": "penguins %>% mutate(mass_kg = body_mass_g / 1000)",
     "expected_output": "# A tibble with mass_kg column"
-}
+})
 
-lessons["20233"] = {
-    **lessons["20233"],
+PATCHES.update("20233", {
     "title": "Fix the Code: Name It",
     "content": """# 🔧 Name the New Column
 
@@ -299,10 +290,9 @@ A tibble with the new named column
     "starter_code": "# Add a column name before the calculation\npenguins %>% mutate(\n  body_mass_g + 100\n)",
     "solution_code": "penguins %>% mutate(new_col = body_mass_g + 100)",
     "expected_output": "# A tibble with new_col column"
-}
+})
 
-lessons["20234"] = {
-    **lessons["20234"],
+PATCHES.update("20234", {
     "title": "Challenge: Double Up",
     "content": """# 🦸 Challenge: Multiple New Columns
 
@@ -328,7 +318,7 @@ Penguins with both new columns
     "starter_code": "# Add two columns in one mutate\npenguins %>% mutate(\n  bill_sum = ____,\n  flipper_m = ____\n)",
     "solution_code": "penguins %>% mutate(bill_sum = bill_length_mm + bill_depth_mm, flipper_m = flipper_length_mm / 1000)",
     "expected_output": "# A tibble with bill_sum and flipper_m"
-}
+})
 
 # ============================================
 # CONCEPT 2021: Arrange Rows
@@ -336,8 +326,7 @@ Penguins with both new columns
 # Issues: Missing why-how
 # ============================================
 
-lessons["20211"] = {
-    **lessons["20211"],
+PATCHES.update("20211", {
     "title": "Analogy: Sorting Cards",
     "content": """# 🃏 Sorting Cards
 
@@ -372,10 +361,9 @@ Penguins sorted with smallest flippers at top
     "starter_code": "# Sort by flipper length (ascending)\npenguins %>% arrange(flipper_length_mm)",
     "solution_code": "penguins %>% arrange(flipper_length_mm)",
     "expected_output": "# A tibble sorted by flipper_length_mm"
-}
+})
 
-lessons["20212"] = {
-    **lessons["20212"],
+PATCHES.update("20212", {
     "title": "Variation: Two Levels",
     "content": """# 📊 Sorting by Multiple Columns
 
@@ -410,10 +398,9 @@ Penguins grouped by island, then sorted by mass
     "starter_code": "# Sort by island, then by body_mass_g\npenguins %>% arrange(island, body_mass_g)",
     "solution_code": "penguins %>% arrange(island, body_mass_g)",
     "expected_output": "# A tibble sorted by island then body_mass_g"
-}
+})
 
-lessons["20213"] = {
-    **lessons["20213"],
+PATCHES.update("20213", {
     "title": "Fix the Code: Missing desc()",
     "content": """# 🔧 Descending Order
 
@@ -449,10 +436,9 @@ Penguins with 6300g at top
     "starter_code": "# Fix this to show HEAVIEST penguins first\npenguins %>% arrange(body_mass_g)",
     "solution_code": "penguins %>% arrange(desc(body_mass_g))",
     "expected_output": "# A tibble with heaviest first"
-}
+})
 
-lessons["20214"] = {
-    **lessons["20214"],
+PATCHES.update("20214", {
     "title": "Challenge: Backwards",
     "content": """# 🦸 Challenge: Reverse Sort
 
@@ -478,7 +464,7 @@ Adelie penguins (heaviest first), then Chinstrap (heaviest first), then Gentoo
     "starter_code": "# Alphabetical species, but heaviest first within each\npenguins %>% arrange(species, desc(body_mass_g))",
     "solution_code": "penguins %>% arrange(species, desc(body_mass_g))",
     "expected_output": "# A tibble: Adelie heaviest first, then Chinstrap, then Gentoo"
-}
+})
 
 # ============================================
 # CONCEPT 2121: Themes & Scales
@@ -486,8 +472,7 @@ Adelie penguins (heaviest first), then Chinstrap (heaviest first), then Gentoo
 # Issues: Thin content, no examples
 # ============================================
 
-lessons["21211"] = {
-    **lessons["21211"],
+PATCHES.update("21211", {
     "title": "Analogy: Changing Outfits",
     "content": """# 👔 Changing Outfits
 
@@ -522,10 +507,9 @@ A histogram with clean black-and-white styling
     "starter_code": "# Add a black-and-white theme\nggplot(penguins, aes(x = body_mass_g)) + \n  geom_histogram() +\n  theme_bw()",
     "solution_code": "ggplot(penguins, aes(x = body_mass_g)) + geom_histogram() + theme_bw()",
     "expected_output": "[Graph: Histogram with theme_bw]"
-}
+})
 
-lessons["21212"] = {
-    **lessons["21212"],
+PATCHES.update("21212", {
     "title": "Variation: Classic Theme",
     "content": """# 📜 Classic Theme
 
@@ -560,10 +544,9 @@ A scatterplot with no gridlines, clean axes
     "starter_code": "# Use theme_classic for a clean look\nggplot(penguins, aes(x = flipper_length_mm, y = body_mass_g)) + \n  geom_point() +\n  theme_classic()",
     "solution_code": "ggplot(penguins, aes(x = flipper_length_mm, y = body_mass_g)) + geom_point() + theme_classic()",
     "expected_output": "[Graph: Scatterplot with theme_classic]"
-}
+})
 
-lessons["21213"] = {
-    **lessons["21213"],
+PATCHES.update("21213", {
     "title": "Fix the Code: Parentheses",
     "content": """# 🔧 Don't Forget Parentheses
 
@@ -598,10 +581,9 @@ A histogram with minimal theme applied
     "starter_code": "# Fix the missing parentheses\nggplot(penguins, aes(x = body_mass_g)) + \n  geom_histogram() +\n  theme_minimal",
     "solution_code": "ggplot(penguins, aes(x = body_mass_g)) + geom_histogram() + theme_minimal()",
     "expected_output": "[Graph: Histogram with theme_minimal]"
-}
+})
 
-lessons["21214"] = {
-    **lessons["21214"],
+PATCHES.update("21214", {
     "title": "Challenge: Dark Mode",
     "content": """# 🦸 Challenge: Dark Mode
 
@@ -628,11 +610,9 @@ A scatterplot with dark background
     "starter_code": "# Create a dark-mode scatterplot\nggplot(penguins, aes(x = bill_length_mm, y = bill_depth_mm, color = species)) + \n  geom_point() +\n  theme_dark()",
     "solution_code": "ggplot(penguins, aes(x = bill_length_mm, y = bill_depth_mm, color = species)) + geom_point() + theme_dark()",
     "expected_output": "[Graph: Scatterplot with dark theme]"
-}
+})
 
-# Save updated lessons
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("✅ Updated concepts 2040, 2023, 2021, 2121 reinforcers (16 lessons)")
-print("✅ BATCH R-1 COMPLETE: 48 reinforcers rewritten across 12 concept sets")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("✅ Updated concepts 2040, 2023, 2021, 2121 reinforcers (16 lessons)")
+    print("✅ BATCH R-1 COMPLETE: 48 reinforcers rewritten across 12 concept sets")
@@ -3,10 +3,7 @@ Batch R-2 Rewrite Script - Part 1
 Concepts: 2230 (Regex), 2250 (Dates), 2260 (Missing Values)
 """
 
-import json
-
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+from lesson_patches import PatchSet, apply_patch_sets
 
 # Metadata to add
 def add_metadata(lesson):
@@ -17,10 +14,11 @@ def add_metadata(lesson):
     lesson['batch_id'] = 'R-2'
     return lesson
 
+PATCHES = PatchSet("batch_r2_rewrite_part1", finalize=add_metadata)
+
 # ===== CONCEPT 2230: Regex Basics =====
 
-lessons["22301"] = add_metadata({
-    **lessons["22301"],
+PATCHES.update("22301", {
     "title": "Analogy: Find & Replace",
     "content": """# 🔍 Find & Replace on Steroids
 
@@ -70,8 +68,7 @@ Returns TRUE.
 """
 })
 
-lessons["22302"] = add_metadata({
-    **lessons["22302"],
+PATCHES.update("22302", {
     "title": "Variation: Anchors",
     "content": """# ⚓ Anchors: Start & End
 
@@ -122,8 +119,7 @@ Escape the dot with `\\.`.
 """
 })
 
-lessons["22303"] = add_metadata({
-    **lessons["22303"],
+PATCHES.update("22303", {
     "title": "Fix the Code: Character Classes",
     "content": """# 🔧 Fix: Character Classes
 
@@ -176,8 +172,7 @@ Now it's a character class matching any vowel.
 """
 })
 
-lessons["22304"] = add_metadata({
-    **lessons["22304"],
+PATCHES.update("22304", {
     "title": "Challenge: Extract Digits",
     "content": """# 🦸 Challenge: Extract All Digits
 
@@ -228,8 +223,7 @@ Gets ALL matches.
 
 # ===== CONCEPT 2250: Dates & Times =====
 
-lessons["22501"] = add_metadata({
-    **lessons["22501"],
+PATCHES.update("22501", {
     "title": "Analogy: Universal Translator",
     "content": """# 🌍 The Universal Date Translator
 
@@ -280,8 +274,7 @@ Use mdy for month-day-year.
 """
 })
 
-lessons["22502"] = add_metadata({
-    **lessons["22502"],
+PATCHES.update("22502", {
     "title": "Variation: Month-Day-Year",
     "content": """# 📅 Different Date Formats
 
@@ -330,8 +323,7 @@ Correctly reads month=12, day=25.
 """
 })
 
-lessons["22503"] = add_metadata({
-    **lessons["22503"],
+PATCHES.update("22503", {
     "title": "Fix the Code: Date Parsing",
     "content": """# 🔧 Fix: Wrong Date Parser
 
@@ -384,8 +376,7 @@ Correctly interprets day=31, month=12.
 """
 })
 
-lessons["22504"] = add_metadata({
-    **lessons["22504"],
+PATCHES.update("22504", {
     "title": "Challenge: Extract Year",
     "content": """# 🦸 Challenge: Get the Year
 
@@ -436,8 +427,7 @@ Parse, then extract.
 
 # ===== CONCEPT 2260: Missing Values =====
 
-lessons["22601"] = add_metadata({
-    **lessons["22601"],
+PATCHES.update("22601", {
     "title": "Analogy: Empty Seat",
     "content": """# 💺 The Empty Seat
 
@@ -487,8 +477,7 @@ Returns 23.33.
 """
 })
 
-lessons["22602"] = add_metadata({
-    **lessons["22602"],
+PATCHES.update("22602", {
     "title": "Variation: Replacing NAs",
     "content": """# 🔄 Replacing Missing Values
 
@@ -539,8 +528,7 @@ Correct numeric replacement.
 """
 })
 
-lessons["22603"] = add_metadata({
-    **lessons["22603"],
+PATCHES.update("22603", {
     "title": "Fix the Code: NA Comparison",
     "content": """# 🔧 Fix: Comparing to NA
 
@@ -597,8 +585,7 @@ Use `is.na()` function.
 """
 })
 
-lessons["22604"] = add_metadata({
-    **lessons["22604"],
+PATCHES.update("22604", {
     "title": "Challenge: Drop Missing Rows",
     "content": """# 🦸 Challenge: Clean Data
 
@@ -649,8 +636,6 @@ With parentheses.
 """
 })
 
-# Save
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("Batch R-2 Part 1 complete: 2230, 2250, 2260 (12 reinforcers)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("Batch R-2 Part 1 complete: 2230, 2250, 2260 (12 reinforcers)")
@@ -3,10 +3,7 @@ Batch R-2 Rewrite Script - Part 2
 Concepts: 2270 (Joins), 2310 (Databases), 2320 (Arrow)
 """
 
-import json
-
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+from lesson_patches import PatchSet, apply_patch_sets
 
 def add_metadata(lesson):
     if 'gap_ids' not in lesson:
@@ -16,10 +13,11 @@ def add_metadata(lesson):
     lesson['batch_id'] = 'R-2'
     return lesson
 
+PATCHES = PatchSet("batch_r2_rewrite_part2", finalize=add_metadata)
+
 # ===== CONCEPT 2270: Mutating Joins =====
 
-lessons["22701"] = add_metadata({
-    **lessons["22701"],
+PATCHES.update("22701", {
     "title": "Analogy: ID Badge",
     "content": """# 🪪 The ID Badge Match
 
@@ -68,8 +66,7 @@ Always specify the key explicitly.
 """
 })
 
-lessons["22702"] = add_metadata({
-    **lessons["22702"],
+PATCHES.update("22702", {
     "title": "Variation: Right & Inner",
     "content": """# 🔄 Different Join Types
 
@@ -115,8 +112,7 @@ Use `inner_join` to drop non-matching rows.
 """
 })
 
-lessons["22703"] = add_metadata({
-    **lessons["22703"],
+PATCHES.update("22703", {
     "title": "Fix the Code: by Argument",
     "content": """# 🔧 Fix: Join Key
 
@@ -169,8 +165,7 @@ Map names explicitly.
 """
 })
 
-lessons["22704"] = add_metadata({
-    **lessons["22704"],
+PATCHES.update("22704", {
     "title": "Challenge: Match Tables",
     "content": """# 🦸 Challenge: Join Two Tables
 
@@ -221,8 +216,7 @@ Always specify the key.
 
 # ===== CONCEPT 2310: Databases & dbplyr =====
 
-lessons["23101"] = add_metadata({
-    **lessons["23101"],
+PATCHES.update("23101", {
     "title": "Analogy: Remote Control",
     "content": """# 🎮 The Remote Control
 
@@ -269,8 +263,7 @@ Stick to functions that have SQL equivalents.
 """
 })
 
-lessons["23102"] = add_metadata({
-    **lessons["23102"],
+PATCHES.update("23102", {
     "title": "Variation: See the SQL",
     "content": """# 👀 Peek at the SQL
 
@@ -316,8 +309,7 @@ Use `show_query()` to verify what's happening.
 """
 })
 
-lessons["23103"] = add_metadata({
-    **lessons["23103"],
+PATCHES.update("23103", {
     "title": "Fix the Code: collect()",
     "content": """# 🔧 Fix: Bring Data to R
 
@@ -369,8 +361,7 @@ Now it's in R memory.
 """
 })
 
-lessons["23104"] = add_metadata({
-    **lessons["23104"],
+PATCHES.update("23104", {
     "title": "Challenge: Query Database",
     "content": """# 🦸 Challenge: Database Query
 
@@ -422,8 +413,7 @@ Always `collect()` when done.
 
 # ===== CONCEPT 2320: Arrow & Parquet =====
 
-lessons["23201"] = add_metadata({
-    **lessons["23201"],
+PATCHES.update("23201", {
     "title": "Analogy: Express Lane",
     "content": """# 🚀 The Express Lane
 
@@ -468,8 +458,7 @@ Save as parquet once, then use `read_parquet()` forever.
 """
 })
 
-lessons["23202"] = add_metadata({
-    **lessons["23202"],
+PATCHES.update("23202", {
     "title": "Variation: Write Parquet",
     "content": """# 💾 Save as Parquet
 
@@ -521,8 +510,7 @@ Arrow functions use underscores.
 """
 })
 
-lessons["23203"] = add_metadata({
-    **lessons["23203"],
+PATCHES.update("23203", {
     "title": "Fix the Code: Package",
     "content": """# 🔧 Fix: Load Arrow
 
@@ -575,8 +563,7 @@ read_parquet("data.parquet")
 """
 })
 
-lessons["23204"] = add_metadata({
-    **lessons["23204"],
+PATCHES.update("23204", {
     "title": "Challenge: Convert File",
     "content": """# 🦸 Challenge: CSV to Parquet
 
@@ -623,7 +610,6 @@ write_parquet(data, "output.parquet")
 """
 })
 
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("Batch R-2 Part 2 complete: 2270, 2310, 2320 (12 reinforcers)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("Batch R-2 Part 2 complete: 2270, 2310, 2320 (12 reinforcers)")
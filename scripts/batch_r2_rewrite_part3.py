@@ -3,10 +3,7 @@ Batch R-2 Rewrite Script - Part 3
 Concepts: 2330 (Lists), 2400 (Functions), 2410 (Iteration)
 """
 
-import json
-
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+from lesson_patches import PatchSet, apply_patch_sets
 
 def add_metadata(lesson):
     if 'gap_ids' not in lesson:
@@ -16,10 +13,11 @@ def add_metadata(lesson):
     lesson['batch_id'] = 'R-2'
     return lesson
 
+PATCHES = PatchSet("batch_r2_rewrite_part3", finalize=add_metadata)
+
 # ===== CONCEPT 2330: Lists & Rectangling =====
 
-lessons["23301"] = add_metadata({
-    **lessons["23301"],
+PATCHES.update("23301", {
     "title": "Analogy: Unpacking Boxes",
     "content": """# 📦 Unpacking Nested Boxes
 
@@ -73,8 +71,7 @@ Works on the whole list at once.
 """
 })
 
-lessons["23302"] = add_metadata({
-    **lessons["23302"],
+PATCHES.update("23302", {
     "title": "Variation: Going Longer",
     "content": """# ↕️ Unnest Longer
 
@@ -119,8 +116,7 @@ Use `unnest_longer()` for vectors, `unnest_wider()` for named lists.
 """
 })
 
-lessons["23303"] = add_metadata({
-    **lessons["23303"],
+PATCHES.update("23303", {
     "title": "Fix the Code: Plural",
     "content": """# 🔧 Fix: Column Name
 
@@ -175,8 +171,7 @@ unnest_longer(scores)
 """
 })
 
-lessons["23304"] = add_metadata({
-    **lessons["23304"],
+PATCHES.update("23304", {
     "title": "Challenge: Rectangle JSON",
     "content": """# 🦸 Challenge: Flatten Data
 
@@ -232,8 +227,7 @@ tibble(data = people) %>% unnest_wider(data)
 
 # ===== CONCEPT 2400: Functions & Tidy Eval =====
 
-lessons["24001"] = add_metadata({
-    **lessons["24001"],
+PATCHES.update("24001", {
     "title": "Analogy: Recipe Card",
     "content": """# 📝 Writing Recipe Cards
 
@@ -283,8 +277,7 @@ add_ten <- function(x) { x + 10 }
 """
 })
 
-lessons["24002"] = add_metadata({
-    **lessons["24002"],
+PATCHES.update("24002", {
     "title": "Variation: Multiple Args",
     "content": """# 🔢 Multiple Arguments
 
@@ -335,8 +328,7 @@ function(x, n = 2)
 """
 })
 
-lessons["24003"] = add_metadata({
-    **lessons["24003"],
+PATCHES.update("24003", {
     "title": "Fix the Code: Braces",
     "content": """# 🔧 Fix: Function Syntax
 
@@ -390,8 +382,7 @@ Every `{` needs a `}`, every `(` needs a `)`.
 """
 })
 
-lessons["24004"] = add_metadata({
-    **lessons["24004"],
+PATCHES.update("24004", {
     "title": "Challenge: Write Function",
     "content": """# 🦸 Challenge: Your Own Function
 
@@ -442,8 +433,7 @@ Use `[[]]` for programmatic column access.
 
 # ===== CONCEPT 2410: Iteration: across & map =====
 
-lessons["24101"] = add_metadata({
-    **lessons["24101"],
+PATCHES.update("24101", {
     "title": "Analogy: Assembly Line",
     "content": """# 🏭 The Assembly Line
 
@@ -494,8 +484,7 @@ Columns first, function second.
 """
 })
 
-lessons["24102"] = add_metadata({
-    **lessons["24102"],
+PATCHES.update("24102", {
     "title": "Variation: map()",
     "content": """# 🗺️ Map: Apply to Each
 
@@ -544,8 +533,7 @@ map(1:3, ~ .x^2)
 """
 })
 
-lessons["24103"] = add_metadata({
-    **lessons["24103"],
+PATCHES.update("24103", {
     "title": "Fix the Code: across()",
     "content": """# 🔧 Fix: across() Syntax
 
@@ -598,8 +586,7 @@ across(where(is.numeric), round)
 """
 })
 
-lessons["24104"] = add_metadata({
-    **lessons["24104"],
+PATCHES.update("24104", {
     "title": "Challenge: Summarize All",
     "content": """# 🦸 Challenge: Summary Stats
 
@@ -648,7 +635,6 @@ summarize(across(where(is.numeric), mean, na.rm = TRUE))
 """
 })
 
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("Batch R-2 Part 3 complete: 2330, 2400, 2410 (12 reinforcers)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("Batch R-2 Part 3 complete: 2330, 2400, 2410 (12 reinforcers)")
@@ -3,10 +3,7 @@ Batch R-2 Rewrite Script - Part 4 (Final)
 Concept: 2420 (Base R)
 """
 
-import json
-
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+from lesson_patches import PatchSet, apply_patch_sets
 
 def add_metadata(lesson):
     if 'gap_ids' not in lesson:
@@ -16,10 +13,11 @@ def add_metadata(lesson):
     lesson['batch_id'] = 'R-2'
     return lesson
 
+PATCHES = PatchSet("batch_r2_rewrite_part4", finalize=add_metadata)
+
 # ===== CONCEPT 2420: A Field Guide to Base R =====
 
-lessons["24201"] = add_metadata({
-    **lessons["24201"],
+PATCHES.update("24201", {
     "title": "Analogy: The Original Tools",
     "content": """# 🔧 The Original Toolbox
 
@@ -69,8 +67,7 @@ penguins[penguins$species == "Adelie", ]
 """
 })
 
-lessons["24202"] = add_metadata({
-    **lessons["24202"],
+PATCHES.update("24202", {
     "title": "Variation: Brackets",
     "content": """# 🔲 Single vs Double Brackets
 
@@ -116,8 +113,7 @@ Use `[[` or `$` to extract vectors.
 """
 })
 
-lessons["24203"] = add_metadata({
-    **lessons["24203"],
+PATCHES.update("24203", {
     "title": "Fix the Code: Comma",
     "content": """# 🔧 Fix: Row-Column Comma
 
@@ -173,8 +169,7 @@ Comma makes it rows.
 """
 })
 
-lessons["24204"] = add_metadata({
-    **lessons["24204"],
+PATCHES.update("24204", {
     "title": "Challenge: Base R Filter",
     "content": """# 🦸 Challenge: Filter Without Tidyverse
 
@@ -220,8 +215,7 @@ penguins[penguins$island == "Biscoe", ]
 """
 })
 
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("Batch R-2 Part 4 complete: 2420 (4 reinforcers)")
-print("\\nBatch R-2 TOTAL: 40 reinforcers across 10 concepts")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("Batch R-2 Part 4 complete: 2420 (4 reinforcers)")
+    print("\\nBatch R-2 TOTAL: 40 reinforcers across 10 concepts")
@@ -0,0 +1,292 @@
+"""
+Pipeline Benchmarks
+
+Times the content pipeline's stages (a lessons.json load/dump cycle,
+build_interaction_plans, the audits, the concept graph and the diagram
+renderer) against the real frontend/public/data corpus and against scaled
+corpora, and compares the results with a stored baseline.
+
+Each run happens in a throwaway copy of the corpus: a temporary directory
+laid out like the repo root, with frontend/public/data and a copy of the
+scripts (some of them, like generate_r_plots.py, write next to their own
+file), so the repo's own data and assets are never touched. Every run is
+a fresh ``--worker`` subprocess of that copy, started in that directory:
+no in-process caches (LessonStore, outlines, tokens) carry over between
+runs, and the worker's peak RSS (including any process pool it starts) is
+its own.
+
+Scaled corpora (``--scale 10``) come from synthetic_corpus.py: that many
+times the real number of lessons, with the real corpus's course shape,
+sections and code, but lesson by lesson different so memoized parses and
+lexes do not make large corpora look cheaper than they are. Stages whose
+work does not depend on the corpus (the diagrams) only run at scale 1.
+
+For each stage and scale the fastest of ``--repeat`` runs is kept: wall
+time, peak RSS and lessons per second. With --update-baseline the results
+are written to scripts/benchmark_baseline.json; otherwise they are compared
+with it, and the run fails (exit status 1) when a stage is slower or uses
+more memory than its baseline by more than the tolerance.
+
+Timings only compare on like hardware, so the file keeps one baseline per
+machine (OS, architecture, CPU count and Python version; ``machine_key``).
+A run is compared with the baseline of the machine it runs on; on a
+machine without one, nothing is compared.
+
+Usage:
+    python scripts/benchmark.py                        # every stage at scale 1 and 10
+    python scripts/benchmark.py audit load_dump        # selected stages
+    python scripts/benchmark.py --scale 1 --scale 100
+    python scripts/benchmark.py --repeat 5 --tolerance 0.5
+    python scripts/benchmark.py --update-baseline
+"""
+
+import json
+import os
+import platform
+import resource
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from lesson_store import COURSE_PATHS, DATA_DIR, LESSONS_PATH, LessonStore
+
+BASELINE_PATH = Path("scripts/benchmark_baseline.json")
+BASELINE_VERSION = 2
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+DEFAULT_SCALES = (1, 10)
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+# Differences below these are noise, whatever the tolerance says
+MIN_SECONDS_DELTA = 0.05
+MIN_RSS_DELTA_MB = 5.0
+
+def write_corpus(root: Path, store: LessonStore, scale: int) -> int:
+    """Lay out a corpus and a copy of the scripts under ``root``; return its lesson count."""
+    # Imported here so workers (which import this module) do not pay for the audit modules
+    from synthetic_corpus import COURSES_PATH, SyntheticCorpus
+    from synthetic_corpus import write_corpus as write_synthetic_corpus
+
+    (root / DATA_DIR).mkdir(parents=True, exist_ok=True)
+    scripts = root / "scripts"
+    scripts.mkdir(exist_ok=True)
+    for script in SCRIPTS_DIR.glob("*.py"):
+        shutil.copyfile(script, scripts / script.name)
+    # Read-only and large; shared rather than copied
+    (scripts / "datasets").symlink_to(SCRIPTS_DIR / "datasets", target_is_directory=True)
+
+    if scale > 1:
+        corpus = SyntheticCorpus(store, scale)
+        courses_index = json.loads(COURSES_PATH.read_text()) if COURSES_PATH.exists() else None
+        write_synthetic_corpus(root, corpus, courses_index)
+        return len(corpus)
+    for path in (LESSONS_PATH, *COURSE_PATHS.values(), COURSES_PATH):
+        if path.exists():
+            shutil.copyfile(path, root / path)
+    return len(store)
+
+
+# --- stages -----------------------------------------------------------------
+# Each runs inside a worker whose cwd is a corpus copy.
+
+
+def run_script(script: str, *args: str) -> Callable[[], None]:
+    def run() -> None:
+        sys.argv = [str(SCRIPTS_DIR / script), *args]
+        runpy.run_path(str(SCRIPTS_DIR / script), run_name="__main__")
+    return run
+
+
+def load_dump() -> None:
+    """Parse lessons.json and the courses into a LessonStore and write lessons.json back."""
+    LessonStore.load().save()
+
+
+class Benchmark:
+    """A timed stage; ``scaled`` is False for stages that ignore the corpus."""
+
+    def __init__(self, name: str, run: Callable[[], None], scaled: bool = True):
+        self.name = name
+        self.run = run
+        self.scaled = scaled
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("load_dump", load_dump),
+    Benchmark("interaction_plans", run_script("build_interaction_plans.py")),
+    Benchmark("reinforcer_audit", run_script("audit_r_reinforcers.py")),
+    Benchmark("concept_graph", run_script("concept_graph.py")),
+    Benchmark("audit", run_script("audit_engine.py")),
+    Benchmark("diagrams", run_script("render_diagrams.py", "--force"), scaled=False),
+]
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of this process or of its largest child, in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    unit = 1 if sys.platform == "darwin" else 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * unit / (1024 * 1024)
+
+
+def worker(name: str) -> None:
+    """Run one stage in the current directory and print its measurements as JSON."""
+    benchmark = {benchmark.name: benchmark for benchmark in BENCHMARKS}[name]
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        started = time.perf_counter()
+        benchmark.run()
+        seconds = time.perf_counter() - started
+    print(json.dumps({"seconds": seconds, "peak_rss_mb": peak_rss_mb()}))
+
+
+def run_once(benchmark: Benchmark, pristine: Path, workdir: Path) -> Dict[str, float]:
+    if workdir.exists():
+        shutil.rmtree(workdir)
+    shutil.copytree(pristine, workdir, symlinks=True)
+    completed = subprocess.run(
+        [sys.executable, str(workdir / "scripts" / "benchmark.py"), "--worker", benchmark.name],
+        cwd=workdir, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"{benchmark.name} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(benchmarks: Sequence[Benchmark], scales: Sequence[int], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Best-of-``repeat`` measurements keyed "<stage>@x<scale>"."""
+    store = LessonStore.load()
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="lesson-bench-") as tmp:
+        for scale in scales:
+            selected = [benchmark for benchmark in benchmarks if benchmark.scaled or scale == 1]
+            if not selected:
+                continue
+            pristine = Path(tmp) / f"corpus-x{scale}"
+            lesson_count = write_corpus(pristine, store, scale)
+            print(f"Corpus x{scale}: {lesson_count} lessons")
+            for benchmark in selected:
+                runs = [run_once(benchmark, pristine, Path(tmp) / "run") for _ in range(repeat)]
+                seconds = min(run["seconds"] for run in runs)
+                result = {
+                    "stage": benchmark.name,
+                    "scale": scale,
+                    "lessons": lesson_count,
+                    "seconds": round(seconds, 4),
+                    "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+                    "lessons_per_second": round(lesson_count / seconds, 1) if seconds else None,
+                }
+                results[f"{benchmark.name}@x{scale}"] = result
+                print(f"  {benchmark.name:<18} {result['seconds']:>8.3f}s  {result['peak_rss_mb']:>7.1f} MB  "
+                      f"{result['lessons_per_second'] or 0:>10.1f} lessons/s")
+            shutil.rmtree(pristine)
+    return results
+
+
+def machine() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def machine_key() -> str:
+    """Which baseline a run compares with; kernel builds and host names do not count."""
+    return f"{platform.system().lower()}-{platform.machine()}-{os.cpu_count()}cpu-py{platform.python_version()}"
+
+
+def load_baselines(path: Path = BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    baselines = json.loads(path.read_text())
+    return baselines if baselines.get("version") == BASELINE_VERSION else None
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable regressions of ``results`` against ``baseline`` (one machine's entry)."""
+    regressions = []
+    for key, result in results.items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        limits = (
+            ("seconds", "s", MIN_SECONDS_DELTA),
+            ("peak_rss_mb", " MB", MIN_RSS_DELTA_MB),
+        )
+        for metric, unit, min_delta in limits:
+            old, new = before[metric], result[metric]
+            if new > old * (1 + tolerance) and new - old > min_delta:
+                regressions.append(f"{key}: {metric} {old}{unit} -> {new}{unit} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def option_values(args: List[str], flag: str) -> List[str]:
+    """Remove every ``flag value`` pair from ``args`` and return the values."""
+    values = []
+    while flag in args:
+        position = args.index(flag)
+        values.append(args[position + 1])
+        del args[position:position + 2]
+    return values
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if args[:1] == ["--worker"]:
+        worker(args[1])
+        return
+
+    scales = [int(value) for value in option_values(args, "--scale")] or list(DEFAULT_SCALES)
+    repeat = int((option_values(args, "--repeat") or [DEFAULT_REPEAT])[-1])
+    tolerance_values = option_values(args, "--tolerance")
+    update = "--update-baseline" in args
+    names = [arg for arg in args if not arg.startswith("--")]
+
+    by_name = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise SystemExit(f"Unknown benchmarks: {', '.join(unknown)} (known: {', '.join(by_name)})")
+    benchmarks = [by_name[name] for name in names] if names else BENCHMARKS
+
+    baselines = load_baselines() or {"version": BASELINE_VERSION, "tolerance": DEFAULT_TOLERANCE, "machines": {}}
+    key = machine_key()
+    baseline = baselines["machines"].get(key)
+    tolerance = float(tolerance_values[-1]) if tolerance_values else baselines["tolerance"]
+
+    print("=" * 60)
+    print("PIPELINE BENCHMARKS")
+    print("=" * 60)
+    results = run_benchmarks(benchmarks, scales, repeat)
+
+    if update:
+        merged = dict(baseline["results"]) if baseline else {}
+        merged.update(results)
+        baselines["tolerance"] = tolerance
+        baselines["machines"][key] = {"machine": machine(), "results": dict(sorted(merged.items()))}
+        baselines["machines"] = dict(sorted(baselines["machines"].items()))
+        BASELINE_PATH.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"\nBaseline for {key} updated -> {BASELINE_PATH}")
+        return
+
+    if baseline is None:
+        recorded = ", ".join(baselines["machines"]) or "none"
+        print(f"\nNo baseline for {key} in {BASELINE_PATH} (recorded: {recorded}); "
+              f"not comparing, record one with --update-baseline")
+        return
+    regressions = compare(results, baseline, tolerance)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regressions beyond {tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        raise SystemExit(1)
+    print(f"\n✓ No regressions beyond {tolerance:.0%} of {BASELINE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
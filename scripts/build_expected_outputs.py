@@ -0,0 +1,242 @@
+"""
+Expected Output Artifacts
+
+Runs each lesson's solution_code offline and records its canonical output
+in frontend/public/data/expected_outputs.json, which
+export_lesson_shards.py folds into every lesson shard as
+``expected_result`` ({"kind", "hash", "output"}), next to the authored
+``expected_output`` text. The lesson page checks a learner's output against
+it (frontend/src/utils/verifier.ts).
+
+- Python: stdout from the run_python_solutions.py sandbox pool
+  (kind "stdout"). Solutions are run under several hash seeds; one
+  whose output differs between the runs (set order, clock, unseeded
+  random) gets no expected output.
+- SQL: the result of verify_sql_solutions.py on the fixture database,
+  rendered as a text table with its result fingerprint as the hash
+  (kind "table").
+- R: only when Rscript is installed locally; stdout, or the hash of the
+  PNG a plotting solution draws (kind "plot").
+
+Entries are keyed by a hash of the solution they came from: lessons whose
+solution is unchanged are not re-run, and the export skips an entry whose
+solution has since been edited rather than ship a stale answer. Solutions
+that fail, time out, print nothing or need modules missing here get an
+entry without output, so they are only retried when their solution
+changes or with --force.
+
+Usage:
+    python scripts/build_expected_outputs.py           # reuse unchanged entries
+    python scripts/build_expected_outputs.py --force   # re-run everything
+"""
+
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from lesson_files import atomic_write_text
+from lesson_store import DATA_DIR, LessonStore, curriculum_for
+from run_python_solutions import run_solutions
+from verify_sql_solutions import verify_solutions
+
+OUTPUTS_PATH = DATA_DIR / "expected_outputs.json"
+HASH_LENGTH = 16
+
+# Longer outputs keep only their hash; shards stay small
+MAX_OUTPUT_CHARS = 2000
+MAX_CELL_CHARS = 24
+R_TIMEOUT = 30.0
+
+# Python statuses whose stdout is the solution's real output
+PYTHON_OK = ("match", "mismatch", "ran")
+# Seeds of the extra Python runs; two seeds can still agree on a small set's order
+RERUN_HASH_SEEDS = (1, 2, 3)
+
+Entry = Dict[str, Any]
+
+
+def short_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def solution_hash(lesson: Dict[str, Any]) -> str:
+    return short_hash(lesson.get("solution_code") or "")
+
+
+def canonical_stdout(text: str) -> str:
+    return "\n".join(line.rstrip() for line in text.strip("\n").splitlines())
+
+
+def empty_entry(lesson: Dict[str, Any]) -> Entry:
+    return {"solution": solution_hash(lesson)}
+
+
+def make_entry(lesson: Dict[str, Any], kind: str, output: str, digest: Optional[str] = None) -> Entry:
+    return {
+        "solution": solution_hash(lesson),
+        "kind": kind,
+        "hash": digest or short_hash(output),
+        "output": output if len(output) <= MAX_OUTPUT_CHARS else "",
+    }
+
+
+def format_cell(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, float):
+        text = f"{value:.6g}"
+    else:
+        text = str(value)
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
+
+
+def render_table(columns: Sequence[str], rows: Sequence[Sequence[Any]], row_count: int) -> str:
+    """psql-style text table of a result preview."""
+    cells = [[format_cell(value) for value in row] for row in rows]
+    widths = [max([len(str(column)), *(len(row[index]) for row in cells)]) for index, column in enumerate(columns)]
+    lines = [
+        " | ".join(str(column).ljust(width) for column, width in zip(columns, widths)).rstrip(),
+        "-+-".join("-" * width for width in widths),
+    ]
+    lines += [" | ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in cells]
+    more = row_count - len(rows)
+    lines.append(f"({row_count} row{'s' if row_count != 1 else ''}{f', {more} not shown' if more > 0 else ''})")
+    return "\n".join(lines)
+
+
+def python_entries(store: LessonStore, lesson_ids: List[int]) -> Dict[str, Entry]:
+    if not lesson_ids:
+        return {}
+    entries = {}
+    # Reruns under other hash seeds catch output that varies between runs
+    # (clock, unseeded random, set order: the browser's Python seeds hashing randomly)
+    reruns = [{record["lesson_id"]: canonical_stdout(record["stdout"])
+               for record in run_solutions(store, lesson_ids, hash_seed=seed)} for seed in RERUN_HASH_SEEDS]
+    for record in run_solutions(store, lesson_ids):
+        lesson = store.lessons[str(record["lesson_id"])]
+        output = canonical_stdout(record["stdout"])
+        stable = all(rerun.get(record["lesson_id"]) == output for rerun in reruns)
+        if record["status"] in PYTHON_OK and output and stable:
+            entries[str(record["lesson_id"])] = make_entry(lesson, "stdout", output)
+        else:
+            entries[str(record["lesson_id"])] = empty_entry(lesson)
+    return entries
+
+
+def sql_entries(store: LessonStore, lesson_ids: List[int]) -> Dict[str, Entry]:
+    if not lesson_ids:
+        return {}
+    entries = {}
+    for record in verify_solutions(store, lesson_ids):
+        lesson = store.lessons[record["lesson_id"]]
+        if record["status"] != "ok" or record["result"]["kind"] != "query":
+            entries[record["lesson_id"]] = empty_entry(lesson)
+            continue
+        result = record["result"]
+        table = render_table(result["columns"], record["preview"], result["row_count"])
+        entries[record["lesson_id"]] = make_entry(lesson, "table", table, result["fingerprint"])
+    return entries
+
+
+def run_r_solution(rscript: str, code: str) -> Optional[Dict[str, str]]:
+    """Run one R solution; return {"kind", "output", "hash"} or None if it failed."""
+    with tempfile.TemporaryDirectory(prefix="lesson-r-") as workdir:
+        plot_path = Path(workdir) / "plot.png"
+        script = Path(workdir) / "solution.R"
+        script.write_text(f'png("{plot_path.as_posix()}", width = 800, height = 600)\n{code}\ninvisible(dev.off())\n')
+        try:
+            completed = subprocess.run([rscript, "--vanilla", str(script)], cwd=workdir, capture_output=True,
+                                       text=True, timeout=R_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            return None
+        if completed.returncode != 0:
+            return None
+        output = canonical_stdout(completed.stdout)
+        if output:
+            return {"kind": "stdout", "output": output, "hash": short_hash(output)}
+        if plot_path.exists() and plot_path.stat().st_size:
+            return {"kind": "plot", "output": "", "hash": hashlib.sha256(plot_path.read_bytes()).hexdigest()[:HASH_LENGTH]}
+    return None
+
+
+def r_entries(store: LessonStore, lesson_ids: List[int]) -> Dict[str, Entry]:
+    rscript = shutil.which("Rscript")
+    if not lesson_ids or rscript is None:
+        return {}
+    lessons = {str(lesson_id): store.lessons[str(lesson_id)] for lesson_id in lesson_ids}
+    with ThreadPoolExecutor() as pool:
+        results = dict(zip(lessons, pool.map(lambda lesson: run_r_solution(rscript, lesson["solution_code"]),
+                                             lessons.values())))
+    return {
+        lesson_id: (make_entry(lessons[lesson_id], result["kind"], result["output"], result["hash"])
+                    if result is not None else empty_entry(lessons[lesson_id]))
+        for lesson_id, result in results.items()
+    }
+
+
+def build_expected_outputs(store: LessonStore, previous: Dict[str, Entry], force: bool = False) -> Dict[str, Any]:
+    """Return entries plus run stats, re-running only lessons whose solution changed."""
+    pending: Dict[str, List[int]] = {"python": [], "sql": [], "r": []}
+    entries: Dict[str, Entry] = {}
+    reused = 0
+    for lesson_id, lesson in store.lessons.items():
+        if not lesson.get("solution_code"):
+            continue
+        old = previous.get(lesson_id)
+        if not force and old is not None and old["solution"] == solution_hash(lesson):
+            entries[lesson_id] = old
+            reused += 1
+        else:
+            pending[curriculum_for(int(lesson_id))].append(int(lesson_id))
+
+    timings = {}
+    for curriculum, runner in (("python", python_entries), ("sql", sql_entries), ("r", r_entries)):
+        started = time.perf_counter()
+        entries.update(runner(store, pending[curriculum]))
+        timings[curriculum] = time.perf_counter() - started
+
+    ordered = {lesson_id: entries[lesson_id] for lesson_id in sorted(entries, key=int)}
+    return {"entries": ordered, "pending": pending, "timings": timings, "reused": reused}
+
+
+def load_expected_outputs(path: Path = OUTPUTS_PATH) -> Dict[str, Entry]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def main() -> None:
+    force = "--force" in sys.argv[1:]
+    store = LessonStore.load()
+    previous = {} if force else load_expected_outputs()
+    result = build_expected_outputs(store, previous, force)
+    entries = result["entries"]
+
+    text = json.dumps(entries, indent=1, ensure_ascii=False) + "\n"
+    if not OUTPUTS_PATH.exists() or OUTPUTS_PATH.read_text() != text:
+        atomic_write_text(OUTPUTS_PATH, text)
+
+    print("=" * 60)
+    print("EXPECTED OUTPUTS")
+    print("=" * 60)
+    for curriculum, ids in result["pending"].items():
+        built = sum(1 for lesson_id in ids if "kind" in entries.get(str(lesson_id), {}))
+        note = " (Rscript not found, skipped)" if curriculum == "r" and ids and shutil.which("Rscript") is None else ""
+        print(f"  {curriculum:<7} ran {len(ids):>4}, produced {built:>4} in {result['timings'][curriculum]:.2f}s{note}")
+    kinds: Dict[str, int] = {}
+    for entry in entries.values():
+        if "kind" in entry:
+            kinds[entry["kind"]] = kinds.get(entry["kind"], 0) + 1
+    print(f"\n{sum(kinds.values())} expected outputs ({', '.join(f'{k}: {v}' for k, v in sorted(kinds.items()))}), "
+          f"{result['reused']} reused -> {OUTPUTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
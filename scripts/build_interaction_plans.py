@@ -3,12 +3,8 @@ import re
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-LESSONS_PATH = Path("frontend/public/data/lessons.json")
-COURSE_PATHS = {
-    "python": Path("frontend/public/data/course-python-basics.json"),
-    "sql": Path("frontend/public/data/course-sql-fundamentals.json"),
-    "r": Path("frontend/public/data/course-r-fundamentals.json"),
-}
+from keyword_matcher import TagMatcher
+from lesson_store import LessonStore, curriculum_for
 
 PYTHON_TAG_RULES = {
     "variables": ["variable", "assignment", "reassign", "swap", "naming"],
@@ -54,6 +50,12 @@ R_TAG_RULES = {
     "packages": ["library", "package", "install"],
 }
 
+TAG_MATCHERS = {
+    "python": TagMatcher(PYTHON_TAG_RULES),
+    "sql": TagMatcher(SQL_TAG_RULES),
+    "r": TagMatcher(R_TAG_RULES),
+}
+
 DEFAULT_LEFT_TABLE = [
     {"id": 1, "name": "Alice", "dept_id": 10},
     {"id": 2, "name": "Bob", "dept_id": 20},
@@ -75,14 +77,8 @@ def count_code_blocks(content: str) -> int:
     return len(re.findall(r"```", content)) // 2
 
 
-def infer_tags(text: str, title: str, rules: Dict[str, List[str]]) -> Tuple[List[str], float]:
-    scores: Dict[str, int] = {}
-    for tag, keywords in rules.items():
-        for keyword in keywords:
-            if keyword in text:
-                scores[tag] = scores.get(tag, 0) + 1
-            if keyword in title:
-                scores[tag] = scores.get(tag, 0) + 2
+def infer_tags(text: str, title: str, rules: TagMatcher) -> Tuple[List[str], float]:
+    scores = rules.score(text, title)
 
     if not scores:
         return ["general"], 0.55
@@ -134,22 +130,6 @@ def extract_sql_table(solution_code: str) -> str:
     return match.group(1) if match else "employees"
 
 
-def load_course_order(path: Path) -> List[int]:
-    if not path.exists():
-        return []
-    data = json.loads(path.read_text())
-    order: List[int] = []
-    for chapter in data.get("chapters", []):
-        if "concepts" in chapter:
-            for concept in chapter.get("concepts", []):
-                for lesson in concept.get("lessons", []):
-                    order.append(lesson["id"])
-        else:
-            for lesson in chapter.get("lessons", []):
-                order.append(lesson["id"])
-    return order
-
-
 def build_hint_item(lesson: Dict[str, Any]) -> Dict[str, Any]:
     hints = build_hints(lesson.get("solution_code", ""), "Review the key line in the prompt.")
     return {"type": "hint_ladder", "hints": hints}
@@ -1017,74 +997,107 @@ def build_plan(curriculum: str, tag: str, lesson: Dict[str, Any], recipe_id: str
     return plan, template
 
 
-def main() -> None:
-    if not LESSONS_PATH.exists():
-        raise SystemExit(f"Missing lessons file at {LESSONS_PATH}")
-
-    lessons = json.loads(LESSONS_PATH.read_text())
-    course_order = {key: load_course_order(path) for key, path in COURSE_PATHS.items()}
+PLAN_FIELDS = (
+    "concept_tags", "interaction_plan", "interaction_required", "send_to_editor_template",
+    "interaction_recipe_id", "interaction_confidence", "manual_review", "prediction_justification",
+)
+REPORT_PATH = Path("scripts/interaction_plan_report.json")
+
+
+def lesson_tags(curriculum: str, lesson: Dict[str, Any]) -> Tuple[List[str], float, str]:
+    """(tags, confidence, normalized title) for one lesson."""
+    text = normalize_text(f"{lesson.get('title', '')} {lesson.get('content', '')} {lesson.get('chapter_title', '')}")
+    title_text = normalize_text(lesson.get("title", ""))
+    tags, confidence = infer_tags(text, title_text, TAG_MATCHERS[curriculum])
+    return tags, confidence, title_text
+
+
+def apply_plan(curriculum: str, lesson: Dict[str, Any], tags: List[str], confidence: float, title_text: str,
+               recipe_id: str) -> bool:
+    """Write the plan fields into ``lesson``; return whether they changed."""
+    plan, template = build_plan(curriculum, tags[0], lesson, recipe_id)
+
+    code_blocks = count_code_blocks(lesson.get("content", ""))
+    is_project = any(keyword in title_text for keyword in ("project", "capstone", "challenge", "boss"))
+    manual_review = confidence < 0.7 or code_blocks > 3 or is_project or len(tags) > 3
+
+    before = [lesson.get(field) for field in PLAN_FIELDS]
+    lesson["concept_tags"] = tags
+    lesson["interaction_plan"] = plan
+    lesson["interaction_required"] = True
+    lesson["send_to_editor_template"] = template
+    lesson["interaction_recipe_id"] = recipe_id
+    lesson["interaction_confidence"] = round(confidence, 2)
+    lesson["manual_review"] = manual_review
+    lesson["prediction_justification"] = None
+    return before != [lesson.get(field) for field in PLAN_FIELDS]
+
+
+def main(changed_ids=None) -> None:
+    """Plan every lesson.
+
+    With ``changed_ids`` (lesson id strings, passed by the pipeline) only
+    those lessons are planned again, plus, in course order, every lesson
+    after one whose recipe changed: recipe selection looks at the recipes
+    before it in the course and in its chapter. Unchanged lessons replay
+    their stored recipe. A full run happens instead when chapter sizes
+    changed or a lesson was deleted.
+    """
+    store = LessonStore.load()
+    lessons = store.lessons
+    course_order = store.course_order
 
     chapter_totals_by_curriculum: Dict[str, Dict[int, int]] = {"python": {}, "sql": {}, "r": {}}
-    for lesson_key, lesson in lessons.items():
-        chapter_id = int(lesson.get("chapter_id", 0))
-        if not chapter_id:
-            continue
-        lesson_id = int(lesson_key)
-        if lesson_id >= 2000:
-            curriculum_key = "r"
-        elif 1000 < lesson_id < 2000:
-            curriculum_key = "sql"
-        else:
-            curriculum_key = "python"
-        totals = chapter_totals_by_curriculum[curriculum_key]
-        totals[chapter_id] = totals.get(chapter_id, 0) + 1
+    for chapter_id, lesson_ids in store.by_chapter.items():
+        for lesson_id in lesson_ids:
+            totals = chapter_totals_by_curriculum[curriculum_for(lesson_id)]
+            totals[chapter_id] = totals.get(chapter_id, 0) + 1
+    saved_totals = {
+        curriculum: {str(chapter_id): total for chapter_id, total in sorted(totals.items())}
+        for curriculum, totals in chapter_totals_by_curriculum.items()
+    }
+
+    changed = None
+    if changed_ids is not None and REPORT_PATH.exists():
+        previous_report = json.loads(REPORT_PATH.read_text())
+        if previous_report.get("chapter_totals") == saved_totals and all(key in lessons for key in changed_ids):
+            changed = {int(key) for key in changed_ids}
 
     manual_review_ids = []
+    updated = 0
 
     processed_ids = set()
 
     for curriculum, ordered_ids in course_order.items():
         recent_recipes: List[str] = []
         chapter_recipe_counts: Dict[int, Dict[str, int]] = {}
-        rules = PYTHON_TAG_RULES if curriculum == "python" else SQL_TAG_RULES if curriculum == "sql" else R_TAG_RULES
+        diverged = False
 
         for lesson_id in ordered_ids:
             lesson = lessons.get(str(lesson_id))
             if not lesson:
                 continue
             lesson["id"] = lesson_id
-
-            text = normalize_text(f"{lesson.get('title', '')} {lesson.get('content', '')} {lesson.get('chapter_title', '')}")
-            title_text = normalize_text(lesson.get("title", ""))
-            tags, confidence = infer_tags(text, title_text, rules)
-            primary_tag = tags[0]
-
-            candidates = RECIPE_OPTIONS[curriculum].get(primary_tag, RECIPE_OPTIONS[curriculum]["general"])
             chapter_id = int(lesson.get("chapter_id", 0))
-            recipe_id = select_recipe(
-                candidates,
-                recent_recipes,
-                chapter_id,
-                chapter_totals_by_curriculum[curriculum],
-                chapter_recipe_counts,
-                RECIPE_POOLS[curriculum],
-            )
-            plan, template = build_plan(curriculum, primary_tag, lesson, recipe_id)
-
-            code_blocks = count_code_blocks(lesson.get("content", ""))
-            is_project = any(keyword in title_text for keyword in ("project", "capstone", "challenge", "boss"))
-            manual_review = confidence < 0.7 or code_blocks > 3 or is_project or len(tags) > 3
-
-            lesson["concept_tags"] = tags
-            lesson["interaction_plan"] = plan
-            lesson["interaction_required"] = True
-            lesson["send_to_editor_template"] = template
-            lesson["interaction_recipe_id"] = recipe_id
-            lesson["interaction_confidence"] = round(confidence, 2)
-            lesson["manual_review"] = manual_review
-            lesson["prediction_justification"] = None
-
-            if manual_review:
+
+            if changed is None or diverged or lesson_id in changed or "interaction_recipe_id" not in lesson:
+                tags, confidence, title_text = lesson_tags(curriculum, lesson)
+                candidates = RECIPE_OPTIONS[curriculum].get(tags[0], RECIPE_OPTIONS[curriculum]["general"])
+                recipe_id = select_recipe(
+                    candidates,
+                    recent_recipes,
+                    chapter_id,
+                    chapter_totals_by_curriculum[curriculum],
+                    chapter_recipe_counts,
+                    RECIPE_POOLS[curriculum],
+                )
+                # Later lessons' recipes depend on this one's only through recipe_id
+                diverged = diverged or recipe_id != lesson.get("interaction_recipe_id")
+                updated += apply_plan(curriculum, lesson, tags, confidence, title_text, recipe_id)
+            else:
+                recipe_id = lesson["interaction_recipe_id"]
+
+            if lesson["manual_review"]:
                 manual_review_ids.append(lesson_id)
 
             chapter_recipe_counts.setdefault(chapter_id, {})
@@ -1102,51 +1115,28 @@ def main() -> None:
             continue
         lesson["id"] = lesson_id
 
-        if lesson_id >= 2000:
-            curriculum = "r"
-            rules = R_TAG_RULES
-        elif 1000 < lesson_id < 2000:
-            curriculum = "sql"
-            rules = SQL_TAG_RULES
-        else:
-            curriculum = "python"
-            rules = PYTHON_TAG_RULES
-
-        text = normalize_text(f"{lesson.get('title', '')} {lesson.get('content', '')} {lesson.get('chapter_title', '')}")
-        title_text = normalize_text(lesson.get("title", ""))
-        tags, confidence = infer_tags(text, title_text, rules)
-        primary_tag = tags[0]
-
-        candidates = RECIPE_OPTIONS[curriculum].get(primary_tag, RECIPE_OPTIONS[curriculum]["general"])
-        recipe_id = candidates[0]
-        plan, template = build_plan(curriculum, primary_tag, lesson, recipe_id)
-
-        code_blocks = count_code_blocks(lesson.get("content", ""))
-        is_project = any(keyword in title_text for keyword in ("project", "capstone", "challenge", "boss"))
-        manual_review = confidence < 0.7 or code_blocks > 3 or is_project or len(tags) > 3
-
-        lesson["concept_tags"] = tags
-        lesson["interaction_plan"] = plan
-        lesson["interaction_required"] = True
-        lesson["send_to_editor_template"] = template
-        lesson["interaction_recipe_id"] = recipe_id
-        lesson["interaction_confidence"] = round(confidence, 2)
-        lesson["manual_review"] = manual_review
-        lesson["prediction_justification"] = None
-
-        if manual_review:
+        if changed is None or lesson_id in changed or "interaction_recipe_id" not in lesson:
+            curriculum = curriculum_for(lesson_id)
+            tags, confidence, title_text = lesson_tags(curriculum, lesson)
+            candidates = RECIPE_OPTIONS[curriculum].get(tags[0], RECIPE_OPTIONS[curriculum]["general"])
+            updated += apply_plan(curriculum, lesson, tags, confidence, title_text, candidates[0])
+
+        if lesson["manual_review"]:
             manual_review_ids.append(lesson_id)
 
-    LESSONS_PATH.write_text(json.dumps(lessons, indent=2))
+    # A full run always rewrites lessons.json; an incremental one only when a plan changed
+    if changed is None or updated:
+        store.save()
 
-    report_path = Path("scripts/interaction_plan_report.json")
     report = {
         "total_lessons": len(lessons),
         "manual_review_count": len(manual_review_ids),
-        "manual_review_ids": manual_review_ids[:200]
+        "manual_review_ids": manual_review_ids[:200],
+        "chapter_totals": saved_totals,
     }
-    report_path.write_text(json.dumps(report, indent=2))
-    print(f"Updated {len(lessons)} lessons. Manual review: {len(manual_review_ids)}.")
+    REPORT_PATH.write_text(json.dumps(report, indent=2))
+    mode = "" if changed is None else f" ({len(changed)} changed lessons, {updated} plans updated)"
+    print(f"Updated {len(lessons)} lessons{mode}. Manual review: {len(manual_review_ids)}.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+"""
+Code Tokenizers
+
+Language-aware lexers for the Python, SQL and R code in lessons, replacing
+regex approximations such as r'\\b(\\w+)\\s*\\(' that count words in strings
+and comments as calls and split operators like %>% and <-.
+
+- Python: the standard library ``tokenize`` module. Starter code that does
+  not tokenize to the end (unclosed brackets, bad dedents) keeps the tokens
+  read before the error and lexes the rest with the fallback lexer.
+- SQL: a lexer for -- and /* */ comments, '...' strings, quoted
+  identifiers, numbers, keywords, names and multi-character operators.
+- R: a lexer for # comments, strings, `backtick` names, dotted names,
+  numbers (1L, 2e3, .5) and operators (%>%, %in%, |>, <-, <<-, ->, ::, [[).
+
+A token is a (kind, text) pair; kinds are "keyword", "name", "op",
+"string", "number" and "comment". ``code_tokens`` is memoized on
+(language, code), so every audit that asks about the same code block
+shares one lex.
+
+Usage:
+    from code_tokens import code_tokens, function_calls
+
+    function_calls("r", "penguins %>% filter(bill_length_mm > 40)")  # {"filter"}
+"""
+
+import io
+import keyword
+import re
+import tokenize
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Optional, Tuple
+
+from lesson_sections import outline
+
+Token = Tuple[str, str]
+Tokens = Tuple[Token, ...]
+
+LANGUAGE_ALIASES = {"py": "python", "python3": "python", "postgresql": "sql", "sqlite": "sql"}
+INLINE_CODE_RE = re.compile(r"`([^`\n]+)`")
+
+SQL_KEYWORDS = frozenset("""
+    SELECT FROM WHERE AND OR NOT IN IS NULL LIKE BETWEEN ORDER BY ASC DESC LIMIT OFFSET DISTINCT AS
+    GROUP HAVING JOIN LEFT RIGHT INNER OUTER FULL CROSS ON USING UNION ALL INTERSECT EXCEPT
+    CASE WHEN THEN ELSE END INSERT INTO VALUES UPDATE SET DELETE CREATE TABLE VIEW INDEX DROP ALTER ADD
+    PRIMARY KEY FOREIGN REFERENCES UNIQUE CHECK DEFAULT CONSTRAINT WITH RECURSIVE OVER PARTITION ROWS RANGE
+    EXISTS ANY CAST BEGIN COMMIT ROLLBACK TRANSACTION TRIGGER RETURNING
+""".split())
+
+R_KEYWORDS = frozenset((
+    "if", "else", "repeat", "while", "function", "for", "in", "next", "break",
+    "TRUE", "FALSE", "NULL", "Inf", "NaN", "NA", "NA_integer_", "NA_real_", "NA_character_",
+))
+
+SQL_TOKEN_RE = re.compile(r"""
+    (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>'(?:[^']|'')*'?)
+  | (?P<quoted>"(?:[^"]|"")*"?|`[^`]*`?)
+  | (?P<number>\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|\.\d+)
+  | (?P<word>[A-Za-z_][\w$]*)
+  | (?P<op><>|!=|<=|>=|\|\||::|[^\s\w])
+""", re.VERBOSE | re.DOTALL)
+
+R_TOKEN_RE = re.compile(r"""
+    (?P<comment>\#[^\n]*)
+  | (?P<string>"(?:[^"\\]|\\.)*"?|'(?:[^'\\]|\\.)*'?)
+  | (?P<quoted>`[^`]*`?)
+  | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?[Li]?|0[xX][0-9a-fA-F]+L?)
+  | (?P<word>[A-Za-z][\w.]*|\.[A-Za-z_.][\w.]*|\.)
+  | (?P<op>%[^%\n]*%|<<-|->>|<-|->|\|>|:::|::|\[\[|\]\]|==|!=|<=|>=|&&|\|\||[^\s\w])
+""", re.VERBOSE)
+
+# Fallback for Python the tokenize module gives up on
+PYTHON_FALLBACK_RE = re.compile(r"""
+    (?P<comment>\#[^\n]*)
+  | (?P<string>(?:[rRbBfFuU]{1,2})?(?:'''.*?(?:'''|\Z)|\"\"\".*?(?:\"\"\"|\Z)|'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?))
+  | (?P<number>\d[\d_]*(?:\.[\d_]*)?(?:[eE][-+]?\d+)?j?|\.\d+)
+  | (?P<word>[A-Za-z_]\w*)
+  | (?P<op>\*\*=?|//=?|->|:=|[-+*/%&|^<>!=]=|<<|>>|[^\s\w])
+""", re.VERBOSE | re.DOTALL)
+
+PYTHON_KINDS = {
+    tokenize.NAME: "name",
+    tokenize.OP: "op",
+    tokenize.STRING: "string",
+    tokenize.NUMBER: "number",
+    tokenize.COMMENT: "comment",
+}
+# Python 3.12+ splits f-strings into start/middle/end tokens; the start carries the prefix
+FSTRING_START = getattr(tokenize, "FSTRING_START", None)
+
+
+def regex_tokens(pattern: "re.Pattern[str]", code: str, keywords: FrozenSet[str], upper: bool = False) -> List[Token]:
+    found: List[Token] = []
+    for match in pattern.finditer(code):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "word":
+            kind = "keyword" if (text.upper() if upper else text) in keywords else "name"
+        elif kind == "quoted":
+            kind, text = "name", text.strip('"`')
+        found.append((kind, text))
+    return found
+
+
+def python_tokens(code: str) -> List[Token]:
+    found: List[Token] = []
+    lines = io.StringIO(code).readline
+    consumed = 0
+    try:
+        for token in tokenize.generate_tokens(lines):
+            if token.type == FSTRING_START:
+                found.append(("string", token.string))
+            elif token.type in PYTHON_KINDS:
+                kind = PYTHON_KINDS[token.type]
+                if kind == "name" and keyword.iskeyword(token.string):
+                    kind = "keyword"
+                found.append((kind, token.string))
+            consumed = token.end[0]
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        rest = "".join(code.splitlines(keepends=True)[consumed:])
+        python_keywords = frozenset(keyword.kwlist)
+        found.extend(regex_tokens(PYTHON_FALLBACK_RE, rest, python_keywords))
+    return found
+
+
+def sql_tokens(code: str) -> List[Token]:
+    return regex_tokens(SQL_TOKEN_RE, code, SQL_KEYWORDS, upper=True)
+
+
+def r_tokens(code: str) -> List[Token]:
+    return regex_tokens(R_TOKEN_RE, code, R_KEYWORDS)
+
+
+LEXERS = {"python": python_tokens, "sql": sql_tokens, "r": r_tokens}
+
+
+def language_of(tag: str) -> Optional[str]:
+    """Lexer name for a fence tag ("py", "R", "postgresql"), or None if there is no lexer."""
+    tag = tag.lower()
+    tag = LANGUAGE_ALIASES.get(tag, tag)
+    return tag if tag in LEXERS else None
+
+
+@lru_cache(maxsize=None)
+def code_tokens(language: str, code: str) -> Tokens:
+    """All tokens of one block of code (comments included); memoized per block."""
+    lexer = LEXERS.get(language)
+    return tuple(lexer(code)) if lexer else ()
+
+
+def significant_tokens(language: str, code: str) -> Tokens:
+    """Tokens without comments."""
+    return tuple(token for token in code_tokens(language, code) if token[0] != "comment")
+
+
+@lru_cache(maxsize=None)
+def function_calls(language: str, code: str) -> FrozenSet[str]:
+    """Names called in ``code``: a name token followed by "(" (comments and strings never count)."""
+    tokens = significant_tokens(language, code)
+    calls = set()
+    for (kind, text), following in zip(tokens, tokens[1:]):
+        if following == ("op", "(") and kind == "name":
+            calls.add(text)
+    return frozenset(calls)
+
+
+def content_code(content: str, language: str) -> Iterator[Tuple[str, str]]:
+    """(language, code) for each fenced block and inline code span in lesson markdown.
+
+    Untagged blocks and inline spans take ``language``; blocks tagged with a
+    language that has no lexer are skipped.
+    """
+    sections = outline(content)
+    for block in sections.code_blocks:
+        block_language = language_of(block.language) if block.language else language
+        if block_language is not None:
+            yield block_language, block.code
+    for span in INLINE_CODE_RE.findall(sections.prose):
+        yield language, span
@@ -0,0 +1,85 @@
+"""
+Lesson Corpus Comparison
+
+Compares lessons.json with the other lesson corpora kept next to it
+(lessons_interactive.json, lessons.json.bak): which lessons exist in only
+one of them, and for lessons in both, which fields differ. Every corpus is
+held in memory at once, as lesson_record.LessonRecord records rather than
+dicts.
+
+Usage:
+    python scripts/compare_corpora.py                 # lessons.json against every other corpus present
+    python scripts/compare_corpora.py BASE OTHER ...  # explicit files, the first is the base
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from lesson_record import CORPUS_PATHS, LessonRecord, load_records
+
+Records = Dict[str, LessonRecord]
+
+# Lesson ids listed per difference before eliding the rest
+MAX_LISTED = 10
+
+
+def changed_fields(base: LessonRecord, other: LessonRecord) -> List[str]:
+    """Fields whose values differ, including fields only one side has, in base order."""
+    fields = list(base) + [field for field in other if field not in base]
+    return [field for field in fields if base.get(field) != other.get(field)]
+
+
+def compare(base: Records, other: Records) -> Tuple[List[str], List[str], Dict[str, List[str]]]:
+    """(ids only in base, ids only in other, {field: ids of shared lessons where it differs})."""
+    only_base = [lesson_id for lesson_id in base if lesson_id not in other]
+    only_other = [lesson_id for lesson_id in other if lesson_id not in base]
+    by_field: Dict[str, List[str]] = {}
+    for lesson_id, record in base.items():
+        if lesson_id in other:
+            for field in changed_fields(record, other[lesson_id]):
+                by_field.setdefault(field, []).append(lesson_id)
+    return only_base, only_other, by_field
+
+
+def listed(ids: List[str]) -> str:
+    shown = ", ".join(ids[:MAX_LISTED])
+    return shown + (f", ... (+{len(ids) - MAX_LISTED})" if len(ids) > MAX_LISTED else "")
+
+
+def main() -> None:
+    paths = [Path(arg) for arg in sys.argv[1:]] or [path for path in CORPUS_PATHS if path.exists()]
+    missing = [str(path) for path in paths if not path.exists()]
+    if missing:
+        raise SystemExit(f"Missing corpus file(s): {', '.join(missing)}")
+    if len(paths) < 2:
+        raise SystemExit("Need at least two corpora to compare")
+
+    corpora = {path: load_records(path) for path in paths}
+    base_path, base = paths[0], corpora[paths[0]]
+
+    print("=" * 60)
+    print("LESSON CORPUS COMPARISON")
+    print("=" * 60)
+    for path in paths:
+        print(f"  {path}: {len(corpora[path])} lessons")
+
+    for path in paths[1:]:
+        only_base, only_other, by_field = compare(base, corpora[path])
+        changed = {lesson_id for ids in by_field.values() for lesson_id in ids}
+        shared = len(base) - len(only_base)
+        print(f"\n{base_path.name} vs {path.name}")
+        print("-" * 60)
+        print(f"  Shared lessons: {shared}, {len(changed)} differ")
+        if only_base:
+            print(f"  Only in {base_path.name} ({len(only_base)}): {listed(only_base)}")
+        if only_other:
+            print(f"  Only in {path.name} ({len(only_other)}): {listed(only_other)}")
+        counts = Counter({field: len(ids) for field, ids in by_field.items()})
+        for field, count in counts.most_common():
+            print(f"  {field:28} {count:5} lessons")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Concept Graph
+
+Builds, in one pass over the corpus, which concepts (keywords, builtin and
+method calls, operators, imported modules, SQL clauses and functions, R
+functions, operators and datasets) each lesson teaches and uses, and where
+in course order each concept first appears.
+
+- A lesson *teaches* the concepts in its content: example code blocks and
+  inline code such as `filter()`.
+- A lesson *uses* what it teaches plus the concepts in its starter and
+  solution code.
+- ``introduced``: concept -> first lesson in course order that teaches it.
+- ``first_use``: concept -> first lesson in course order that uses it.
+- ``lessons``: inverted index, concept -> every lesson using it (course
+  order, then lessons outside the course by id).
+
+Each code block is lexed once with the language-aware tokenizers in
+code_tokens.py, so words in strings and comments are not concepts, and
+``code_concepts`` is memoized on the block's text. Each lesson's taught and
+used sets are also cached in .concept_graph_cache.json under a hash of its
+content, starter and solution code and the extractor sources, so a rebuild
+after an edit only lexes the lessons that changed. The set of concepts
+taught so far is accumulated per lesson, so "does lesson X use anything not
+yet taught?" is a set difference (``hidden_prerequisites``) instead of a
+regex scan of the corpus per keyword.
+Lessons outside the course order have no position and report none.
+
+The graph is written to scripts/concept_graph.json.
+
+Usage:
+    python scripts/concept_graph.py            # build and write the graph
+    python scripts/concept_graph.py 12 2010    # show one lesson's concepts
+"""
+
+import builtins
+import hashlib
+import json
+import sys
+import weakref
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from code_tokens import Tokens, content_code, significant_tokens
+from lesson_store import CURRICULA, LessonStore, curriculum_for
+
+GRAPH_PATH = Path("scripts/concept_graph.json")
+GRAPH_VERSION = 1
+CACHE_PATH = Path(".concept_graph_cache.json")
+
+# Editing any of these changes every cache key
+EXTRACTOR_SOURCES = [
+    Path(__file__).resolve(),
+    Path(__file__).resolve().parent / "code_tokens.py",
+    Path(__file__).resolve().parent / "lesson_sections.py",
+]
+CONCEPT_FIELDS = ("content", "starter_code", "solution_code")
+
+PYTHON_BUILTINS = frozenset(name for name in dir(builtins) if name[0].islower() and not name.startswith("_"))
+PYTHON_OPERATORS = frozenset(("==", "!=", "<=", ">=", "+=", "-=", "*=", "/=", "**", "//", ":="))
+
+SQL_PHRASES = frozenset((
+    ("ORDER", "BY"), ("GROUP", "BY"), ("PARTITION", "BY"), ("LEFT", "JOIN"), ("RIGHT", "JOIN"),
+    ("INNER", "JOIN"), ("FULL", "JOIN"), ("CROSS", "JOIN"), ("UNION", "ALL"), ("IS", "NULL"), ("NOT", "NULL"),
+    ("INSERT", "INTO"), ("PRIMARY", "KEY"), ("FOREIGN", "KEY"), ("CREATE", "TABLE"), ("CREATE", "VIEW"),
+    ("CREATE", "INDEX"), ("DELETE", "FROM"),
+))
+# Names followed by "(" that are table names, not function calls
+SQL_TABLE_CONTEXT = frozenset(("INTO", "TABLE", "VIEW", "INDEX", "ON", "REFERENCES", "FROM", "JOIN"))
+
+R_CONTROL_KEYWORDS = frozenset(("function", "if", "else", "for", "while", "repeat", "next", "break"))
+R_OPERATORS = frozenset(("%>%", "|>", "<-", "<<-", "->", "%in%", "$", "::", "[[", "==", "!=", "~"))
+R_DATASETS = frozenset(("penguins", "mtcars", "mpg", "diamonds", "flights", "starwars", "iris", "table4a"))
+
+STRING_PREFIX_CHARS = "rRbBfFuU"
+
+Concepts = FrozenSet[str]
+
+
+def python_concepts(tokens: Tokens) -> Set[str]:
+    found: Set[str] = set()
+    from_import = False
+    for index, (kind, text) in enumerate(tokens):
+        following = tokens[index + 1] if index + 1 < len(tokens) else ("", "")
+        previous = tokens[index - 1] if index else ("", "")
+        if kind == "string":
+            if "f" in text[:len(text) - len(text.lstrip(STRING_PREFIX_CHARS))].lower():
+                found.add("f-string")
+        elif kind == "keyword":
+            found.add(text)
+            # "from pandas import DataFrame" imports pandas, not DataFrame
+            if text in ("import", "from") and following[0] == "name" and not from_import:
+                found.add(f"import {following[1]}")
+            from_import = text == "from"
+        elif kind == "name" and following == ("op", "("):
+            if previous == ("op", "."):
+                found.add(f".{text}()")
+            elif text in PYTHON_BUILTINS:
+                found.add(f"{text}()")
+        elif kind == "op" and text in PYTHON_OPERATORS:
+            found.add(text)
+    return found
+
+
+def sql_concepts(tokens: Tokens) -> Set[str]:
+    found: Set[str] = set()
+    for index, (kind, text) in enumerate(tokens):
+        following = tokens[index + 1] if index + 1 < len(tokens) else ("", "")
+        previous = tokens[index - 1][1].upper() if index else ""
+        if kind == "keyword":
+            word = text.upper()
+            found.add(word)
+            if (word, following[1].upper()) in SQL_PHRASES:
+                found.add(f"{word} {following[1].upper()}")
+        elif kind == "name" and following == ("op", "(") and previous not in SQL_TABLE_CONTEXT:
+            found.add(f"{text.upper()}()")
+    return found
+
+
+def r_concepts(tokens: Tokens) -> Set[str]:
+    found: Set[str] = set()
+    for index, (kind, text) in enumerate(tokens):
+        following = tokens[index + 1] if index + 1 < len(tokens) else ("", "")
+        if kind == "keyword" and text in R_CONTROL_KEYWORDS:
+            found.add(text)
+        elif kind == "op" and text in R_OPERATORS:
+            found.add(text)
+        elif kind == "name" and following == ("op", "("):
+            found.add(f"{text}()")
+        elif kind == "name" and text in R_DATASETS:
+            found.add(text)
+    return found
+
+
+CONCEPT_EXTRACTORS = {"python": python_concepts, "sql": sql_concepts, "r": r_concepts}
+
+
+@lru_cache(maxsize=None)
+def code_concepts(curriculum: str, code: str) -> Concepts:
+    """Concepts in one block of ``curriculum`` code; memoized per block."""
+    return frozenset(CONCEPT_EXTRACTORS[curriculum](significant_tokens(curriculum, code)))
+
+
+def taught_concepts(curriculum: str, content: str) -> Concepts:
+    """Concepts a lesson's content teaches: its code blocks and inline code."""
+    found: Set[str] = set()
+    for language, code in content_code(content, curriculum):
+        found |= code_concepts(language, code)
+    return frozenset(found)
+
+
+def lesson_concepts(curriculum: str, lesson: Dict[str, Any]) -> Tuple[Concepts, Concepts]:
+    """(taught, used) for one lesson."""
+    taught = taught_concepts(curriculum, lesson.get("content") or "")
+    code = (lesson.get("starter_code") or "") + "\n" + (lesson.get("solution_code") or "")
+    return taught, taught | code_concepts(curriculum, code)
+
+
+@lru_cache(maxsize=None)
+def extractor_version() -> str:
+    digest = hashlib.sha1()
+    for path in EXTRACTOR_SOURCES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(curriculum: str, lesson: Dict[str, Any]) -> str:
+    payload = json.dumps([extractor_version(), curriculum, *(lesson.get(field) for field in CONCEPT_FIELDS)])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_cache() -> Dict[str, List[List[str]]]:
+    if not CACHE_PATH.exists():
+        return {}
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except ValueError:
+        return {}
+
+
+class ConceptGraph:
+    """Per-lesson concept sets plus first-introduction and inverted indexes.
+
+    ``cache`` (cache key -> [taught, used], as in .concept_graph_cache.json)
+    supplies the sets of lessons it has and receives the ones computed;
+    ``cache_keys`` are the keys this corpus uses.
+    """
+
+    def __init__(self, store: LessonStore, cache: Optional[Dict[str, List[List[str]]]] = None):
+        self.cache = cache if cache is not None else {}
+        self.cache_keys: Set[str] = set()
+        self.computed = 0
+        self.taught: Dict[int, Concepts] = {}
+        self.used: Dict[int, Concepts] = {}
+        self.known: Dict[int, Concepts] = {}
+        self.position: Dict[int, int] = {}
+        self.introduced: Dict[str, Dict[str, int]] = {}
+        self.first_use: Dict[str, Dict[str, int]] = {}
+        self.lessons: Dict[str, Dict[str, List[int]]] = {}
+        for curriculum in CURRICULA:
+            self._build(store, curriculum)
+
+    def _build(self, store: LessonStore, curriculum: str) -> None:
+        for lesson_id, lesson in store.curriculum_lessons(curriculum):
+            key = cache_key(curriculum, lesson)
+            cached = self.cache.get(key)
+            if cached is None:
+                taught, used = lesson_concepts(curriculum, lesson)
+                self.cache[key] = [sorted(taught), sorted(used)]
+                self.computed += 1
+            else:
+                taught, used = frozenset(cached[0]), frozenset(cached[1])
+            self.cache_keys.add(key)
+            self.taught[lesson_id] = taught
+            self.used[lesson_id] = used
+
+        introduced: Dict[str, int] = {}
+        first_use: Dict[str, int] = {}
+        index: Dict[str, List[int]] = {}
+        known: Set[str] = set()
+        course = [lesson_id for lesson_id, _ in store.ordered_lessons(curriculum)]
+        for position, lesson_id in enumerate(course):
+            self.position[lesson_id] = position
+            for concept in self.taught[lesson_id] - known:
+                introduced[concept] = lesson_id
+            known |= self.taught[lesson_id]
+            self.known[lesson_id] = frozenset(known)
+            for concept in self.used[lesson_id]:
+                first_use.setdefault(concept, lesson_id)
+                index.setdefault(concept, []).append(lesson_id)
+
+        on_course = set(course)
+        for lesson_id in store.by_curriculum[curriculum]:
+            if lesson_id not in on_course:
+                for concept in self.used[lesson_id]:
+                    index.setdefault(concept, []).append(lesson_id)
+
+        self.introduced[curriculum] = introduced
+        self.first_use[curriculum] = first_use
+        self.lessons[curriculum] = index
+
+    def hidden_prerequisites(self, lesson_id: int) -> Set[str]:
+        """Concepts the lesson uses that no lesson up to and including it teaches."""
+        if lesson_id not in self.position:
+            return set()
+        return set(self.used[lesson_id] - self.known[lesson_id])
+
+    def introduced_in(self, lesson_id: int, concept: str) -> Optional[int]:
+        """The lesson (in ``lesson_id``'s curriculum) that first teaches ``concept``."""
+        return self.introduced[curriculum_for(lesson_id)].get(concept)
+
+    def lessons_using(self, curriculum: str, concept: str) -> List[int]:
+        return list(self.lessons[curriculum].get(concept, []))
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": GRAPH_VERSION,
+            "curricula": {
+                curriculum: {
+                    "introduced": dict(sorted(self.introduced[curriculum].items())),
+                    "first_use": dict(sorted(self.first_use[curriculum].items())),
+                    "lessons": dict(sorted(self.lessons[curriculum].items())),
+                }
+                for curriculum in CURRICULA
+            },
+            "hidden_prerequisites": {
+                str(lesson_id): sorted(hidden)
+                for lesson_id in sorted(self.position)
+                for hidden in [self.hidden_prerequisites(lesson_id)]
+                if hidden
+            },
+        }
+
+
+# store -> graph, so every audit rule in a run shares one build
+_GRAPH_CACHE: "weakref.WeakKeyDictionary[LessonStore, ConceptGraph]" = weakref.WeakKeyDictionary()
+
+
+def concept_graph(store: LessonStore) -> ConceptGraph:
+    graph = _GRAPH_CACHE.get(store)
+    if graph is None:
+        graph = _GRAPH_CACHE[store] = ConceptGraph(store, load_cache())
+        if graph.computed or len(graph.cache) != len(graph.cache_keys):
+            # Keep only the entries this corpus still uses
+            CACHE_PATH.write_text(json.dumps({key: graph.cache[key] for key in sorted(graph.cache_keys)}))
+    return graph
+
+
+def describe(graph: ConceptGraph, lesson_ids: Iterable[int]) -> None:
+    for lesson_id in lesson_ids:
+        position = graph.position.get(lesson_id)
+        print(f"{lesson_id} (course position {position if position is not None else 'off-course'})")
+        print(f"  teaches: {', '.join(sorted(graph.taught.get(lesson_id, ())))}")
+        print(f"  uses:    {', '.join(sorted(graph.used.get(lesson_id, ())))}")
+        for concept in sorted(graph.hidden_prerequisites(lesson_id)):
+            introduced = graph.introduced_in(lesson_id, concept)
+            print(f"  ✗ {concept} (taught in {introduced if introduced else 'no lesson'})")
+
+
+def main(changed_ids: Optional[Iterable[str]] = None) -> None:
+    """Build and write the graph.
+
+    ``changed_ids`` (lesson id strings, passed by the pipeline) needs no
+    special handling: lessons whose fields did not change are served from
+    the concept cache.
+    """
+    store = LessonStore.load()
+    graph = concept_graph(store)
+    lesson_ids = [int(arg) for arg in sys.argv[1:] if not arg.startswith("--")]
+    if lesson_ids:
+        describe(graph, lesson_ids)
+        return
+
+    data = graph.to_json()
+    GRAPH_PATH.write_text(json.dumps(data, indent=1, ensure_ascii=False) + "\n")
+    print("=" * 60)
+    print("CONCEPT GRAPH")
+    print("=" * 60)
+    for curriculum in CURRICULA:
+        hidden = sum(1 for lesson_id in data["hidden_prerequisites"] if curriculum_for(int(lesson_id)) == curriculum)
+        print(f"  {curriculum:<7} {len(graph.lessons[curriculum]):>5} concepts, "
+              f"{len(graph.introduced[curriculum]):>5} taught in course, {hidden:>4} lessons with hidden prerequisites")
+    print(f"\nLexed {graph.computed} lessons, reused {len(graph.taught) - graph.computed} cached")
+    print(f"-> {GRAPH_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,30 +3,33 @@ Create Missing R Reinforcers - Part 1
 Concepts: 2005, 2006, 2011, 2012
 """
 
-import json
+from lesson_patches import PatchSet, apply_patch_sets
 
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+PATCHES = PatchSet("create_r_reinforcers_part1")
 
 def create_reinforcer(concept_id, role_num, title, content):
     """Create a reinforcer lesson."""
     reinf_id = concept_id * 10 + role_num
-    concept = lessons.get(str(concept_id), {})
-    return {
-        "id": reinf_id,
-        "title": title,
-        "content": content,
-        "starter_code": "",
-        "solution_code": "",
-        "expected_output": "",
-        "chapter_id": concept.get("chapter_id", 1),
-        "chapter_title": concept.get("chapter_title", ""),
-        "gap_ids": ["R-REINF"],
-        "batch_id": "R-3"
-    }
+
+    def build(lessons):
+        concept = lessons.get(str(concept_id), {})
+        return {
+            "id": reinf_id,
+            "title": title,
+            "content": content,
+            "starter_code": "",
+            "solution_code": "",
+            "expected_output": "",
+            "chapter_id": concept.get("chapter_id", 1),
+            "chapter_title": concept.get("chapter_title", ""),
+            "gap_ids": ["R-REINF"],
+            "batch_id": "R-3"
+        }
+
+    PATCHES.derive(reinf_id, build)
 
 # ===== 2005: Coloring by Species =====
-lessons["20051"] = create_reinforcer(2005, 1, "Analogy: Color Coding",
+create_reinforcer(2005, 1, "Analogy: Color Coding",
 """# 🎨 Color as Information
 
 ## What You'll Learn
@@ -71,7 +74,7 @@ aes(color = species)
 ✅ **No Hidden Prerequisites**: Uses `ggplot()`, `aes()`, `geom_point()`, and `penguins` from prior lessons.
 """)
 
-lessons["20052"] = create_reinforcer(2005, 2, "Variation: Color vs Fill",
+create_reinforcer(2005, 2, "Variation: Color vs Fill",
 """# 🔲 Color vs Fill
 
 ## What You'll Learn
@@ -119,7 +122,7 @@ geom_bar(aes(fill = species))
 ✅ **No Hidden Prerequisites**: Uses `geom_bar()` which is introduced in this chapter.
 """)
 
-lessons["20053"] = create_reinforcer(2005, 3, "Fix the Code: Aesthetic Inside Geom",
+create_reinforcer(2005, 3, "Fix the Code: Aesthetic Inside Geom",
 """# 🔧 Fix: Aes Placement
 
 ## What You'll Learn
@@ -166,7 +169,7 @@ aes(..., color = species)
 ✅ **No Hidden Prerequisites**: Uses aesthetic mapping from this lesson.
 """)
 
-lessons["20054"] = create_reinforcer(2005, 4, "Challenge: Color by Island",
+create_reinforcer(2005, 4, "Challenge: Color by Island",
 """# 🦸 Challenge: Another Variable
 
 ## What You'll Learn
@@ -211,7 +214,7 @@ color = island
 """)
 
 # ===== 2006: Adding a Trend Line =====
-lessons["20061"] = create_reinforcer(2006, 1, "Analogy: The Best-Fit Line",
+create_reinforcer(2006, 1, "Analogy: The Best-Fit Line",
 """# 📈 Drawing the Trend
 
 ## What You'll Learn
@@ -255,7 +258,7 @@ geom_smooth()
 ✅ **No Hidden Prerequisites**: Uses `geom_smooth()` from this lesson.
 """)
 
-lessons["20062"] = create_reinforcer(2006, 2, "Variation: Straight Line",
+create_reinforcer(2006, 2, "Variation: Straight Line",
 """# 📏 Linear Trend
 
 ## What You'll Learn
@@ -299,7 +302,7 @@ geom_smooth(method = "lm")
 ✅ **No Hidden Prerequisites**: Uses `geom_smooth()` with an argument.
 """)
 
-lessons["20063"] = create_reinforcer(2006, 3, "Fix the Code: Remove Shading",
+create_reinforcer(2006, 3, "Fix the Code: Remove Shading",
 """# 🔧 Fix: Confidence Interval
 
 ## What You'll Learn
@@ -345,7 +348,7 @@ geom_smooth(se = FALSE)
 ✅ **No Hidden Prerequisites**: Uses `geom_smooth()` argument.
 """)
 
-lessons["20064"] = create_reinforcer(2006, 4, "Challenge: Trend by Group",
+create_reinforcer(2006, 4, "Challenge: Trend by Group",
 """# 🦸 Challenge: Separate Trends
 
 ## What You'll Learn
@@ -386,7 +389,7 @@ Put `color = species` in the `ggplot(aes(...))` so all layers inherit it.
 """)
 
 # ===== 2011: Names & Comments =====
-lessons["20111"] = create_reinforcer(2011, 1, "Analogy: Labels on Boxes",
+create_reinforcer(2011, 1, "Analogy: Labels on Boxes",
 """# 🏷️ Naming Your Variables
 
 ## What You'll Learn
@@ -431,7 +434,7 @@ avg_penguin_mass  # snake_case (R convention)
 ✅ **No Hidden Prerequisites**: Uses basic assignment `<-`.
 """)
 
-lessons["20112"] = create_reinforcer(2011, 2, "Variation: Comments",
+create_reinforcer(2011, 2, "Variation: Comments",
 """# 💬 Adding Comments
 
 ## What You'll Learn
@@ -476,7 +479,7 @@ R uses `#`, not `//`.
 ✅ **No Hidden Prerequisites**: Uses basic R syntax.
 """)
 
-lessons["20113"] = create_reinforcer(2011, 3, "Fix the Code: Invalid Name",
+create_reinforcer(2011, 3, "Fix the Code: Invalid Name",
 """# 🔧 Fix: Variable Names
 
 ## What You'll Learn
@@ -524,7 +527,7 @@ first_penguin <- "Adelie"
 ✅ **No Hidden Prerequisites**: Basic R naming rules.
 """)
 
-lessons["20114"] = create_reinforcer(2011, 4, "Challenge: Rename for Clarity",
+create_reinforcer(2011, 4, "Challenge: Rename for Clarity",
 """# 🦸 Challenge: Better Names
 
 ## What You'll Learn
@@ -564,8 +567,6 @@ penguin_count <- 344
 ✅ **No Hidden Prerequisites**: Naming conventions only.
 """)
 
-# Save
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("Part 1 complete: Created reinforcers for 2005, 2006, 2011 (12 reinforcers)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("Part 1 complete: Created reinforcers for 2005, 2006, 2011 (12 reinforcers)")
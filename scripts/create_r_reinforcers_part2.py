@@ -3,29 +3,32 @@ Create Missing R Reinforcers - Part 2
 Concepts: 2012, 2024, 2031
 """
 
-import json
+from lesson_patches import PatchSet, apply_patch_sets
 
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+PATCHES = PatchSet("create_r_reinforcers_part2")
 
 def create_reinforcer(concept_id, role_num, title, content):
     reinf_id = concept_id * 10 + role_num
-    concept = lessons.get(str(concept_id), {})
-    return {
-        "id": reinf_id,
-        "title": title,
-        "content": content,
-        "starter_code": "",
-        "solution_code": "",
-        "expected_output": "",
-        "chapter_id": concept.get("chapter_id", 1),
-        "chapter_title": concept.get("chapter_title", ""),
-        "gap_ids": ["R-REINF"],
-        "batch_id": "R-3"
-    }
+
+    def build(lessons):
+        concept = lessons.get(str(concept_id), {})
+        return {
+            "id": reinf_id,
+            "title": title,
+            "content": content,
+            "starter_code": "",
+            "solution_code": "",
+            "expected_output": "",
+            "chapter_id": concept.get("chapter_id", 1),
+            "chapter_title": concept.get("chapter_title", ""),
+            "gap_ids": ["R-REINF"],
+            "batch_id": "R-3"
+        }
+
+    PATCHES.derive(reinf_id, build)
 
 # ===== 2012: Calling Functions =====
-lessons["20121"] = create_reinforcer(2012, 1, "Analogy: Recipes",
+create_reinforcer(2012, 1, "Analogy: Recipes",
 """# 📋 Functions Are Recipes
 
 ## What You'll Learn
@@ -67,7 +70,7 @@ mean(c(10, 20, 30))  # One vector argument
 ✅ **No Hidden Prerequisites**: Uses `mean()` and `c()` from this lesson.
 """)
 
-lessons["20122"] = create_reinforcer(2012, 2, "Variation: Named Arguments",
+create_reinforcer(2012, 2, "Variation: Named Arguments",
 """# 🏷️ Named Arguments
 
 ## What You'll Learn
@@ -111,7 +114,7 @@ mean(x, na.rm = TRUE)  # Self-documenting
 ✅ **No Hidden Prerequisites**: Uses named arguments from this lesson.
 """)
 
-lessons["20123"] = create_reinforcer(2012, 3, "Fix the Code: Missing Parentheses",
+create_reinforcer(2012, 3, "Fix the Code: Missing Parentheses",
 """# 🔧 Fix: Function Call Syntax
 
 ## What You'll Learn
@@ -156,7 +159,7 @@ nrow(penguins)
 ✅ **No Hidden Prerequisites**: Basic function calling syntax.
 """)
 
-lessons["20124"] = create_reinforcer(2012, 4, "Challenge: Chain Functions",
+create_reinforcer(2012, 4, "Challenge: Chain Functions",
 """# 🦸 Challenge: Nested Calls
 
 ## What You'll Learn
@@ -195,7 +198,7 @@ Always check if your data has NA values.
 """)
 
 # ===== 2024: Groups & Summaries =====
-lessons["20241"] = create_reinforcer(2024, 1, "Analogy: Sorting into Bins",
+create_reinforcer(2024, 1, "Analogy: Sorting into Bins",
 """# 📊 Group, Then Summarize
 
 ## What You'll Learn
@@ -240,7 +243,7 @@ group_by(species) %>% summarize(...)
 ✅ **No Hidden Prerequisites**: Uses `group_by()` and `summarize()` from this lesson.
 """)
 
-lessons["20242"] = create_reinforcer(2024, 2, "Variation: Multiple Summaries",
+create_reinforcer(2024, 2, "Variation: Multiple Summaries",
 """# 📈 Multiple Stats at Once
 
 ## What You'll Learn
@@ -289,7 +292,7 @@ summarize(avg = mean(col), max = max(col))
 ✅ **No Hidden Prerequisites**: Uses `n()` and multiple summaries.
 """)
 
-lessons["20243"] = create_reinforcer(2024, 3, "Fix the Code: Forgot na.rm",
+create_reinforcer(2024, 3, "Fix the Code: Forgot na.rm",
 """# 🔧 Fix: NA in Summary
 
 ## What You'll Learn
@@ -334,7 +337,7 @@ summarize(avg = mean(body_mass_g, na.rm = TRUE))
 ✅ **No Hidden Prerequisites**: NA handling in summaries.
 """)
 
-lessons["20244"] = create_reinforcer(2024, 4, "Challenge: Group by Two",
+create_reinforcer(2024, 4, "Challenge: Group by Two",
 """# 🦸 Challenge: Multiple Groups
 
 ## What You'll Learn
@@ -379,7 +382,7 @@ group_by(species, island)  # Both at once
 """)
 
 # ===== 2031: Pipes & Formatting =====
-lessons["20311"] = create_reinforcer(2031, 1, "Analogy: Assembly Line",
+create_reinforcer(2031, 1, "Analogy: Assembly Line",
 """# 🏭 The Pipe Assembly Line
 
 ## What You'll Learn
@@ -428,7 +431,7 @@ x %>% mean()
 ✅ **No Hidden Prerequisites**: Introduces `%>%` pipe concept.
 """)
 
-lessons["20312"] = create_reinforcer(2031, 2, "Variation: Native Pipe",
+create_reinforcer(2031, 2, "Variation: Native Pipe",
 """# |> vs %>%
 
 ## What You'll Learn
@@ -465,7 +468,7 @@ Don't mix `|>` and `%>%` in the same pipeline — pick one.
 ✅ **No Hidden Prerequisites**: Pipe variants.
 """)
 
-lessons["20313"] = create_reinforcer(2031, 3, "Fix the Code: Pipe Placement",
+create_reinforcer(2031, 3, "Fix the Code: Pipe Placement",
 """# 🔧 Fix: Pipe Syntax
 
 ## What You'll Learn
@@ -514,7 +517,7 @@ penguins %>%
 ✅ **No Hidden Prerequisites**: Pipe syntax rules.
 """)
 
-lessons["20314"] = create_reinforcer(2031, 4, "Challenge: Build a Pipeline",
+create_reinforcer(2031, 4, "Challenge: Build a Pipeline",
 """# 🦸 Challenge: Multi-Step Pipeline
 
 ## What You'll Learn
@@ -558,8 +561,6 @@ Every step needs `%>%` to connect to the next.
 ✅ **No Hidden Prerequisites**: Combines filter, group_by, summarize.
 """)
 
-# Save
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("Part 2 complete: Created reinforcers for 2012, 2024, 2031 (12 reinforcers)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("Part 2 complete: Created reinforcers for 2012, 2024, 2031 (12 reinforcers)")
@@ -3,29 +3,32 @@ Create Missing R Reinforcers - Part 3
 Concepts: 2041, 2042, 2051
 """
 
-import json
+from lesson_patches import PatchSet, apply_patch_sets
 
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+PATCHES = PatchSet("create_r_reinforcers_part3")
 
 def create_reinforcer(concept_id, role_num, title, content):
     reinf_id = concept_id * 10 + role_num
-    concept = lessons.get(str(concept_id), {})
-    return {
-        "id": reinf_id,
-        "title": title,
-        "content": content,
-        "starter_code": "",
-        "solution_code": "",
-        "expected_output": "",
-        "chapter_id": concept.get("chapter_id", 5),
-        "chapter_title": concept.get("chapter_title", ""),
-        "gap_ids": ["R-REINF"],
-        "batch_id": "R-3"
-    }
+
+    def build(lessons):
+        concept = lessons.get(str(concept_id), {})
+        return {
+            "id": reinf_id,
+            "title": title,
+            "content": content,
+            "starter_code": "",
+            "solution_code": "",
+            "expected_output": "",
+            "chapter_id": concept.get("chapter_id", 5),
+            "chapter_title": concept.get("chapter_title", ""),
+            "gap_ids": ["R-REINF"],
+            "batch_id": "R-3"
+        }
+
+    PATCHES.derive(reinf_id, build)
 
 # ===== 2041: Lengthening Data =====
-lessons["20411"] = create_reinforcer(2041, 1, "Analogy: Unpacking a Wide Suitcase",
+create_reinforcer(2041, 1, "Analogy: Unpacking a Wide Suitcase",
 """# 📦 Wide to Long
 
 ## What You'll Learn
@@ -73,7 +76,7 @@ cols = c(`1999`, `2000`)
 ✅ **No Hidden Prerequisites**: Uses `pivot_longer()` from this lesson.
 """)
 
-lessons["20412"] = create_reinforcer(2041, 2, "Variation: Column Selection",
+create_reinforcer(2041, 2, "Variation: Column Selection",
 """# 🎯 Selecting Columns to Pivot
 
 ## What You'll Learn
@@ -119,7 +122,7 @@ starts_with("year_")  # Quoted prefix
 ✅ **No Hidden Prerequisites**: Column selection helpers.
 """)
 
-lessons["20413"] = create_reinforcer(2041, 3, "Fix the Code: Missing Quotes",
+create_reinforcer(2041, 3, "Fix the Code: Missing Quotes",
 """# 🔧 Fix: names_to and values_to
 
 ## What You'll Learn
@@ -164,7 +167,7 @@ names_to = "year"
 ✅ **No Hidden Prerequisites**: Pivot argument syntax.
 """)
 
-lessons["20414"] = create_reinforcer(2041, 4, "Challenge: Pivot Your Data",
+create_reinforcer(2041, 4, "Challenge: Pivot Your Data",
 """# 🦸 Challenge: Tidy the Data
 
 ## What You'll Learn
@@ -207,7 +210,7 @@ Only pivot the year columns, keep country as identifier.
 """)
 
 # ===== 2042: Widening Data =====
-lessons["20421"] = create_reinforcer(2042, 1, "Analogy: Spreading Out",
+create_reinforcer(2042, 1, "Analogy: Spreading Out",
 """# 📊 Long to Wide
 
 ## What You'll Learn
@@ -247,7 +250,7 @@ Confusing `names_from` and `values_from`.
 ✅ **No Hidden Prerequisites**: Uses `pivot_wider()` from this lesson.
 """)
 
-lessons["20422"] = create_reinforcer(2042, 2, "Variation: Fill Missing Values",
+create_reinforcer(2042, 2, "Variation: Fill Missing Values",
 """# 🕳️ Handling NA in Wide Data
 
 ## What You'll Learn
@@ -292,7 +295,7 @@ values_fill = 0  # Numeric
 ✅ **No Hidden Prerequisites**: Pivot_wider argument.
 """)
 
-lessons["20423"] = create_reinforcer(2042, 3, "Fix the Code: Argument Order",
+create_reinforcer(2042, 3, "Fix the Code: Argument Order",
 """# 🔧 Fix: Pivot Arguments
 
 ## What You'll Learn
@@ -337,7 +340,7 @@ names_from = column
 ✅ **No Hidden Prerequisites**: Argument naming.
 """)
 
-lessons["20424"] = create_reinforcer(2042, 4, "Challenge: Comparison Table",
+create_reinforcer(2042, 4, "Challenge: Comparison Table",
 """# 🦸 Challenge: Create a Comparison
 
 ## What You'll Learn
@@ -376,7 +379,7 @@ Need to summarize BEFORE pivoting — can't pivot raw data directly.
 """)
 
 # ===== 2051: Projects & Paths =====
-lessons["20511"] = create_reinforcer(2051, 1, "Analogy: Your Office Desk",
+create_reinforcer(2051, 1, "Analogy: Your Office Desk",
 """# 🏢 RStudio Projects
 
 ## What You'll Learn
@@ -417,7 +420,7 @@ Use relative paths within a project.
 ✅ **No Hidden Prerequisites**: Conceptual lesson about projects.
 """)
 
-lessons["20512"] = create_reinforcer(2051, 2, "Variation: Working Directory",
+create_reinforcer(2051, 2, "Variation: Working Directory",
 """# 📂 Check Your Location
 
 ## What You'll Learn
@@ -460,7 +463,7 @@ Use projects instead of `setwd()`.
 ✅ **No Hidden Prerequisites**: Uses base R functions.
 """)
 
-lessons["20513"] = create_reinforcer(2051, 3, "Fix the Code: File Not Found",
+create_reinforcer(2051, 3, "Fix the Code: File Not Found",
 """# 🔧 Fix: Path Problems
 
 ## What You'll Learn
@@ -505,7 +508,7 @@ read_csv("data.csv")  # Match exact case
 ✅ **No Hidden Prerequisites**: Debugging file paths.
 """)
 
-lessons["20514"] = create_reinforcer(2051, 4, "Challenge: Organize a Project",
+create_reinforcer(2051, 4, "Challenge: Organize a Project",
 """# 🦸 Challenge: Project Structure
 
 ## What You'll Learn
@@ -544,8 +547,6 @@ Mixing raw data with processed data — keep them separate!
 ✅ **No Hidden Prerequisites**: Folder organization concepts.
 """)
 
-# Save
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("Part 3 complete: Created reinforcers for 2041, 2042, 2051 (12 reinforcers)")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("Part 3 complete: Created reinforcers for 2041, 2042, 2051 (12 reinforcers)")
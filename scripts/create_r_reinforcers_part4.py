@@ -3,29 +3,32 @@ Create Missing R Reinforcers - Part 4 (Final)
 Concepts: 2061, 2070, 2071
 """
 
-import json
+from lesson_patches import PatchSet, apply_patch_sets
 
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+PATCHES = PatchSet("create_r_reinforcers_part4")
 
 def create_reinforcer(concept_id, role_num, title, content):
     reinf_id = concept_id * 10 + role_num
-    concept = lessons.get(str(concept_id), {})
-    return {
-        "id": reinf_id,
-        "title": title,
-        "content": content,
-        "starter_code": "",
-        "solution_code": "",
-        "expected_output": "",
-        "chapter_id": concept.get("chapter_id", 7),
-        "chapter_title": concept.get("chapter_title", ""),
-        "gap_ids": ["R-REINF"],
-        "batch_id": "R-3"
-    }
+
+    def build(lessons):
+        concept = lessons.get(str(concept_id), {})
+        return {
+            "id": reinf_id,
+            "title": title,
+            "content": content,
+            "starter_code": "",
+            "solution_code": "",
+            "expected_output": "",
+            "chapter_id": concept.get("chapter_id", 7),
+            "chapter_title": concept.get("chapter_title", ""),
+            "gap_ids": ["R-REINF"],
+            "batch_id": "R-3"
+        }
+
+    PATCHES.derive(reinf_id, build)
 
 # ===== 2061: Handling Messy Data =====
-lessons["20611"] = create_reinforcer(2061, 1, "Analogy: Cleaning Your Room",
+create_reinforcer(2061, 1, "Analogy: Cleaning Your Room",
 """# 🧹 Data Cleaning Basics
 
 ## What You'll Learn
@@ -63,7 +66,7 @@ Always run `summary()` and `glimpse()` first.
 ✅ **No Hidden Prerequisites**: Conceptual overview of data cleaning.
 """)
 
-lessons["20612"] = create_reinforcer(2061, 2, "Variation: Standardizing Text",
+create_reinforcer(2061, 2, "Variation: Standardizing Text",
 """# 📝 Consistent Text
 
 ## What You'll Learn
@@ -109,7 +112,7 @@ Clean first, then filter/group.
 ✅ **No Hidden Prerequisites**: Uses `str_to_lower()` and `case_when()`.
 """)
 
-lessons["20613"] = create_reinforcer(2061, 3, "Fix the Code: NA Handling",
+create_reinforcer(2061, 3, "Fix the Code: NA Handling",
 """# 🔧 Fix: Missing Value Strategy
 
 ## What You'll Learn
@@ -157,7 +160,7 @@ drop_na(column_name)  # Only drop if THIS column is NA
 ✅ **No Hidden Prerequisites**: NA handling strategies.
 """)
 
-lessons["20614"] = create_reinforcer(2061, 4, "Challenge: Clean a Dataset",
+create_reinforcer(2061, 4, "Challenge: Clean a Dataset",
 """# 🦸 Challenge: Full Cleaning Pipeline
 
 ## What You'll Learn
@@ -198,7 +201,7 @@ Don't modify original data — save to a new variable.
 """)
 
 # ===== 2070: Google is Your Friend =====
-lessons["20701"] = create_reinforcer(2070, 1, "Analogy: Asking the Oracle",
+create_reinforcer(2070, 1, "Analogy: Asking the Oracle",
 """# 🔮 Searching for Help
 
 ## What You'll Learn
@@ -236,7 +239,7 @@ Understanding of effective search strategies
 ✅ **No Hidden Prerequisites**: Search skills, no code required.
 """)
 
-lessons["20702"] = create_reinforcer(2070, 2, "Variation: Stack Overflow Tips",
+create_reinforcer(2070, 2, "Variation: Stack Overflow Tips",
 """# 📚 Reading Stack Overflow
 
 ## What You'll Learn
@@ -275,7 +278,7 @@ Read the explanation, understand why it works.
 ✅ **No Hidden Prerequisites**: Reading comprehension skills.
 """)
 
-lessons["20703"] = create_reinforcer(2070, 3, "Fix the Code: Adapting Answers",
+create_reinforcer(2070, 3, "Fix the Code: Adapting Answers",
 """# 🔧 Fix: Making Code Work for You
 
 ## What You'll Learn
@@ -316,7 +319,7 @@ Replace placeholder names with your actual names.
 ✅ **No Hidden Prerequisites**: Code adaptation skills.
 """)
 
-lessons["20704"] = create_reinforcer(2070, 4, "Challenge: Find and Apply",
+create_reinforcer(2070, 4, "Challenge: Find and Apply",
 """# 🦸 Challenge: Solve with Search
 
 ## What You'll Learn
@@ -354,7 +357,7 @@ Giving up after the first failed search — try different keywords!
 """)
 
 # ===== 2071: Making Reprexes =====
-lessons["20711"] = create_reinforcer(2071, 1, "Analogy: The Minimal Bug Report",
+create_reinforcer(2071, 1, "Analogy: The Minimal Bug Report",
 """# 🐛 Reproducible Examples
 
 ## What You'll Learn
@@ -397,7 +400,7 @@ Include all necessary context.
 ✅ **No Hidden Prerequisites**: Conceptual understanding.
 """)
 
-lessons["20712"] = create_reinforcer(2071, 2, "Variation: Using reprex Package",
+create_reinforcer(2071, 2, "Variation: Using reprex Package",
 """# 📦 The reprex Package
 
 ## What You'll Learn
@@ -440,7 +443,7 @@ Include ALL library() calls at the top.
 ✅ **No Hidden Prerequisites**: Uses `reprex` package.
 """)
 
-lessons["20713"] = create_reinforcer(2071, 3, "Fix the Code: Minimal Data",
+create_reinforcer(2071, 3, "Fix the Code: Minimal Data",
 """# 🔧 Fix: Creating Sample Data
 
 ## What You'll Learn
@@ -487,7 +490,7 @@ Create sample data inline.
 ✅ **No Hidden Prerequisites**: Data creation with `tibble()`.
 """)
 
-lessons["20714"] = create_reinforcer(2071, 4, "Challenge: Create a Reprex",
+create_reinforcer(2071, 4, "Challenge: Create a Reprex",
 """# 🦸 Challenge: Build a Reprex
 
 ## What You'll Learn
@@ -532,9 +535,7 @@ Missing the "expected vs actual" — people need to know what's wrong!
 ✅ **No Hidden Prerequisites**: Combines all reprex elements.
 """)
 
-# Save
-with open('frontend/public/data/lessons.json', 'w') as f:
-    json.dump(lessons, f, indent=2, ensure_ascii=False)
-
-print("Part 4 complete: Created reinforcers for 2061, 2070, 2071 (12 reinforcers)")
-print("\nALL 48 MISSING REINFORCERS CREATED")
+if __name__ == '__main__':
+    apply_patch_sets([PATCHES])
+    print("Part 4 complete: Created reinforcers for 2061, 2070, 2071 (12 reinforcers)")
+    print("\nALL 48 MISSING REINFORCERS CREATED")
@@ -0,0 +1,159 @@
+"""
+Sharded Lesson Export
+
+Splits lessons.json into one small JSON file per lesson, named by a hash of
+its content (lessons/<id>.<hash>.json), and writes content-hashed copies of
+the course files. manifest.json maps lesson ids to shard hashes and data file
+names to their hashed copies, so the lesson page fetches the manifest plus a
+~2 KB shard instead of the whole 1.3 MB corpus.
+
+A shard's name changes whenever its content does, so shards (and the hashed
+course files) can be served with immutable, never-expiring cache headers;
+only the manifest needs revalidating. Re-exporting leaves unchanged shards
+untouched and deletes ones no longer referenced. Given the ids of the
+lessons that changed (the pipeline passes them), only those are serialized
+again; the rest keep their entries from the previous manifest.
+
+Each shard also carries the result of running the lesson's current
+solution, from expected_outputs.json (build_expected_outputs.py), as
+``expected_result``: {"kind", "hash"} plus "output" when it is short
+enough to ship. The authored ``expected_output`` text is left as written.
+
+Usage:
+    python scripts/export_lesson_shards.py
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+from build_expected_outputs import load_expected_outputs, solution_hash
+from lesson_files import atomic_write_text
+from lesson_store import COURSE_PATHS, DATA_DIR, LessonStore
+
+SHARDS_DIR = DATA_DIR / "shards"
+MANIFEST_PATH = SHARDS_DIR / "manifest.json"
+MANIFEST_VERSION = 2
+HASH_LENGTH = 12
+
+# Data files the frontend fetches whole, exported as hashed copies
+SHARED_FILES = [DATA_DIR / "courses.json", *COURSE_PATHS.values()]
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def serialize(value: Any) -> bytes:
+    """Compact JSON; shards are machine-read only."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def hashed_name(stem: str, data: bytes) -> str:
+    return f"{stem}.{content_hash(data)}.json"
+
+
+def write_shard(path: Path, data: bytes) -> bool:
+    """Write a content-addressed file; an existing one already has these bytes."""
+    if path.exists():
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def with_expected_result(lesson: Dict[str, Any], entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The lesson plus its solution's result, if ``entry`` was built from its current solution."""
+    if entry is None or "kind" not in entry or entry["solution"] != solution_hash(lesson):
+        return lesson
+    result = {"kind": entry["kind"], "hash": entry["hash"]}
+    if entry["output"]:
+        result["output"] = entry["output"]
+    return {**lesson, "expected_result": result}
+
+
+def load_manifest(out_dir: Path = SHARDS_DIR) -> Optional[Dict[str, Any]]:
+    path = out_dir / MANIFEST_PATH.name
+    if not path.exists():
+        return None
+    manifest = json.loads(path.read_text())
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def export_shards(lessons: Dict[str, Dict[str, Any]], out_dir: Path = SHARDS_DIR,
+                  expected_outputs: Optional[Dict[str, Dict[str, Any]]] = None,
+                  changed: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Write shards and manifest under ``out_dir``; return export stats.
+
+    With ``changed``, lessons outside it whose shard from the previous
+    manifest still exists are not serialized again.
+    """
+    expected_outputs = expected_outputs or {}
+    manifest_before = load_manifest(out_dir) if changed is not None else None
+    previous = manifest_before["lessons"] if manifest_before else {}
+    manifest: Dict[str, Any] = {"version": MANIFEST_VERSION, "lessons": {}, "files": {}}
+    keep: Set[Path] = set()
+    written = 0
+    sizes = []
+
+    for lesson_id, lesson in lessons.items():
+        digest = previous.get(lesson_id) if lesson_id not in (changed or ()) else None
+        path = out_dir / "lessons" / f"{lesson_id}.{digest}.json"
+        if digest is None or not path.exists():
+            data = serialize(with_expected_result(lesson, expected_outputs.get(lesson_id)))
+            digest = content_hash(data)
+            path = out_dir / "lessons" / f"{lesson_id}.{digest}.json"
+            written += write_shard(path, data)
+            sizes.append(len(data))
+        else:
+            sizes.append(path.stat().st_size)
+        keep.add(path)
+        manifest["lessons"][lesson_id] = digest
+
+    for source in SHARED_FILES:
+        if not source.exists():
+            continue
+        data = source.read_bytes()
+        name = hashed_name(source.stem, data)
+        written += write_shard(out_dir / name, data)
+        keep.add(out_dir / name)
+        manifest["files"][source.name] = name
+
+    manifest_text = json.dumps(manifest, separators=(",", ":"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(out_dir / MANIFEST_PATH.name, manifest_text)
+    keep.add(out_dir / MANIFEST_PATH.name)
+
+    removed = 0
+    for path in out_dir.rglob("*.json"):
+        if path not in keep:
+            path.unlink()
+            removed += 1
+
+    return {
+        "lessons": len(manifest["lessons"]),
+        "files": len(manifest["files"]),
+        "written": written,
+        "removed": removed,
+        "manifest_bytes": len(manifest_text.encode("utf-8")),
+        "largest_shard": max(sizes, default=0),
+        "average_shard": sum(sizes) // len(sizes) if sizes else 0,
+    }
+
+
+def main(changed_ids: Optional[Iterable[str]] = None) -> None:
+    """Export every lesson; ``changed_ids`` (lesson id strings, passed by the
+    pipeline) limits serialization to those lessons."""
+    store = LessonStore.load()
+    changed = set(changed_ids) if changed_ids is not None else None
+    stats = export_shards(store.lessons, expected_outputs=load_expected_outputs(), changed=changed)
+    print(f"Exported {stats['lessons']} lesson shards and {stats['files']} data files to {SHARDS_DIR}")
+    print(f"  written: {stats['written']}, unchanged: {stats['lessons'] + stats['files'] - stats['written']}, "
+          f"removed stale: {stats['removed']}")
+    print(f"  shard size: avg {stats['average_shard'] / 1024:.1f} KB, max {stats['largest_shard'] / 1024:.1f} KB; "
+          f"manifest {stats['manifest_bytes'] / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
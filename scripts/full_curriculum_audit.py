@@ -2,64 +2,18 @@
 Deep Curriculum Audit - Hidden Prerequisites & Narrative Flow
 """
 
-import json
 import re
 from collections import defaultdict
 
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+from concept_graph import concept_graph
+from lesson_store import LessonStore
 
-# Track concept introduction order per curriculum
-concept_first_seen = {'Python': {}, 'SQL': {}, 'R': {}}
+store = LessonStore.load()
+lessons = store.lessons
 
-# Python concepts with order of introduction (expected)
-PYTHON_CONCEPT_ORDER = [
-    # Ch 1: Basics
-    ('print', 'ch1'), ('variable', 'ch1'), ('=', 'ch1'),
-    # Ch 2: Types
-    ('int', 'ch2'), ('float', 'ch2'), ('str', 'ch2'), ('type', 'ch2'),
-    # Ch 3: Strings
-    ('len', 'ch3'), ('+', 'ch3'), ('f-string', 'ch3'),
-    # Ch 4: Conditionals
-    ('if', 'ch4'), ('elif', 'ch4'), ('else', 'ch4'), ('==', 'ch4'), ('!=', 'ch4'),
-    # Ch 5: Lists
-    ('list', 'ch5'), ('[]', 'ch5'), ('append', 'ch5'), ('index', 'ch5'),
-    # Ch 6: Loops
-    ('for', 'ch6'), ('while', 'ch6'), ('range', 'ch6'), ('break', 'ch6'),
-    # Ch 7: Functions
-    ('def', 'ch7'), ('return', 'ch7'), ('parameter', 'ch7'),
-    # Ch 8: Dictionaries
-    ('dict', 'ch8'), ('{}', 'ch8'), ('keys', 'ch8'), ('values', 'ch8'),
-]
-
-# SQL concepts with order
-SQL_CONCEPT_ORDER = [
-    # Ch 1: Basics
-    ('SELECT', 'ch1'), ('FROM', 'ch1'), ('*', 'ch1'),
-    # Ch 2: Filtering
-    ('WHERE', 'ch2'), ('=', 'ch2'), ('AND', 'ch2'), ('OR', 'ch2'),
-    # Ch 3: Sorting
-    ('ORDER BY', 'ch3'), ('ASC', 'ch3'), ('DESC', 'ch3'),
-    # Ch 4: Limiting
-    ('LIMIT', 'ch4'),
-    # Ch 5: Aggregates
-    ('COUNT', 'ch5'), ('SUM', 'ch5'), ('AVG', 'ch5'), ('MAX', 'ch5'), ('MIN', 'ch5'),
-    # Ch 6: Grouping
-    ('GROUP BY', 'ch6'), ('HAVING', 'ch6'),
-    # Ch 7: Joins
-    ('JOIN', 'ch7'), ('ON', 'ch7'), ('LEFT JOIN', 'ch7'), ('INNER JOIN', 'ch7'),
-]
-
-# R concepts with order
-R_CONCEPT_ORDER = [
-    # Ch 1: ggplot intro
-    ('penguins', 'ch1'), ('ggplot', 'ch1'), ('aes', 'ch1'), ('geom_point', 'ch1'),
-    # Ch 2: Workflow
-    ('<-', 'ch2'), ('c()', 'ch2'),
-    # Ch 3: dplyr basics
-    ('%>%', 'ch3'), ('filter', 'ch3'), ('select', 'ch3'), ('mutate', 'ch3'),
-    ('arrange', 'ch3'), ('summarize', 'ch3'),
-]
+# Where each concept is first taught, from the concept graph
+graph = concept_graph(store)
+CURRICULUM_KEYS = {'Python': 'python', 'SQL': 'sql', 'R': 'r'}
 
 def get_curriculum(lid):
     try:
@@ -146,6 +100,16 @@ for curr, lessons_list in curricula.items():
     print(f"\nConcept lessons: {len(concept_lessons)}")
     print(f"Exercise/Reinforcer lessons: {len(reinforcer_lessons)}")
 
+    # Hidden prerequisites: concepts used before any lesson teaches them
+    key = CURRICULUM_KEYS[curr]
+    print(f"\nConcepts used: {len(graph.lessons[key])}, taught in course: {len(graph.introduced[key])}")
+    hidden = [(lid, graph.hidden_prerequisites(int(lid))) for lid, _ in lessons_list]
+    hidden = [(lid, concepts) for lid, concepts in hidden if concepts]
+    print(f"Lessons with hidden prerequisites: {len(hidden)}")
+    for lid, concepts in hidden[:10]:
+        print(f"  {lid}: {', '.join(sorted(concepts))}")
+        findings.append({'lesson_id': lid, 'hidden_prerequisites': sorted(concepts)})
+
 # Sample some lessons to check quality
 print("\n" + "="*60)
 print("SAMPLE LESSON QUALITY CHECK")
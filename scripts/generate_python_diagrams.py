@@ -1,20 +1,25 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import matplotlib.patches as patches
 import os
 
+from render_cache import save_figure
+
 # Ensure assets directory exists
 OUTPUT_DIR = "frontend/public/assets/python-diagrams"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-def save_plot(filename):
+def save_plot(fig, filename):
     filepath = os.path.join(OUTPUT_DIR, filename)
-    plt.savefig(filepath, bbox_inches='tight', dpi=100)
-    plt.close()
-    print(f"Generated {filepath}")
+    if save_figure(fig, filepath, bbox_inches='tight', dpi=100):
+        print(f"Generated {filepath}")
+    else:
+        print(f"Unchanged {filepath}")
+    return filepath
 
 def draw_variable_box(name, value, filename):
     """Draws a simple variable as a labeled box."""
-    fig, ax = plt.subplots(figsize=(4, 3))
+    fig = Figure(figsize=(4, 3))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 8)
     ax.axis('off')
@@ -42,11 +47,12 @@ def draw_variable_box(name, value, filename):
     ax.text(5, 1.5, "Computer Memory", ha='center', va='center', 
             fontsize=10, color='#64748b', style='italic')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_flowchart_if(filename):
     """Draws a simple IF statement flowchart."""
-    fig, ax = plt.subplots(figsize=(6, 6))
+    fig = Figure(figsize=(6, 6))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
@@ -80,12 +86,13 @@ def draw_flowchart_if(filename):
     # Yes -> End
     ax.annotate("", xy=(5.5, 2.2), xytext=(8, 4.5), arrowprops=dict(arrowstyle="->", lw=2, connectionstyle="angle,angleA=-90,angleB=0,rad=5"))
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_list_indices(data, filename):
     """Draws a list with indices."""
     n = len(data)
-    fig, ax = plt.subplots(figsize=(n * 1.5 + 1, 3))
+    fig = Figure(figsize=(n * 1.5 + 1, 3))
+    ax = fig.subplots()
     ax.set_xlim(0, n + 1)
     ax.set_ylim(0, 3)
     ax.axis('off')
@@ -107,11 +114,12 @@ def draw_list_indices(data, filename):
     ax.text(0.2, 0.7, "Index:", ha='right', va='center', fontsize=12, color='#64748b')
     ax.text(0.2, 1.5, "Value:", ha='right', va='center', fontsize=12, color='black')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_function_machine(input_val, func_name, output_val, filename):
     """Draws a function as a machine taking input and producing output."""
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 5)
     ax.axis('off')
@@ -137,12 +145,13 @@ def draw_function_machine(input_val, func_name, output_val, filename):
     ax.annotate("", xy=(8.5, 2.5), xytext=(7, 2.5), arrowprops=dict(arrowstyle="->", lw=2, color="#64748b"))
     ax.text(9, 2.5, f"Output\n({output_val})", ha='center', va='center', fontsize=12, fontweight='bold')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_dict_mapping(data, filename):
     """Draws a dictionary as a key-value mapping."""
     n = len(data)
-    fig, ax = plt.subplots(figsize=(6, n * 1.5 + 1))
+    fig = Figure(figsize=(6, n * 1.5 + 1))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, n * 1.5 + 1)
     ax.axis('off')
@@ -168,16 +177,15 @@ def draw_dict_mapping(data, filename):
         ax.add_patch(val_box)
         ax.text(7.25, y + 0.5, repr(value), ha='center', va='center', fontsize=12, fontfamily='monospace')
 
-    save_plot(filename)
-
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_dataframe(data, columns, filename):
     """Draws a simple DataFrame grid."""
     rows = len(data)
     cols = len(columns)
     
-    fig, ax = plt.subplots(figsize=(cols * 2, rows + 1))
+    fig = Figure(figsize=(cols * 2, rows + 1))
+    ax = fig.subplots()
     ax.set_xlim(0, cols)
     ax.set_ylim(0, rows + 1)
     ax.axis('off')
@@ -204,36 +212,41 @@ def draw_dataframe(data, columns, filename):
     # DataFrame Label
     ax.text(cols/2, rows + 1.2, "DataFrame", ha='center', va='bottom', fontsize=12, fontweight='bold', color='#475569')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
-def draw_all():
-    print("Generating Python diagrams...")
-    
+# Every figure this module renders, as (drawing function, args).
+# draw_all() renders them in order; render_diagrams.py renders them in parallel.
+FIGURES = [
     # 1. Variables
-    draw_variable_box("age", 25, "variable_box_age.png")
-    draw_variable_box("name", "'Alice'", "variable_box_string.png")
-    
+    (draw_variable_box, ("age", 25, "variable_box_age.png")),
+    (draw_variable_box, ("name", "'Alice'", "variable_box_string.png")),
+
     # 2. Control Flow
-    draw_flowchart_if("flowchart_if.png")
-    
+    (draw_flowchart_if, ("flowchart_if.png",)),
+
     # 3. Data Structures
-    draw_list_indices(["P", "y", "t", "h", "o", "n"], "string_indices.png")
-    draw_list_indices([10, 20, 30, 40], "list_indices.png")
-    
+    (draw_list_indices, (["P", "y", "t", "h", "o", "n"], "string_indices.png")),
+    (draw_list_indices, ([10, 20, 30, 40], "list_indices.png")),
+
     # 4. Functions
-    draw_function_machine(5, "double", 10, "function_machine.png")
-    
+    (draw_function_machine, (5, "double", 10, "function_machine.png")),
+
     # 5. Dictionaries
-    draw_dict_mapping({"name": "Alice", "age": 25, "city": "NYC"}, "dict_mapping.png")
-    
+    (draw_dict_mapping, ({"name": "Alice", "age": 25, "city": "NYC"}, "dict_mapping.png")),
+
     # 6. Pandas
-    draw_dataframe(
+    (draw_dataframe, (
         [["Alice", 25, "NYC"], ["Bob", 30, "LA"], ["Charlie", 35, "Chicago"]],
         ["name", "age", "city"],
         "dataframe_basic.png"
-    )
+    )),
+]
 
+def draw_all():
+    print("Generating Python diagrams...")
+    for func, args in FIGURES:
+        func(*args)
     print("All diagrams generated.")
 
 if __name__ == "__main__":
-    draw_all()
+    draw_all()
\ No newline at end of file
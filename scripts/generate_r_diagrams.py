@@ -1,22 +1,26 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import matplotlib.patches as patches
 import os
-import shutil
+
+from render_cache import copy_if_changed, save_figure
 
 # Ensure assets directory exists
 OUTPUT_DIR = "frontend/public/assets/r-diagrams"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 PYTHON_DIR = "frontend/public/assets/python-diagrams"
 
-def save_plot(filename):
+def save_plot(fig, filename):
     filepath = os.path.join(OUTPUT_DIR, filename)
-    plt.savefig(filepath, bbox_inches='tight', dpi=100)
-    plt.close()
-    print(f"Generated {filepath}")
+    if save_figure(fig, filepath, bbox_inches='tight', dpi=100):
+        print(f"Generated {filepath}")
+    else:
+        print(f"Unchanged {filepath}")
+    return filepath
 
 def draw_variable_box(name, value, filename):
     """Draws a simple variable as a labeled box."""
-    fig, ax = plt.subplots(figsize=(4, 3))
+    fig = Figure(figsize=(4, 3))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 8)
     ax.axis('off')
@@ -43,14 +47,15 @@ def draw_variable_box(name, value, filename):
     ax.text(5, 1.5, "Computer Memory", ha='center', va='center', 
             fontsize=10, color='#64748b', style='italic')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_dataframe(data, columns, filename):
     """Draws a DataFrame/Tibble grid."""
     rows = len(data)
     cols = len(columns)
     
-    fig, ax = plt.subplots(figsize=(cols * 2, rows + 1))
+    fig = Figure(figsize=(cols * 2, rows + 1))
+    ax = fig.subplots()
     ax.set_xlim(0, cols)
     ax.set_ylim(0, rows + 1)
     ax.axis('off')
@@ -77,32 +82,7 @@ def draw_dataframe(data, columns, filename):
     # DataFrame Label
     ax.text(cols/2, rows + 1.2, "Tibble / Data Frame", ha='center', va='bottom', fontsize=12, fontweight='bold', color='#475569')
 
-    save_plot(filename)
-
-def draw_scatterplot(filename):
-    """Draws a simple scatterplot mimicking ggplot2 default theme."""
-    fig, ax = plt.subplots(figsize=(6, 4))
-    
-    # ggplot2 gray background with white grid
-    ax.set_facecolor('#ebebeb')
-    ax.grid(color='white', linewidth=1)
-    
-    # Random data points
-    # Flipper length vs Body Mass correlation
-    x = [181, 186, 195, 205, 210, 217, 220, 190, 200, 215]
-    y = [3750, 3800, 4200, 4700, 5000, 5200, 5400, 3900, 4100, 4800]
-    
-    ax.scatter(x, y, color='black', alpha=0.7, s=50)
-    
-    ax.set_xlabel("flipper_length_mm")
-    ax.set_ylabel("body_mass_g")
-    ax.set_title("Penguin Trends")
-    
-    # Remove top and right spines
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def copy_generic_diagrams():
     """Copies generic diagrams from Python folder used in R."""
@@ -110,31 +90,13 @@ def copy_generic_diagrams():
     for gen in generics:
         src = os.path.join(PYTHON_DIR, gen)
         dst = os.path.join(OUTPUT_DIR, gen)
-        if os.path.exists(src):
-            shutil.copy(src, dst)
+        if os.path.exists(src) and copy_if_changed(src, dst):
             print(f"Copied {gen}")
 
-def draw_all():
-    print("Generating R diagrams...")
-    
-    # 1. Variables (Analogy: Kitchen box with plates)
-    draw_variable_box("kitchen", '"plates"', "variable_box_kitchen.png")
-    
-    # 2. Variable Variation (pet = dog)
-    draw_variable_box("pet", '"dog"', "variable_box_pet.png")
-    
-    # 3. Data Frame (Tibble)
-    draw_dataframe(
-        [["Adelie", 38.8, 18.1], ["Gentoo", 46.1, 13.2], ["Chinstrap", 47.9, 19.5]],
-        ["species", "bill_len", "bill_dep"],
-        "dataframe_penguins.png"
-    )
-
-    save_plot(filename)
-
 def draw_scatterplot(filename, variant="simple"):
     """Draws a simple scatterplot mimicking ggplot2."""
-    fig, ax = plt.subplots(figsize=(6, 4))
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
     ax.set_facecolor('#ebebeb')
     ax.grid(color='white', linewidth=1)
     
@@ -154,11 +116,12 @@ def draw_scatterplot(filename, variant="simple"):
     ax.set_title("Scatter Plot")
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_histogram(filename):
     """Draws a histogram."""
-    fig, ax = plt.subplots(figsize=(6, 4))
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
     ax.set_facecolor('#ebebeb')
     ax.grid(color='white', linewidth=1)
     
@@ -168,11 +131,12 @@ def draw_histogram(filename):
     ax.set_title("Histogram")
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_boxplot(filename):
     """Draws a boxplot."""
-    fig, ax = plt.subplots(figsize=(6, 4))
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
     ax.set_facecolor('#ebebeb')
     ax.grid(color='white', linewidth=1)
     
@@ -182,11 +146,12 @@ def draw_boxplot(filename):
     ax.set_title("Boxplot")
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_empty(filename, axes=False):
     """Draws empty canvas."""
-    fig, ax = plt.subplots(figsize=(6, 4))
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
     ax.set_facecolor('#ebebeb')
     if axes:
         ax.grid(color='white', linewidth=1)
@@ -198,53 +163,60 @@ def draw_empty(filename, axes=False):
         ax.set_xlabel("x")
         ax.set_ylabel("y")
         
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_facets(filename):
     """Draws facets (subplots)."""
-    fig, axs = plt.subplots(2, 2, figsize=(6, 4))
+    fig = Figure(figsize=(6, 4))
+    axs = fig.subplots(2, 2)
     for ax in axs.flat:
         ax.set_facecolor('#ebebeb')
         ax.grid(color='white', linewidth=1)
         ax.scatter([1, 2, 3], [1, 3, 2], s=20)
     
-    plt.tight_layout()
-    save_plot(filename)
+    fig.tight_layout()
+    return save_plot(fig, filename)
 
-def draw_all():
-    print("Generating R diagrams...")
-    
+# Every figure this module renders, as (drawing function, args).
+# draw_all() renders them in order; render_diagrams.py renders them in parallel.
+FIGURES = [
     # 1. Variables
-    draw_variable_box("kitchen", '"plates"', "variable_box_kitchen.png")
-    draw_variable_box("pet", '"dog"', "variable_box_pet.png")
-    
+    (draw_variable_box, ("kitchen", '"plates"', "variable_box_kitchen.png")),
+    (draw_variable_box, ("pet", '"dog"', "variable_box_pet.png")),
+
     # 2. Data Frame
-    draw_dataframe(
+    (draw_dataframe, (
         [["Adelie", 38.8, 18.1], ["Gentoo", 46.1, 13.2], ["Chinstrap", 47.9, 19.5]],
         ["species", "bill_len", "bill_dep"],
         "dataframe_penguins.png"
-    )
+    )),
 
     # 3. Scatterplots
-    draw_scatterplot("penguin_scatter_trend.png", variant="trend")
-    draw_scatterplot("penguin_scatter.png", variant="simple")
-    draw_scatterplot("penguin_scatter_colored.png", variant="colored")
-    draw_scatterplot("mpg_scatter_themed.png", variant="simple")
-    draw_scatterplot("mpg_scatter_labeled.png", variant="simple")
-    draw_scatterplot("mpg_mapping_color.png", variant="colored")
+    (draw_scatterplot, ("penguin_scatter_trend.png", "trend")),
+    (draw_scatterplot, ("penguin_scatter.png", "simple")),
+    (draw_scatterplot, ("penguin_scatter_colored.png", "colored")),
+    (draw_scatterplot, ("mpg_scatter_themed.png", "simple")),
+    (draw_scatterplot, ("mpg_scatter_labeled.png", "simple")),
+    (draw_scatterplot, ("mpg_mapping_color.png", "colored")),
 
     # 4. Histograms/Boxplots
-    draw_histogram("diamond_histogram.png")
-    draw_boxplot("diamond_boxplot.png")
-    draw_boxplot("mpg_boxplot_reordered.png")
-    
+    (draw_histogram, ("diamond_histogram.png",)),
+    (draw_boxplot, ("diamond_boxplot.png",)),
+    (draw_boxplot, ("mpg_boxplot_reordered.png",)),
+
     # 5. Basics/Structure
-    draw_empty("ggplot_empty.png", axes=False)
-    draw_empty("ggplot_axes.png", axes=True)
-    draw_facets("mpg_facets.png")
-    
+    (draw_empty, ("ggplot_empty.png", False)),
+    (draw_empty, ("ggplot_axes.png", True)),
+    (draw_facets, ("mpg_facets.png",)),
+
     # 6. Layers
-    draw_scatterplot("mpg_geoms_layers.png", variant="trend") # Scatter + Trend
+    (draw_scatterplot, ("mpg_geoms_layers.png", "trend")), # Scatter + Trend
+]
+
+def draw_all():
+    print("Generating R diagrams...")
+    for func, args in FIGURES:
+        func(*args)
 
     # Copy generic flowcharts
     copy_generic_diagrams()
@@ -252,4 +224,4 @@ def draw_all():
     print("All R diagrams generated.")
 
 if __name__ == "__main__":
-    draw_all()
+    draw_all()
\ No newline at end of file
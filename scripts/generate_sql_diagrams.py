@@ -1,22 +1,27 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import matplotlib.patches as patches
 import matplotlib.path as mpath
 from matplotlib.collections import PatchCollection
 import os
 
+from render_cache import save_figure
+
 # Ensure assets directory exists
 OUTPUT_DIR = "frontend/public/assets/sql-diagrams"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-def save_plot(filename):
+def save_plot(fig, filename):
     filepath = os.path.join(OUTPUT_DIR, filename)
-    plt.savefig(filepath, bbox_inches='tight', dpi=100)
-    plt.close()
-    print(f"Generated {filepath}")
+    if save_figure(fig, filepath, bbox_inches='tight', dpi=100):
+        print(f"Generated {filepath}")
+    else:
+        print(f"Unchanged {filepath}")
+    return filepath
 
 def draw_table_anatomy(filename):
     """Draws a table structure illustrating Rows and Columns."""
-    fig, ax = plt.subplots(figsize=(6, 4))
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
     ax.set_xlim(0, 8)
     ax.set_ylim(0, 6)
     ax.axis('off')
@@ -37,11 +42,12 @@ def draw_table_anatomy(filename):
     ax.annotate("Primary Key", xy=(1.5, 4.2), xytext=(0, 5), 
                 arrowprops=dict(arrowstyle="->", color="#ef4444", lw=2), color="#ef4444")
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_venn_join(join_type, filename):
     """Draws Venn diagrams for different JOIN types."""
-    fig, ax = plt.subplots(figsize=(6, 4))
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
     ax.set_xlim(0, 8)
     ax.set_ylim(0, 6)
     ax.axis('off')
@@ -90,11 +96,12 @@ def draw_venn_join(join_type, filename):
         ax.text(2.5, 3, "Table A\n(Matches)", ha='center', va='center', color='#94a3b8')
         ax.text(5.5, 3, "Table B\n(All Rows)", ha='center', va='center')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_execution_order(filename):
     """Draws a flowchart of SQL execution order."""
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 6)
     ax.axis('off')
@@ -121,11 +128,12 @@ def draw_execution_order(filename):
 
     ax.text(5, 5, "SQL Order of Execution", ha='center', va='center', fontsize=14, fontweight='bold')
     
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_filter_funnel(filename):
     """Draws a funnel visualizing WHERE clause filtering."""
-    fig, ax = plt.subplots(figsize=(5, 6))
+    fig = Figure(figsize=(5, 6))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
@@ -148,11 +156,12 @@ def draw_filter_funnel(filename):
     ax.plot([4.2, 5.8], [2.5, 2.5], color='#10b981', lw=2)
     ax.text(7, 3, "Filtered Result", ha='left', va='center', color='#10b981', fontweight='bold')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_relationships(filename):
     """Draws a relationship between two tables (PK-FK)."""
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 6)
     ax.axis('off')
@@ -178,11 +187,12 @@ def draw_relationships(filename):
     ax.add_patch(arrow)
     ax.text(5, 4.2, "Relates", ha='center', color='#ef4444', fontweight='bold')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_group_by(filename):
     """Draws buckets visualizing GROUP BY aggregation."""
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 6)
     ax.axis('off')
@@ -212,11 +222,12 @@ def draw_group_by(filename):
 
     ax.text(5, 5.5, "GROUP BY & AGGREGATE", ha='center', va='center', fontsize=14, fontweight='bold')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_subquery(filename):
     """Draws a 'Russian Doll' style visual for subqueries."""
-    fig, ax = plt.subplots(figsize=(6, 6))
+    fig = Figure(figsize=(6, 6))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
@@ -233,11 +244,12 @@ def draw_subquery(filename):
     
     ax.text(5, 5, "Returns values\nto use in WHERE", ha='center', va='center', fontsize=10, style='italic')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_union(filename):
     """Draws a visual for UNION (stacking)."""
-    fig, ax = plt.subplots(figsize=(6, 6))
+    fig = Figure(figsize=(6, 6))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
@@ -259,11 +271,12 @@ def draw_union(filename):
     ax.annotate("", xy=(5, 5.8), xytext=(5, 6.2), arrowprops=dict(arrowstyle="<-", lw=2))
     ax.annotate("", xy=(5, 5.2), xytext=(5, 4.8), arrowprops=dict(arrowstyle="->", lw=2))
 
-    save_plot(filename)
+    return save_plot(fig, filename)
 
 def draw_champion(filename):
     """Draws a celebratory 'SQL Master' badge/visual."""
-    fig, ax = plt.subplots(figsize=(6, 6))
+    fig = Figure(figsize=(6, 6))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
@@ -281,22 +294,29 @@ def draw_champion(filename):
     for (x, y) in [(3, 7.5), (7, 7.5), (5, 8.5), (3, 2.5), (7, 2.5)]:
         ax.scatter(x, y, color='#fbbf24', s=400, marker='*')
 
-    save_plot(filename)
+    return save_plot(fig, filename)
+
+# Every figure this module renders, as (drawing function, args).
+# draw_all() renders them in order; render_diagrams.py renders them in parallel.
+FIGURES = [
+    (draw_table_anatomy, ("table_anatomy.png",)),
+    (draw_venn_join, ("inner", "venn_inner.png")),
+    (draw_venn_join, ("left", "venn_left.png")),
+    (draw_venn_join, ("right", "venn_right.png")),
+    (draw_execution_order, ("sql_execution_order.png",)),
+    (draw_filter_funnel, ("filter_funnel.png",)),
+    (draw_relationships, ("relational_link.png",)),
+    (draw_group_by, ("group_by_buckets.png",)),
+    (draw_subquery, ("subquery_concept.png",)),
+    (draw_union, ("union_stack.png",)),
+    (draw_champion, ("champion_sql.png",)),
+]
 
 def draw_all():
     print("Generating SQL diagrams...")
-    draw_table_anatomy("table_anatomy.png")
-    draw_venn_join("inner", "venn_inner.png")
-    draw_venn_join("left", "venn_left.png")
-    draw_venn_join("right", "venn_right.png")
-    draw_execution_order("sql_execution_order.png")
-    draw_filter_funnel("filter_funnel.png")
-    draw_relationships("relational_link.png")
-    draw_group_by("group_by_buckets.png")
-    draw_subquery("subquery_concept.png")
-    draw_union("union_stack.png")
-    draw_champion("champion_sql.png")
+    for func, args in FIGURES:
+        func(*args)
     print("All SQL diagrams generated.")
 
 if __name__ == "__main__":
-    draw_all()
+    draw_all()
\ No newline at end of file
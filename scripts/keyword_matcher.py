@@ -0,0 +1,96 @@
+"""
+Aho-Corasick Keyword Matcher
+
+Finds every keyword from a fixed set that occurs anywhere in a text, in one
+left-to-right pass, regardless of how many keywords there are. The automaton
+is compiled once into a full transition table (no failure-link walking at
+match time), so each character costs a single dict lookup.
+
+Used by build_interaction_plans.infer_tags to score concept tags.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Compiled multi-pattern matcher over a fixed keyword set."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[int]] = [set()]
+
+        # 1. Trie of all keywords
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    outputs.append(set())
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state].add(index)
+
+        # 2. Failure links (breadth first), folded into a full transition table
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            # Inherit the failure state's moves, then override with our own edges
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+
+        self._delta = delta
+        self._outputs: List[FrozenSet[int]] = [frozenset(out) for out in outputs]
+
+    def find(self, text: str) -> Set[str]:
+        """Return the keywords that occur in ``text`` (overlaps included)."""
+        return {self.keywords[i] for i in self.find_indexes(text)}
+
+    def find_indexes(self, text: str) -> Set[int]:
+        delta = self._delta
+        outputs = self._outputs
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+class TagMatcher:
+    """Tag rules ({tag: [keywords]}) compiled into one KeywordMatcher."""
+
+    def __init__(self, rules: Dict[str, List[str]]):
+        self.rules = rules
+        self.matcher = KeywordMatcher(k for keywords in rules.values() for k in keywords)
+        index = {keyword: i for i, keyword in enumerate(self.matcher.keywords)}
+        # Tags in rule order with the keyword indexes each one counts
+        self.tag_keywords: List[Tuple[str, List[int]]] = [
+            (tag, [index[k] for k in keywords if k]) for tag, keywords in rules.items()
+        ]
+
+    def score(self, text: str, title: str, text_weight: int = 1, title_weight: int = 2) -> Dict[str, int]:
+        """Score each tag: ``text_weight`` per keyword found in text, ``title_weight`` per keyword in title.
+
+        Tags appear in rule order, matching the scan order of the per-keyword loop.
+        """
+        in_text = self.matcher.find_indexes(text)
+        in_title = self.matcher.find_indexes(title)
+        scores: Dict[str, int] = {}
+        for tag, keyword_indexes in self.tag_keywords:
+            for i in keyword_indexes:
+                if i in in_text:
+                    scores[tag] = scores.get(tag, 0) + text_weight
+                if i in in_title:
+                    scores[tag] = scores.get(tag, 0) + title_weight
+        return scores
@@ -0,0 +1,62 @@
+"""
+Lesson Data Files
+
+Where the corpus lives (DATA_DIR, LESSONS_PATH, COURSE_PATHS), the Lesson
+type, and ``atomic_writer``, the one way scripts replace a data file. It
+sits below lesson_store.py and lesson_stream.py so both can import it
+without importing each other.
+
+``atomic_writer`` writes to a sibling temp file and renames it over the
+target on success, so a crash or exception mid-write leaves the old file
+as it was, and a reader of the file can stream from it while it is being
+rewritten. The replacement keeps the permissions of the file it replaces.
+
+Usage:
+    from lesson_files import atomic_writer, atomic_write_text
+
+    with atomic_writer(path) as out:
+        out.write(...)
+    atomic_write_text(path, text)
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, TextIO
+
+DATA_DIR = Path("frontend/public/data")
+LESSONS_PATH = DATA_DIR / "lessons.json"
+COURSE_PATHS = {
+    "python": DATA_DIR / "course-python-basics.json",
+    "sql": DATA_DIR / "course-sql-fundamentals.json",
+    "r": DATA_DIR / "course-r-fundamentals.json",
+}
+
+Lesson = Dict[str, Any]
+
+NEW_FILE_MODE = 0o644
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[TextIO]:
+    """A text stream whose contents replace ``path`` when the block completes."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            yield out
+            out.flush()
+            os.fsync(out.fileno())
+        # mkstemp files are private (0600); keep the permissions of the file being replaced
+        os.chmod(tmp_name, path.stat().st_mode & 0o777 if path.exists() else NEW_FILE_MODE)
+        os.replace(tmp_name, path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` through ``atomic_writer``."""
+    with atomic_writer(path) as out:
+        out.write(text)
@@ -0,0 +1,131 @@
+"""
+Transactional Patch Engine for lessons.json
+
+Rewrite scripts declare their edits as a module-level ``PATCHES`` PatchSet
+instead of loading, mutating and re-serializing the whole corpus themselves.
+Any number of patch sets are applied in order against a single load of
+lessons.json and written back once, atomically (temp file + rename), so a
+crash mid-write cannot truncate the file.
+
+Usage:
+    # Apply one script's patches (same as running the script directly)
+    python scripts/batch_r1_rewrite.py
+
+    # Apply several scripts' patches in one load/serialize pass
+    python scripts/lesson_patches.py batch_r1_rewrite batch_r1_rewrite_2 create_r_reinforcers_part1
+
+    # Preview without writing
+    python scripts/lesson_patches.py --dry-run batch_r2_rewrite_part1
+"""
+
+import importlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from lesson_files import LESSONS_PATH, Lesson
+from lesson_stream import write_lessons
+
+Lessons = Dict[str, Lesson]
+
+
+class PatchSet:
+    """An ordered list of lesson edits from one script.
+
+    - ``set``: add or replace a whole lesson
+    - ``update``: merge fields into an existing lesson (it must exist)
+    - ``derive``: build the lesson from the corpus as it stands at apply time
+
+    ``finalize`` (optional) runs on every lesson the set touches, after the
+    edit itself, e.g. to stamp batch metadata.
+    """
+
+    def __init__(self, name: str, finalize: Optional[Callable[[Lesson], Lesson]] = None):
+        self.name = name
+        self.finalize = finalize
+        self.ops: List[Tuple[str, str, Any]] = []
+
+    def set(self, lesson_id: Any, lesson: Lesson) -> None:
+        self.ops.append(("set", str(lesson_id), lesson))
+
+    def update(self, lesson_id: Any, fields: Lesson) -> None:
+        self.ops.append(("update", str(lesson_id), fields))
+
+    def derive(self, lesson_id: Any, build: Callable[[Lessons], Lesson]) -> None:
+        self.ops.append(("derive", str(lesson_id), build))
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def apply(self, lessons: Lessons) -> List[str]:
+        """Apply every edit in order to ``lessons``; return the touched ids."""
+        touched: List[str] = []
+        for op, lesson_id, payload in self.ops:
+            if op == "set":
+                lesson = dict(payload)
+            elif op == "update":
+                if lesson_id not in lessons:
+                    raise KeyError(f"{self.name}: cannot update missing lesson {lesson_id}")
+                lesson = {**lessons[lesson_id], **payload}
+            else:
+                lesson = payload(lessons)
+            if self.finalize:
+                lesson = self.finalize(lesson)
+            lessons[lesson_id] = lesson
+            touched.append(lesson_id)
+        return touched
+
+
+def apply_patch_sets(patch_sets: Iterable[PatchSet], path: Path = LESSONS_PATH, dry_run: bool = False) -> Dict[str, int]:
+    """Load lessons once, apply all patch sets in order, write once.
+
+    Nothing is written if any patch set fails, so a bad patch leaves the file
+    exactly as it was.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise SystemExit(f"Missing lessons file at {path}")
+    lessons = json.loads(path.read_text())
+
+    stats: Dict[str, int] = {}
+    for patch_set in patch_sets:
+        stats[patch_set.name] = len(patch_set.apply(lessons))
+
+    if not dry_run:
+        write_lessons(path, lessons.items())
+    return stats
+
+
+def load_patch_sets(module_names: Iterable[str]) -> List[PatchSet]:
+    """Import rewrite scripts by module name and collect their PATCHES."""
+    patch_sets = []
+    for name in module_names:
+        module = importlib.import_module(Path(name).stem)
+        patches = getattr(module, "PATCHES", None)
+        if not isinstance(patches, PatchSet):
+            raise SystemExit(f"{name} does not declare a PATCHES PatchSet")
+        patch_sets.append(patches)
+    return patch_sets
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    dry_run = "--dry-run" in args
+    names = [arg for arg in args if not arg.startswith("--")]
+    if not names:
+        raise SystemExit("usage: python scripts/lesson_patches.py [--dry-run] MODULE [MODULE ...]")
+
+    stats = apply_patch_sets(load_patch_sets(names), dry_run=dry_run)
+    for name, count in stats.items():
+        print(f"  {name}: {count} lessons")
+    action = "Would patch" if dry_run else "Patched"
+    print(f"{action} {sum(stats.values())} lessons from {len(stats)} patch sets in one pass.")
+
+
+if __name__ == "__main__":
+    # Go through the importable module so rewrite scripts and this runner
+    # share one PatchSet class.
+    import lesson_patches
+
+    lesson_patches.main()
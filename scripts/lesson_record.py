@@ -0,0 +1,294 @@
+"""
+Compact Lesson Records
+
+A slotted, read-mostly stand-in for the lesson dicts json.load returns, for
+tools that keep several corpora (lessons.json, lessons_interactive.json,
+lessons.json.bak) in memory at once.
+
+- Known fields live in __slots__ instead of a per-lesson dict; the order
+  the keys had in the file is kept as one shared, interned tuple per
+  distinct order (a corpus has a handful), so nothing is lost.
+- The large text fields (content, starter_code, solution_code,
+  expected_output) are held as UTF-8 bytes and decoded on access. Lesson
+  content is mostly non-ASCII (emoji headings), which CPython stores at
+  four bytes per character; UTF-8 is about a quarter of that.
+- Repeated short strings (chapter_title, batch_id, recipe ids, tags) are
+  interned, and nested values (concept_tags, gap_ids, interaction_plan
+  items, sql_result and unknown keys) are frozen into tuples shared
+  between every lesson with an equal value, so the hint/send/reset items
+  build_plan appends to every plan exist once per distinct item.
+
+A record behaves like a read/write mapping (``record["title"]``,
+``record.get``, ``in``, item assignment) and has typed properties for the
+common fields. ``to_dict()`` gives back a plain dict equal to the one the
+record was made from, key order included, so ``dump_records`` writes the
+same bytes json.dumps would have written for the original corpus.
+``load_records`` reads through lesson_stream.iter_lessons, so the whole
+corpus never exists as dicts at once. compare_corpora.py holds every
+corpus as records.
+
+Usage:
+    from lesson_record import load_records, dump_records
+    from lesson_stream import write_lessons
+
+    records = load_records(LESSONS_PATH)
+    records["2001"].content
+    write_lessons(LESSONS_PATH, ((lesson_id, record.to_dict()) for lesson_id, record in records.items()))
+
+    python scripts/lesson_record.py      # memory of the three corpora as dicts vs records
+"""
+
+import json
+import sys
+import tracemalloc
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from lesson_files import DATA_DIR, LESSONS_PATH
+from lesson_stream import iter_lessons
+
+CORPUS_PATHS = (LESSONS_PATH, DATA_DIR / "lessons_interactive.json", DATA_DIR / "lessons.json.bak")
+
+# Stored as UTF-8 bytes, decoded when read
+TEXT_FIELDS = ("content", "starter_code", "solution_code", "expected_output")
+# Short strings shared by many lessons
+INTERNED_FIELDS = ("chapter_title", "batch_id", "interaction_recipe_id", "send_to_editor_template")
+# Stored as given (numbers, booleans, titles)
+PLAIN_FIELDS = (
+    "id", "title", "chapter_id", "order", "interaction_required", "interaction_confidence", "manual_review",
+    "prediction_justification",
+)
+# JSON containers, frozen and shared
+NESTED_FIELDS = ("concept_tags", "gap_ids", "interaction_plan", "sql_result")
+FIELDS = TEXT_FIELDS + INTERNED_FIELDS + PLAIN_FIELDS + NESTED_FIELDS
+
+# Strings inside nested values up to this length are interned
+MAX_INTERNED = 80
+DICT_MARK, LIST_MARK = "{", "["
+
+Frozen = Any
+
+# Key orders and frozen values seen so far; equal values share one object
+_ORDERS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_FROZEN: Dict[Frozen, Frozen] = {}
+
+
+def freeze(value: Any) -> Frozen:
+    """Hashable, shared form of a JSON value: dicts and lists become marked tuples."""
+    return _freeze(value)[0]
+
+
+def _freeze(value: Any) -> Tuple[Frozen, bool]:
+    """(frozen value, whether it may be shared).
+
+    Only values whose leaves are strings, ints and nulls are shared: 1, 1.0
+    and True compare equal, so sharing [1.0] with [1] would change the JSON.
+    """
+    if isinstance(value, dict):
+        items = [(sys.intern(key), *_freeze(item)) for key, item in value.items()]
+        frozen: Frozen = (DICT_MARK, *((key, item) for key, item, _ in items))
+        shareable = all(item_shareable for _, _, item_shareable in items)
+    elif isinstance(value, list):
+        items = [_freeze(item) for item in value]
+        frozen = (LIST_MARK, *(item for item, _ in items))
+        shareable = all(item_shareable for _, item_shareable in items)
+    elif isinstance(value, str):
+        return (sys.intern(value) if len(value) <= MAX_INTERNED else value), True
+    else:
+        return value, value is None or type(value) is int
+    return (_FROZEN.setdefault(frozen, frozen) if shareable else frozen), shareable
+
+
+def thaw(frozen: Frozen) -> Any:
+    """A fresh JSON value from its frozen form."""
+    if isinstance(frozen, tuple):
+        if frozen[0] == DICT_MARK:
+            return {key: thaw(item) for key, item in frozen[1:]}
+        return [thaw(item) for item in frozen[1:]]
+    return frozen
+
+
+def shared_order(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    return _ORDERS.setdefault(keys, keys)
+
+
+def encode(field: str, value: Any) -> Any:
+    if field in TEXT_FIELDS and isinstance(value, str):
+        return value.encode("utf-8")
+    if field in INTERNED_FIELDS and isinstance(value, str):
+        return sys.intern(value)
+    if field in PLAIN_FIELDS and not isinstance(value, (dict, list)):
+        return value
+    return freeze(value)
+
+
+def decode(field: str, stored: Any) -> Any:
+    if field in TEXT_FIELDS and isinstance(stored, bytes):
+        return stored.decode("utf-8")
+    return thaw(stored)
+
+
+class LessonRecord(MutableMapping):
+    """One lesson in slots; see the module docstring for how fields are stored."""
+
+    __slots__ = ("_keys", "_extra", *(f"_{field}" for field in FIELDS))
+
+    def __init__(self, lesson: Optional[Dict[str, Any]] = None):
+        self._keys: Tuple[str, ...] = ()
+        self._extra: Optional[Dict[str, Frozen]] = None
+        for field in FIELDS:
+            setattr(self, f"_{field}", None)
+        if lesson:
+            for key, value in lesson.items():
+                self._store(key, value)
+            self._keys = shared_order(tuple(lesson))
+
+    @classmethod
+    def from_dict(cls, lesson: Dict[str, Any]) -> "LessonRecord":
+        return cls(lesson)
+
+    def _store(self, key: str, value: Any) -> None:
+        if key in FIELDS:
+            setattr(self, f"_{key}", encode(key, value))
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[sys.intern(key)] = freeze(value)
+
+    # --- mapping protocol -------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in FIELDS:
+            return decode(key, getattr(self, f"_{key}"))
+        return thaw(self._extra[key])  # type: ignore[index]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._store(key, value)
+        if key not in self._keys:
+            self._keys = shared_order(self._keys + (sys.intern(key),))
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in FIELDS:
+            setattr(self, f"_{key}", None)
+        else:
+            del self._extra[key]  # type: ignore[union-attr]
+        self._keys = shared_order(tuple(name for name in self._keys if name != key))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __repr__(self) -> str:
+        return f"LessonRecord({self.get('id')!r}, {self.get('title')!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The lesson as a plain dict, keys in their original order."""
+        return {key: self[key] for key in self._keys}
+
+    # --- typed fields ----------------------------------------------------
+
+    @property
+    def id(self) -> Optional[int]:
+        return decode("id", self._id)
+
+    @property
+    def title(self) -> str:
+        return decode("title", self._title) or ""
+
+    @property
+    def content(self) -> str:
+        return decode("content", self._content) or ""
+
+    @property
+    def starter_code(self) -> str:
+        return decode("starter_code", self._starter_code) or ""
+
+    @property
+    def solution_code(self) -> str:
+        return decode("solution_code", self._solution_code) or ""
+
+    @property
+    def expected_output(self) -> Optional[str]:
+        return decode("expected_output", self._expected_output)
+
+    @property
+    def chapter_id(self) -> Optional[int]:
+        return decode("chapter_id", self._chapter_id)
+
+    @property
+    def chapter_title(self) -> str:
+        return decode("chapter_title", self._chapter_title) or ""
+
+    @property
+    def concept_tags(self) -> List[str]:
+        return thaw(self._concept_tags) or []
+
+
+def records_from_json(lessons: Dict[str, Dict[str, Any]]) -> Dict[str, LessonRecord]:
+    return {sys.intern(lesson_id): LessonRecord(lesson) for lesson_id, lesson in lessons.items()}
+
+
+def load_records(path: Path = LESSONS_PATH) -> Dict[str, LessonRecord]:
+    """Load a lessons file as records, streaming it so only one lesson dict exists at a time."""
+    return {sys.intern(lesson_id): LessonRecord(lesson) for lesson_id, lesson in iter_lessons(path)}
+
+
+def dump_records(records: Dict[str, LessonRecord], **json_options: Any) -> str:
+    """Serialize records exactly as json.dumps(original, indent=2, ensure_ascii=False) would."""
+    options = {"indent": 2, "ensure_ascii": False, **json_options}
+    return json.dumps(records, default=_record_default, **options)
+
+
+def _record_default(value: Any) -> Any:
+    if isinstance(value, LessonRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def traced_memory(load: Any, paths: Tuple[Path, ...]) -> Tuple[float, float]:
+    """(MB held, peak MB) while loading every corpus with ``load`` and keeping them all."""
+    tracemalloc.start()
+    held = [load(path) for path in paths]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current / (1024 * 1024), peak / (1024 * 1024)
+
+
+def main() -> None:
+    paths = tuple(Path(arg) for arg in sys.argv[1:]) or tuple(path for path in CORPUS_PATHS if path.exists())
+
+    for path in paths:
+        text = path.read_text()
+        original = json.loads(text)
+        records = load_records(path)
+        if json.loads(dump_records(records)) != original or dump_records(records) != json.dumps(
+                original, indent=2, ensure_ascii=False):
+            raise SystemExit(f"Round trip of {path} is not lossless")
+
+    dict_mb, dict_peak = traced_memory(lambda path: json.loads(Path(path).read_text()), paths)
+    record_mb, record_peak = traced_memory(load_records, paths)
+
+    print("=" * 60)
+    print("LESSON RECORDS")
+    print("=" * 60)
+    for path in paths:
+        print(f"  {path}")
+    print(f"\nHeld together as dicts:   {dict_mb:7.1f} MB (peak {dict_peak:.1f} MB)")
+    print(f"Held together as records: {record_mb:7.1f} MB (peak {record_peak:.1f} MB), "
+          f"{1 - record_mb / dict_mb:.0%} less")
+    print("Round trip: lossless for every file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Lesson Full-Text Search
+
+FTS5 index over the lessons table of the app database (title,
+content_markdown, starter_code, solution_code), so "which lessons mention
+read_csv / GROUP BY / ## Expected Output" is an index lookup instead of a
+regex over every lesson in lessons.json.
+
+``lessons_fts`` is an external-content table: it stores only the index and
+reads text from ``lessons``. Triggers on ``lessons`` keep it in step with
+every insert, update and delete, whoever makes them (sync_database.py or
+the app). Underscores count as word characters, so identifiers such as
+read_csv or solution_code are single tokens.
+
+This is a text search: a match can be in prose, a string or a comment, and
+punctuation (%>%, ==, :=) is not indexed. Which concepts a lesson teaches
+and uses, and the concept-before-taught audit, come from the lexed code in
+concept_graph.py instead.
+
+Usage:
+    from lesson_search import open_index, lessons_mentioning
+
+    conn = open_index()
+    lesson_ids = lessons_mentioning(conn, "lambda", columns=CODE_COLUMNS)
+
+    python scripts/lesson_search.py 'read_csv'          # ranked matches
+    python scripts/lesson_search.py 'solution_code: "GROUP BY"'
+    python scripts/lesson_search.py --rebuild           # re-index from scratch
+"""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+DB_PATH = Path("sql_app.db")
+
+FTS_TABLE = "lessons_fts"
+COLUMNS = ("title", "content_markdown", "starter_code", "solution_code")
+CODE_COLUMNS = ("starter_code", "solution_code")
+
+SEARCH_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    {", ".join(COLUMNS)},
+    content='lessons', content_rowid='id',
+    tokenize="unicode61 tokenchars '_'"
+);
+CREATE TRIGGER IF NOT EXISTS lessons_fts_insert AFTER INSERT ON lessons BEGIN
+    INSERT INTO {FTS_TABLE} (rowid, {", ".join(COLUMNS)})
+    VALUES (new.id, {", ".join(f"new.{column}" for column in COLUMNS)});
+END;
+CREATE TRIGGER IF NOT EXISTS lessons_fts_delete AFTER DELETE ON lessons BEGIN
+    INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {", ".join(COLUMNS)})
+    VALUES ('delete', old.id, {", ".join(f"old.{column}" for column in COLUMNS)});
+END;
+CREATE TRIGGER IF NOT EXISTS lessons_fts_update AFTER UPDATE ON lessons BEGIN
+    INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {", ".join(COLUMNS)})
+    VALUES ('delete', old.id, {", ".join(f"old.{column}" for column in COLUMNS)});
+    INSERT INTO {FTS_TABLE} (rowid, {", ".join(COLUMNS)})
+    VALUES (new.id, {", ".join(f"new.{column}" for column in COLUMNS)});
+END;
+"""
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> bool:
+    """Create the FTS table and its triggers if missing; return True if built now."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,)).fetchone()
+    if exists:
+        return False
+    conn.executescript(SEARCH_SCHEMA)
+    rebuild(conn)
+    return True
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    """Re-index every lesson from the lessons table."""
+    conn.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+    conn.commit()
+
+
+def open_index(path: Path = DB_PATH) -> sqlite3.Connection:
+    if not Path(path).exists():
+        raise SystemExit(f"Missing database at {path} (run scripts/sync_database.py first)")
+    conn = sqlite3.connect(str(path))
+    ensure_search_index(conn)
+    return conn
+
+
+def phrase(term: str) -> str:
+    """Quote ``term`` as an FTS5 phrase, so operators and punctuation are literal."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def column_filter(columns: Optional[Sequence[str]]) -> str:
+    if not columns:
+        return ""
+    unknown = [column for column in columns if column not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown search columns: {', '.join(unknown)} (known: {', '.join(COLUMNS)})")
+    return "{" + " ".join(columns) + "}: "
+
+
+def search(conn: sqlite3.Connection, query: str, limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+    """Run a raw FTS5 query; return (lesson id, title, snippet) best match first."""
+    sql = (f"SELECT rowid, title, snippet({FTS_TABLE}, -1, '[', ']', '…', 10) FROM {FTS_TABLE} "
+           f"WHERE {FTS_TABLE} MATCH ? ORDER BY rank")
+    params: Tuple[object, ...] = (query,)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params += (limit,)
+    return conn.execute(sql, params).fetchall()
+
+
+def lessons_mentioning(conn: sqlite3.Connection, term: str, columns: Optional[Sequence[str]] = None) -> Set[int]:
+    """Ids of lessons whose ``columns`` (default: all) contain ``term`` as a phrase."""
+    query = column_filter(columns) + phrase(term)
+    return {row[0] for row in conn.execute(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?", (query,))}
+
+
+def term_usage(conn: sqlite3.Connection, terms: Iterable[str],
+               columns: Optional[Sequence[str]] = None) -> Dict[str, Set[int]]:
+    """term -> ids of lessons mentioning it, one phrase lookup per term."""
+    return {term: lessons_mentioning(conn, term, columns) for term in terms}
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    queries = [arg for arg in args if not arg.startswith("--")]
+    conn = open_index()
+    try:
+        if "--rebuild" in args:
+            rebuild(conn)
+            print(f"Rebuilt {FTS_TABLE}")
+        for query in queries:
+            started = time.perf_counter()
+            results = search(conn, query)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{query!r}: {len(results)} lessons ({elapsed:.1f} ms)")
+            for lesson_id, title, snippet in results[:20]:
+                print(f"  {lesson_id:>6}  {title}")
+                print(f"          {' '.join(snippet.split())}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
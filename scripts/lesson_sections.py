@@ -0,0 +1,281 @@
+"""
+Lesson Section Index
+
+One markdown parser for lesson content, replacing the substring searches for
+"## 🎯 Your Task", "Expected Output", "---" and friends that audits and
+transforms used to rediscover lesson structure with.
+
+``outline(content)`` returns a LessonOutline: the heading tree (each Section
+knows its level, title, character span and the code fences and bold labels
+inside it), every fenced code block with its language tag, the bold
+pseudo-headings lessons use ("**Expected Output:**", "✅ **No Hidden
+Prerequisites**") and the thematic breaks. Lines inside code fences are
+never mistaken for headings, so "# comment" in an R or Python example is not
+a section.
+
+Outlines are cached by a hash of the content, so every rule and transform
+that asks about the same lesson shares one parse; editing the content gives
+a new key and a fresh parse. Treat outlines as read-only.
+
+Titles are matched on a normalized key (lowercase, emoji and punctuation
+dropped), so "## 🎯 Your Task", "## Your Task" and "**Your task:**" all
+answer to "your task".
+
+Usage:
+    from lesson_sections import lesson_outline
+
+    sections = lesson_outline(lesson)
+    sections.missing(REQUIRED_HEADERS)
+    pos = sections.position_of("your task")   # insert before the task
+
+    python scripts/lesson_sections.py 20021    # print a lesson's outline
+"""
+
+import hashlib
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+HEADING_RE = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+FENCE_RE = re.compile(r"^([ \t]*)(`{3,}|~{3,})[ \t]*([^`\s]*)")
+RULE_RE = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+# A line that opens with bold text, optionally after an emoji: "**Expected Output:**"
+LABEL_RE = re.compile(r"^[ \t]*(?:[^\w\s*`+-]+[ \t]*)?\*\*([^*\n]+?)\*\*")
+KEY_STRIP_RE = re.compile(r"[^\w' ]+")
+
+# content hash -> outline, so repeated queries in one process share a parse
+_OUTLINE_CACHE: Dict[str, "LessonOutline"] = {}
+
+
+def normalize_title(text: str) -> str:
+    """Matching key for a heading or label: lowercase words only."""
+    text = text.lower().replace("’", "'")
+    return " ".join(KEY_STRIP_RE.sub(" ", text).split())
+
+
+def content_key(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class CodeBlock:
+    """A fenced code block; ``start``/``end`` span the fences themselves."""
+
+    def __init__(self, language: str, code: str, start: int, end: int, indent: str):
+        self.language = language
+        self.code = code
+        self.start = start
+        self.end = end
+        self.indent = indent
+
+    def __repr__(self) -> str:
+        return f"CodeBlock({self.language or '-'}, {self.start}:{self.end})"
+
+
+class Label:
+    """A bold line standing in for a heading, e.g. "**Expected Output:**"."""
+
+    def __init__(self, text: str, start: int):
+        self.text = text
+        self.key = normalize_title(text)
+        self.start = start
+
+    def __repr__(self) -> str:
+        return f"Label({self.text!r} @{self.start})"
+
+
+class Section:
+    """A heading and everything up to the next heading of the same or a higher level.
+
+    ``start`` is the offset of the heading line, ``body_start`` the offset just
+    after it and ``end`` the offset where the section stops (exclusive). The
+    root section has level 0 and spans the whole lesson.
+    """
+
+    def __init__(self, level: int, title: str, start: int, body_start: int):
+        self.level = level
+        self.title = title
+        self.key = normalize_title(title)
+        self.start = start
+        self.body_start = body_start
+        self.end = body_start
+        self.children: List["Section"] = []
+        self.code_blocks: List[CodeBlock] = []
+        self.labels: List[Label] = []
+
+    def walk(self) -> Iterable["Section"]:
+        """This section's descendants in document order."""
+        for child in self.children:
+            yield child
+            yield from child.walk()
+
+    def __repr__(self) -> str:
+        return f"Section({'#' * self.level} {self.title!r}, {self.start}:{self.end})"
+
+
+class LessonOutline:
+    """Parsed structure of one lesson's markdown content."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.root = Section(0, "", 0, 0)
+        self.code_blocks: List[CodeBlock] = []
+        self.labels: List[Label] = []
+        self.rules: List[int] = []
+        self._parse()
+        self.sections = list(self.root.walk())
+        self.titles = [section.title for section in self.sections]
+        self.prose = self._prose()
+
+    def _parse(self) -> None:
+        stack = [self.root]
+        fence: Optional[Dict[str, Any]] = None
+        offset = 0
+        for line in self.content.splitlines(keepends=True):
+            start, offset = offset, offset + len(line)
+            text = line.rstrip("\r\n")
+
+            if fence is not None:
+                stripped = text.strip()
+                if stripped and set(stripped) == {fence["char"]} and len(stripped) >= fence["width"]:
+                    block = CodeBlock(fence["language"], "".join(fence["lines"]), fence["start"], offset,
+                                      fence["indent"])
+                    self.code_blocks.append(block)
+                    stack[-1].code_blocks.append(block)
+                    fence = None
+                else:
+                    fence["lines"].append(line)
+                continue
+
+            opening = FENCE_RE.match(text)
+            if opening:
+                fence = {"char": opening.group(2)[0], "width": len(opening.group(2)),
+                         "language": opening.group(3).lower(), "indent": opening.group(1),
+                         "start": start, "lines": []}
+                continue
+
+            heading = HEADING_RE.match(text)
+            if heading:
+                level = len(heading.group(1))
+                while stack[-1].level >= level:
+                    stack.pop().end = start
+                section = Section(level, heading.group(2), start, offset)
+                stack[-1].children.append(section)
+                stack.append(section)
+                continue
+
+            if RULE_RE.match(text):
+                self.rules.append(start)
+                continue
+
+            label = LABEL_RE.match(text)
+            if label:
+                item = Label(label.group(1).strip(), start)
+                self.labels.append(item)
+                stack[-1].labels.append(item)
+
+        if fence is not None:
+            # Unclosed fence: the block runs to the end of the lesson
+            block = CodeBlock(fence["language"], "".join(fence["lines"]), fence["start"], offset, fence["indent"])
+            self.code_blocks.append(block)
+            stack[-1].code_blocks.append(block)
+        for section in stack:
+            section.end = len(self.content)
+
+    def _prose(self) -> str:
+        """The content with code blocks cut out, for phrase checks that must not match code."""
+        pieces = []
+        position = 0
+        for block in self.code_blocks:
+            pieces.append(self.content[position:block.start])
+            position = block.end
+        pieces.append(self.content[position:])
+        return "".join(pieces)
+
+    def find(self, *names: str) -> Optional[Section]:
+        """First section whose title contains one of ``names`` (tried in order)."""
+        for name in names:
+            key = normalize_title(name)
+            for section in self.sections:
+                if key in section.key:
+                    return section
+        return None
+
+    def find_label(self, *names: str) -> Optional[Label]:
+        for name in names:
+            key = normalize_title(name)
+            for label in self.labels:
+                if key in label.key:
+                    return label
+        return None
+
+    def has(self, *names: str) -> bool:
+        """True if any heading or bold label contains one of ``names``."""
+        return self.find(*names) is not None or self.find_label(*names) is not None
+
+    def missing(self, names: Iterable[str]) -> List[str]:
+        return [name for name in names if not self.has(name)]
+
+    def position_of(self, *names: str) -> Optional[int]:
+        """Offset of the first heading or label line matching ``names`` (tried in order)."""
+        for name in names:
+            section, label = self.find(name), self.find_label(name)
+            starts = [item.start for item in (section, label) if item is not None]
+            if starts:
+                return min(starts)
+        return None
+
+    def last_rule(self) -> Optional[int]:
+        """Offset of the last thematic break ("---") outside code."""
+        return self.rules[-1] if self.rules else None
+
+    def code(self, language: Optional[str] = None) -> List[CodeBlock]:
+        return [block for block in self.code_blocks if language is None or block.language == language]
+
+
+def parse_outline(content: str) -> LessonOutline:
+    """Parse without the cache."""
+    return LessonOutline(content)
+
+
+def outline(content: str) -> LessonOutline:
+    """Cached outline of ``content``, keyed by its hash."""
+    key = content_key(content)
+    cached = _OUTLINE_CACHE.get(key)
+    if cached is None:
+        cached = _OUTLINE_CACHE[key] = LessonOutline(content)
+    return cached
+
+
+def lesson_outline(lesson: Dict[str, Any]) -> LessonOutline:
+    return outline(lesson.get("content") or "")
+
+
+def insert_at(content: str, position: Optional[int], text: str) -> str:
+    """Insert ``text`` at ``position``, or append it when there is no position."""
+    if position is None:
+        return content + text
+    return content[:position] + text + content[position:]
+
+
+def main() -> None:
+    from lesson_store import LessonStore
+
+    store = LessonStore.load()
+    for lesson_id in sys.argv[1:]:
+        lesson = store.lessons[lesson_id]
+        sections = lesson_outline(lesson)
+        print(f"{lesson_id} {lesson.get('title', '')}")
+        for section in [sections.root, *sections.sections]:
+            indent = "  " * section.level
+            if section.level:
+                print(f"{indent}{'#' * section.level} {section.title}  [{section.start}:{section.end}]")
+            for label in section.labels:
+                print(f"{indent}  • **{label.text}**")
+            for block in section.code_blocks:
+                print(f"{indent}  ``` {block.language or '-'} ({block.code.count(chr(10))} lines)")
+        if sections.rules:
+            print(f"  --- at {', '.join(str(rule) for rule in sections.rules)}")
+
+
+if __name__ == "__main__":
+    main()
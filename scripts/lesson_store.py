@@ -0,0 +1,196 @@
+"""
+Shared Lesson Store
+
+Loads frontend/public/data/lessons.json and the course-*.json files once and
+keeps prebuilt indexes so scripts stop re-parsing the corpus and rebuilding
+their own lookups (by curriculum, chapter, concept→reinforcers, concept tags,
+course order).
+
+Usage:
+    from lesson_store import LessonStore
+
+    store = LessonStore.load()
+    for lesson_id, lesson in store.curriculum_lessons("r"):
+        ...
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# The paths and Lesson type live in lesson_files.py; imported from here too
+from lesson_files import COURSE_PATHS, DATA_DIR, LESSONS_PATH, Lesson
+from lesson_stream import write_lessons
+
+CURRICULA = ("python", "sql", "r")
+
+# Corpora that outgrow the hand-written ranges (the ones synthetic_corpus.py
+# generates) use ids from EXTENDED_ID_BASE up, whose leading digit names the
+# curriculum: 1xxxxxx python, 2xxxxxx sql, 3xxxxxx r. R reinforcers
+# keep the concept_id * 10 + n rule, so theirs are 3xxxxxxx.
+EXTENDED_ID_BASE = 1_000_000
+EXTENDED_PREFIXES = {"1": "python", "2": "sql", "3": "r"}
+
+# (lessons path, mtime_ns, size) -> store, so repeated loads in one process are free
+_STORE_CACHE: Dict[Tuple[str, int, int], "LessonStore"] = {}
+
+
+def curriculum_for(lesson_id: int) -> str:
+    """Map a lesson id to its curriculum using the repo-wide id ranges."""
+    if lesson_id >= EXTENDED_ID_BASE:
+        return EXTENDED_PREFIXES.get(str(lesson_id)[0], "r")
+    if lesson_id >= 2000:
+        return "r"
+    if lesson_id >= 1000:
+        return "sql"
+    return "python"
+
+
+def is_reinforcer_id(lesson_id: int) -> bool:
+    """True for R reinforcer ids: 5 digits (20011), or 8 in the extended range."""
+    if curriculum_for(lesson_id) != "r":
+        return False
+    return 10000 <= lesson_id < EXTENDED_ID_BASE or lesson_id >= 10 * EXTENDED_ID_BASE
+
+
+def load_course(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"chapters": []}
+    return json.loads(path.read_text())
+
+
+def iter_course_lessons(course: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], Optional[str], Dict[str, Any]]]:
+    """Yield (chapter, concept_name, lesson_ref) in course order.
+
+    Courses either group lessons under chapter["concepts"] or list them
+    directly under chapter["lessons"]; concept_name is None for the latter.
+    """
+    for chapter in course.get("chapters", []):
+        if "concepts" in chapter:
+            for concept in chapter.get("concepts", []):
+                for lesson in concept.get("lessons", []):
+                    yield chapter, concept.get("name"), lesson
+        else:
+            for lesson in chapter.get("lessons", []):
+                yield chapter, None, lesson
+
+
+class LessonStore:
+    """In-memory lessons corpus with prebuilt lookup indexes.
+
+    ``lessons`` is the raw dict from lessons.json (string keys), shared with
+    callers rather than copied, so mutations are visible through every index
+    that returns lesson objects.
+    """
+
+    def __init__(self, lessons: Dict[str, Lesson], courses: Dict[str, Dict[str, Any]]):
+        self.lessons = lessons
+        self.courses = courses
+
+        self.by_curriculum: Dict[str, List[int]] = {key: [] for key in CURRICULA}
+        self.by_chapter: Dict[int, List[int]] = {}
+        self.by_tag: Dict[str, List[int]] = {}
+        self.course_order: Dict[str, List[int]] = {}
+        self.chapter_sequence: Dict[str, Dict[int, int]] = {}
+        self.reinforcers: Dict[int, List[int]] = {}
+        self.concept_names: Dict[int, str] = {}
+
+        self._build_lesson_indexes()
+        self._build_course_indexes()
+
+    @classmethod
+    def load(cls, lessons_path: Path = LESSONS_PATH, course_paths: Optional[Dict[str, Path]] = None) -> "LessonStore":
+        """Load the store, reusing an earlier load of the same unchanged file."""
+        lessons_path = Path(lessons_path)
+        if not lessons_path.exists():
+            raise SystemExit(f"Missing lessons file at {lessons_path}")
+        course_paths = course_paths or COURSE_PATHS
+        stat = lessons_path.stat()
+        key = (str(lessons_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        if course_paths is COURSE_PATHS and key in _STORE_CACHE:
+            return _STORE_CACHE[key]
+
+        lessons = json.loads(lessons_path.read_text())
+        courses = {name: load_course(Path(path)) for name, path in course_paths.items()}
+        store = cls(lessons, courses)
+        if course_paths is COURSE_PATHS:
+            _STORE_CACHE[key] = store
+        return store
+
+    def _build_lesson_indexes(self) -> None:
+        for lesson_key, lesson in self.lessons.items():
+            try:
+                lesson_id = int(lesson_key)
+            except ValueError:
+                continue
+            self.by_curriculum[curriculum_for(lesson_id)].append(lesson_id)
+            chapter_id = lesson.get("chapter_id")
+            if chapter_id:
+                self.by_chapter.setdefault(int(chapter_id), []).append(lesson_id)
+            for tag in lesson.get("concept_tags") or []:
+                self.by_tag.setdefault(tag, []).append(lesson_id)
+        for ids in self.by_curriculum.values():
+            ids.sort()
+
+        # Reinforcer ids are concept_id * 10 + n (e.g. 2001 -> 20011..20014)
+        for lesson_id in self.by_curriculum["r"]:
+            parent_id = lesson_id // 10
+            if is_reinforcer_id(lesson_id) and str(parent_id) in self.lessons:
+                self.reinforcers.setdefault(parent_id, []).append(lesson_id)
+
+    def _build_course_indexes(self) -> None:
+        for name, course in self.courses.items():
+            order: List[int] = []
+            sequence: Dict[int, int] = {}
+            for idx, chapter in enumerate(course.get("chapters", [])):
+                sequence[chapter["id"]] = idx
+            for _, concept_name, lesson_ref in iter_course_lessons(course):
+                lesson_id = lesson_ref["id"]
+                order.append(lesson_id)
+                if concept_name:
+                    self.concept_names[lesson_id] = concept_name
+            self.course_order[name] = order
+            self.chapter_sequence[name] = sequence
+
+    def get(self, lesson_id: int) -> Optional[Lesson]:
+        return self.lessons.get(str(lesson_id))
+
+    def __contains__(self, lesson_id: object) -> bool:
+        return str(lesson_id) in self.lessons
+
+    def __len__(self) -> int:
+        return len(self.lessons)
+
+    def curriculum_lessons(self, curriculum: str) -> Iterator[Tuple[int, Lesson]]:
+        """Yield (id, lesson) for one curriculum in ascending id order."""
+        for lesson_id in self.by_curriculum.get(curriculum, []):
+            yield lesson_id, self.lessons[str(lesson_id)]
+
+    def ordered_lessons(self, curriculum: str) -> Iterator[Tuple[int, Lesson]]:
+        """Yield (id, lesson) in course order, skipping ids missing from lessons.json."""
+        for lesson_id in self.course_order.get(curriculum, []):
+            lesson = self.lessons.get(str(lesson_id))
+            if lesson is not None:
+                yield lesson_id, lesson
+
+    def chapter_lessons(self, chapter_id: int) -> List[Lesson]:
+        return [self.lessons[str(lesson_id)] for lesson_id in self.by_chapter.get(chapter_id, [])]
+
+    def tagged(self, tag: str) -> List[int]:
+        return list(self.by_tag.get(tag, []))
+
+    def reinforcers_of(self, concept_id: int) -> List[Lesson]:
+        return [self.lessons[str(rid)] for rid in self.reinforcers.get(concept_id, []) if str(rid) in self.lessons]
+
+    def concept_of(self, reinforcer_id: int) -> Optional[int]:
+        parent_id = reinforcer_id // 10
+        return parent_id if reinforcer_id in self.reinforcers.get(parent_id, []) else None
+
+    def chapter_index(self, curriculum: str, chapter_id: int) -> Optional[int]:
+        """Position of a chapter in its course file (0-based), as the audits use it."""
+        return self.chapter_sequence.get(curriculum, {}).get(chapter_id)
+
+    def save(self, path: Path = LESSONS_PATH) -> None:
+        """Write lessons back in the repo's canonical lessons.json formatting."""
+        write_lessons(Path(path), self.lessons.items())
+        _STORE_CACHE.clear()
@@ -0,0 +1,196 @@
+"""
+Streaming lessons.json Reader and Writer
+
+Reads and writes lessons files one lesson at a time instead of as a whole
+dict, so filters and transforms hold one lesson (plus a read buffer) at a
+time however large the corpus is.
+
+- ``iter_lessons(path)`` yields (lesson_id, lesson) pairs in file order. The
+  file is read in chunks and each lesson is decoded with the stdlib
+  decoder (json.JSONDecoder.raw_decode) once the buffer holds all of it;
+  what has been yielded is dropped from the buffer.
+- ``LessonWriter`` / ``write_lessons`` write pairs out, a small batch at a
+  time, byte for byte as json.dumps(dict(pairs), indent=2,
+  ensure_ascii=False) would: the canonical lessons.json formatting.
+  write_lessons goes through lesson_files.atomic_writer, so a stream may
+  read the very file it is rewriting, and a failure leaves the file as it
+  was.
+
+Usage:
+    from lesson_stream import iter_lessons, write_lessons
+
+    pairs = ((lesson_id, lesson) for lesson_id, lesson in iter_lessons(LESSONS_PATH) if ...)
+    write_lessons(LESSONS_PATH, pairs)
+
+    python scripts/lesson_stream.py [path]   # check the round trip, compare peak memory with json.load
+"""
+
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, TextIO, Tuple
+
+from lesson_files import LESSONS_PATH, Lesson, atomic_writer
+
+CHUNK_SIZE = 1 << 16
+# Lessons encoded per json encode call: per-call overhead (a fresh encoder
+# and its closures) made one-lesson calls ~40% slower than one whole dump
+BATCH_SIZE = 32
+WHITESPACE = " \t\n\r"
+# What may follow a complete value
+DELIMITERS = WHITESPACE + ",:]}"
+
+
+class _JsonStream:
+    """A growing window over a text file, decoding one JSON value at a time."""
+
+    def __init__(self, source: TextIO, chunk_size: int):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> None:
+        chunk = self.source.read(size)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self) -> str:
+        """The next non-whitespace character ("" at the end of the file)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._fill(self.chunk_size)
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            found = repr(char) if char else "end of file"
+            raise ValueError(f"Expected one of {chars!r}, found {found}")
+        self.pos += 1
+        return char
+
+    def value(self) -> object:
+        """Decode the next value, reading more of the file until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number cut at the end of the buffer ("12" of "12.5") decodes too;
+                # only a following delimiter shows the value is complete
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow geometrically so a lesson larger than a chunk is re-decoded only a few times
+            self._fill(max(self.chunk_size, len(self.buffer) - self.pos))
+
+
+def iter_lessons(path: Path = LESSONS_PATH, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Lesson]]:
+    """Yield (lesson_id, lesson) from a lessons file without loading all of it."""
+    with open(path, encoding="utf-8") as source:
+        stream = _JsonStream(source, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            lesson_id = stream.value()
+            if not isinstance(lesson_id, str):
+                raise ValueError(f"{path}: expected a lesson id, found {lesson_id!r}")
+            stream.expect(":")
+            yield lesson_id, stream.value()  # type: ignore[misc]
+            if stream.expect(",}") == "}":
+                return
+
+
+class LessonWriter:
+    """Writes lessons one at a time to ``out`` in the canonical lessons.json formatting.
+
+    Call ``finish`` after the last lesson to close the top-level object.
+    """
+
+    def __init__(self, out: TextIO):
+        self.count = 0
+        self._written = 0
+        self._pending: Dict[str, Lesson] = {}
+        self._encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+        self._out = out
+        self._out.write("{")
+
+    def write(self, lesson_id: str, lesson: Lesson) -> None:
+        self._pending[lesson_id] = lesson
+        self.count += 1
+        if len(self._pending) >= BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        # Encoding a dict of a few lessons gives "{\n  <entries>\n}" where the
+        # entries are exactly what the whole-dict dumps would have written
+        entries = self._encoder.encode(self._pending)[2:-2]
+        self._out.write(("\n" if not self._written else ",\n") + entries)
+        self._written += len(self._pending)
+        self._pending = {}
+
+    def finish(self) -> None:
+        self._flush()
+        self._out.write("\n}" if self.count else "}")
+
+
+def write_lessons(path: Path, lessons: Iterable[Tuple[str, Lesson]]) -> int:
+    """Stream ``lessons`` to ``path`` as json.dumps(dict(lessons), indent=2, ensure_ascii=False); return the count."""
+    with atomic_writer(path) as out:
+        writer = LessonWriter(out)
+        for lesson_id, lesson in lessons:
+            writer.write(lesson_id, lesson)
+        writer.finish()
+    return writer.count
+
+
+def traced_peak(run: Callable[[], object]) -> float:
+    """Peak traced memory of ``run()`` in MB."""
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else LESSONS_PATH
+    if not path.exists():
+        raise SystemExit(f"Missing lessons file at {path}")
+
+    with tempfile.TemporaryDirectory(prefix="lesson-stream-") as tmp:
+        copy = Path(tmp) / path.name
+        count = write_lessons(copy, iter_lessons(path))
+        expected = json.dumps(json.loads(path.read_text()), indent=2, ensure_ascii=False)
+        if copy.read_text(encoding="utf-8") != expected:
+            raise SystemExit(f"Round trip of {path} is not byte-identical")
+
+        whole_mb = traced_peak(lambda: (copy.write_text(
+            json.dumps(json.loads(path.read_text()), indent=2, ensure_ascii=False), encoding="utf-8")))
+        stream_mb = traced_peak(lambda: write_lessons(copy, iter_lessons(path)))
+
+    print("=" * 60)
+    print("STREAMING LESSONS")
+    print("=" * 60)
+    print(f"  {path}: {count} lessons")
+    print(f"\nPeak memory, load + dump:        {whole_mb:7.1f} MB")
+    print(f"Peak memory, iter_lessons/write: {stream_mb:7.1f} MB")
+    print("Round trip: byte-identical")
+
+
+if __name__ == "__main__":
+    main()
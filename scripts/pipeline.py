@@ -0,0 +1,429 @@
+"""
+Incremental Content Pipeline
+
+Make-like runner for the scripts that derive artifacts from lessons.json and
+the course files. Each stage declares its input files, its output files and
+which lessons (and which lesson fields) it reads; the scripts/ modules a
+stage's script imports (found by parsing its imports) count as inputs too.
+Per-lesson content hashes and file hashes from the last successful run are
+kept in .pipeline_state.json, so a run only re-executes stages whose inputs
+changed. Stages that support it (``incremental``) are also told which
+lessons changed and only redo those.
+
+File hashes are reused while a file's mtime and size are unchanged, as make
+does; use --force after restoring a file with its old timestamp.
+
+Usage:
+    python scripts/pipeline.py                 # run every dirty stage
+    python scripts/pipeline.py reinforcer_scores
+    python scripts/pipeline.py --dry-run       # show what would run and why
+    python scripts/pipeline.py --force         # ignore saved state
+    python scripts/pipeline.py --help
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import re
+import runpy
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from lesson_store import COURSE_PATHS, DATA_DIR, LESSONS_PATH, curriculum_for
+
+OPTIONS = ("--dry-run", "--force")
+
+STATE_PATH = Path(".pipeline_state.json")
+STATE_VERSION = 2
+SCRIPTS_DIR = Path("scripts")
+
+# Fields build_interaction_plans reads; the fields it writes back into
+# lessons.json are left out so its own output does not retrigger it.
+PLAN_INPUT_FIELDS = ("title", "content", "chapter_title", "chapter_id", "starter_code", "solution_code")
+
+# Modules render_diagrams.py collects figure jobs from, and where they write
+DIAGRAM_GENERATORS = ("generate_python_diagrams", "generate_sql_diagrams", "generate_r_diagrams", "generate_r_plots")
+DIAGRAM_DIRS = ("python-diagrams", "sql-diagrams", "r-diagrams", "r-plots")
+
+# Lesson fields run_python_solutions.py executes and compares against
+SOLUTION_FIELDS = ("content", "solution_code")
+
+# Lesson fields concept_graph.py tokenizes
+CONCEPT_FIELDS = ("content", "starter_code", "solution_code")
+
+# Lesson fields sync_database.py copies into the app database
+DATABASE_FIELDS = ("title", "content", "starter_code", "solution_code")
+
+
+def is_python_lesson(lesson_id: int) -> bool:
+    return curriculum_for(lesson_id) == "python"
+
+
+def is_sql_lesson(lesson_id: int) -> bool:
+    return curriculum_for(lesson_id) == "sql"
+
+
+def is_r_lesson(lesson_id: int) -> bool:
+    return curriculum_for(lesson_id) == "r"
+
+
+def all_lessons(lesson_id: int) -> bool:
+    return True
+
+
+class Stage:
+    """One pipeline step.
+
+    ``script`` is run with runpy as ``__main__``. If ``incremental`` names a
+    function in that module, it is called instead with the set of changed
+    lesson ids whenever only lessons (not other input files) changed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        script: str,
+        inputs: Sequence[Path] = (),
+        outputs: Sequence[Path] = (),
+        lessons: Optional[Callable[[int], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+        incremental: Optional[str] = None,
+        cwd: Path = Path("."),
+    ):
+        self.name = name
+        self.script = SCRIPTS_DIR / script
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.lessons = lessons
+        self.fields = tuple(fields) if fields else None
+        self.incremental = incremental
+        self.cwd = cwd
+
+    @property
+    def reads_lessons(self) -> bool:
+        return self.lessons is not None
+
+
+# interaction_plans runs first and rewrites lessons.json with a plan in every
+# lesson, which nearly doubles its size (see precompress_assets.BUDGETS)
+STAGES: List[Stage] = [
+    Stage(
+        "interaction_plans",
+        "build_interaction_plans.py",
+        inputs=list(COURSE_PATHS.values()),
+        outputs=[Path("scripts/interaction_plan_report.json")],
+        lessons=all_lessons,
+        fields=PLAN_INPUT_FIELDS,
+        incremental="main",
+    ),
+    Stage(
+        "reinforcer_mapping",
+        "audit_r_reinforcers.py",
+        inputs=[COURSE_PATHS["r"]],
+        outputs=[Path("scripts/r_reinforcer_audit_mapping.json")],
+        lessons=is_r_lesson,
+    ),
+    Stage(
+        "reinforcer_scores",
+        "score_r_reinforcers.py",
+        inputs=[COURSE_PATHS["r"], Path("scripts/r_reinforcer_audit_mapping.json")],
+        outputs=[Path("scripts/r_reinforcer_scores.json")],
+        lessons=is_r_lesson,
+        incremental="main",
+    ),
+    Stage(
+        "diagrams",
+        "render_diagrams.py",
+        inputs=[SCRIPTS_DIR / f"{module}.py" for module in DIAGRAM_GENERATORS],
+        outputs=[Path("frontend/public/assets") / name for name in DIAGRAM_DIRS],
+    ),
+    Stage(
+        "expected_outputs",
+        "build_expected_outputs.py",
+        inputs=[SCRIPTS_DIR / "solution_sandbox.py"],
+        outputs=[DATA_DIR / "expected_outputs.json"],
+        lessons=all_lessons,
+        fields=("solution_code",),
+    ),
+    Stage(
+        "lesson_shards",
+        "export_lesson_shards.py",
+        inputs=[DATA_DIR / "courses.json", *COURSE_PATHS.values(), DATA_DIR / "expected_outputs.json"],
+        outputs=[DATA_DIR / "shards"],
+        lessons=all_lessons,
+        incremental="main",
+    ),
+    Stage(
+        "python_solutions",
+        "run_python_solutions.py",
+        inputs=[SCRIPTS_DIR / "solution_sandbox.py"],
+        outputs=[Path("scripts/solution_run_report.json")],
+        lessons=is_python_lesson,
+        fields=SOLUTION_FIELDS,
+        incremental="main",
+    ),
+    Stage(
+        "sql_solutions",
+        "verify_sql_solutions.py",
+        outputs=[Path("scripts/sql_verify_report.json")],
+        lessons=is_sql_lesson,
+        fields=("solution_code",),
+    ),
+    Stage(
+        "database",
+        "sync_database.py",
+        inputs=[DATA_DIR / "courses.json", *COURSE_PATHS.values()],
+        lessons=all_lessons,
+        fields=DATABASE_FIELDS,
+    ),
+    Stage(
+        "concept_graph",
+        "concept_graph.py",
+        inputs=list(COURSE_PATHS.values()),
+        outputs=[Path("scripts/concept_graph.json")],
+        lessons=all_lessons,
+        fields=CONCEPT_FIELDS,
+        incremental="main",
+    ),
+    Stage(
+        "audit",
+        "audit_engine.py",
+        inputs=list(COURSE_PATHS.values()),
+        outputs=[Path("scripts/audit_findings.json")],
+        lessons=all_lessons,
+        incremental="main",
+    ),
+]
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+# path -> (mtime_ns, size, digest) from this and earlier runs, saved with the state
+_FILE_DIGESTS: Dict[str, Tuple[int, int, str]] = {}
+
+
+def hash_file(path: Path) -> str:
+    """Hash a file, reusing the saved digest while its mtime and size are unchanged."""
+    stat = path.stat()
+    cached = _FILE_DIGESTS.get(str(path))
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    digest = hash_bytes(path.read_bytes())
+    _FILE_DIGESTS[str(path)] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def hash_path(path: Path) -> Optional[str]:
+    """Hash a file, or a directory as the hash of its sorted file hashes."""
+    if path.is_file():
+        return hash_file(path)
+    if path.is_dir():
+        digest = hashlib.sha1()
+        for child in sorted(p for p in path.rglob("*") if p.is_file()):
+            digest.update(str(child.relative_to(path)).encode())
+            digest.update(hash_file(child).encode())
+        return digest.hexdigest()
+    return None
+
+
+IMPORT_RE = re.compile(r"^\s*(?:from\s+(\w+)[\w.]*\s+import|import\s+([\w., ]+))", re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def direct_imports(script: Path) -> Tuple[Path, ...]:
+    """The scripts/ modules named in ``script``'s import statements (including function-local ones)."""
+    names: Set[str] = set()
+    for from_module, imported in IMPORT_RE.findall(script.read_text()):
+        names.update([from_module] if from_module else (name.strip().split(".")[0].split()[0]
+                                                        for name in imported.split(",") if name.strip()))
+    return tuple(sorted(module for module in (SCRIPTS_DIR / f"{name}.py" for name in names) if module.exists()))
+
+
+def local_imports(script: Path) -> List[Path]:
+    """The scripts/ modules ``script`` imports, directly or through other scripts/ modules."""
+    found: Set[Path] = set()
+    pending = [script]
+    while pending:
+        for module in direct_imports(pending.pop()):
+            if module != script and module not in found:
+                found.add(module)
+                pending.append(module)
+    return sorted(found)
+
+
+def stage_files(stage: Stage) -> List[Path]:
+    """The stage's script and inputs, plus every scripts/ module the Python ones import."""
+    files = [stage.script, *stage.inputs]
+    for path in list(files):
+        if path.suffix == ".py" and path.exists():
+            files += [module for module in local_imports(path) if module not in files]
+    return files
+
+
+NULL_DIGEST = hash_bytes(b"null")
+
+
+def field_digests(lesson: Dict[str, Any]) -> Dict[str, str]:
+    """One digest per lesson field, so stages reading different fields share the work."""
+    return {
+        # Strings (most of a lesson) skip the JSON encoder; the prefix keeps "1" and 1 apart
+        key: hash_bytes(b"s" + value.encode()) if isinstance(value, str)
+        else hash_bytes(json.dumps(value, sort_keys=True, ensure_ascii=False).encode())
+        for key, value in lesson.items()
+    }
+
+
+def hash_lesson(digests: Dict[str, str], fields: Optional[Tuple[str, ...]] = None) -> str:
+    """Hash of the given fields (default: all) from a lesson's field digests."""
+    keys = fields or sorted(digests)
+    return hash_bytes("\n".join(f"{key}:{digests.get(key, NULL_DIGEST)}" for key in keys).encode())
+
+
+class Corpus:
+    """Field digests of lessons.json as last loaded, with lesson hashes memoized per field set.
+
+    Stages that read the same fields share one hashing pass, and the file is
+    only re-parsed when a stage actually rewrote it.
+    """
+
+    def __init__(self) -> None:
+        self.digest: Optional[str] = None
+        self.fields: Dict[str, Dict[str, str]] = {}
+        self._hashes: Dict[Optional[Tuple[str, ...]], Dict[str, str]] = {}
+
+    def refresh(self) -> None:
+        digest = hash_path(LESSONS_PATH)
+        if digest != self.digest:
+            self.digest = digest
+            lessons = json.loads(LESSONS_PATH.read_text()) if digest is not None else {}
+            self.fields = {lesson_id: field_digests(lesson) for lesson_id, lesson in lessons.items()}
+            self._hashes = {}
+
+    def lesson_hashes(self, stage: Stage) -> Dict[str, str]:
+        hashes = self._hashes.get(stage.fields)
+        if hashes is None:
+            hashes = self._hashes[stage.fields] = {
+                lesson_id: hash_lesson(digests, stage.fields) for lesson_id, digests in self.fields.items()
+            }
+        return {lesson_id: digest for lesson_id, digest in hashes.items() if stage.lessons(int(lesson_id))}
+
+
+def snapshot(stage: Stage, corpus: Corpus) -> Dict[str, Any]:
+    """Everything a stage's freshness depends on."""
+    return {
+        "files": {str(path): hash_path(path) for path in stage_files(stage)},
+        "outputs": {str(path): hash_path(path) for path in stage.outputs},
+        "lessons": corpus.lesson_hashes(stage) if stage.reads_lessons else {},
+    }
+
+
+def diff_stage(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Tuple[List[str], Optional[Set[str]]]:
+    """Return (reasons to rerun, changed lesson ids or None if a full run is needed)."""
+    if previous is None:
+        return ["never run"], None
+
+    reasons = [f"{path} changed" for path, digest in current["files"].items() if previous["files"].get(path) != digest]
+    reasons += [
+        f"{path} missing or edited outside the pipeline"
+        for path, digest in current["outputs"].items()
+        if digest is None or previous["outputs"].get(path) != digest
+    ]
+    full_run = bool(reasons)
+
+    old_lessons, new_lessons = previous["lessons"], current["lessons"]
+    changed = {lesson_id for lesson_id, digest in new_lessons.items() if old_lessons.get(lesson_id) != digest}
+    changed |= set(old_lessons) - set(new_lessons)
+    if changed:
+        reasons.append(f"{len(changed)} lessons changed")
+    return reasons, (None if full_run else changed)
+
+
+def run_stage(stage: Stage, changed: Optional[Set[str]]) -> None:
+    cwd = os.getcwd()
+    argv = sys.argv
+    os.chdir(stage.cwd)
+    # Scripts see their own name and no pipeline flags, as if run directly.
+    sys.argv = [str(stage.script)]
+    try:
+        if stage.incremental and changed is not None:
+            module = importlib.import_module(stage.script.stem)
+            getattr(module, stage.incremental)(changed)
+        else:
+            runpy.run_path(str(Path(cwd) / stage.script), run_name="__main__")
+    finally:
+        sys.argv = argv
+        os.chdir(cwd)
+
+
+def load_state() -> Dict[str, Any]:
+    if not STATE_PATH.exists():
+        return {}
+    state = json.loads(STATE_PATH.read_text())
+    return state if state.get("version") == STATE_VERSION else {}
+
+
+def save_state(stages: Dict[str, Any]) -> None:
+    STATE_PATH.write_text(json.dumps({
+        "version": STATE_VERSION,
+        "stages": stages,
+        "file_digests": _FILE_DIGESTS,
+    }, indent=2))
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if "-h" in args or "--help" in args:
+        print(__doc__.strip())
+        return
+    options = [arg for arg in args if arg.startswith("-")]
+    unknown_options = [option for option in options if option not in OPTIONS]
+    if unknown_options:
+        raise SystemExit(f"Unknown options: {', '.join(unknown_options)} (known: {', '.join(OPTIONS)}, --help)")
+    force = "--force" in options
+    dry_run = "--dry-run" in options
+    selected = [arg for arg in args if not arg.startswith("-")]
+
+    stages_by_name = {stage.name: stage for stage in STAGES}
+    unknown = [name for name in selected if name not in stages_by_name]
+    if unknown:
+        raise SystemExit(f"Unknown stages: {', '.join(unknown)} (known: {', '.join(stages_by_name)})")
+
+    sys.path.insert(0, str(SCRIPTS_DIR.resolve()))
+    state = load_state()
+    _FILE_DIGESTS.update({path: tuple(entry) for path, entry in state.get("file_digests", {}).items()})
+    stages: Dict[str, Any] = {} if force else state.get("stages", {})
+    corpus = Corpus()
+    corpus.refresh()
+
+    for stage in STAGES:
+        if selected and stage.name not in selected:
+            continue
+        current = snapshot(stage, corpus)
+        reasons, changed = diff_stage(stages.get(stage.name), current)
+        if not reasons:
+            print(f"  {stage.name}: up to date")
+            continue
+
+        mode = f"incremental ({len(changed)} lessons)" if stage.incremental and changed is not None else "full"
+        print(f"▶ {stage.name}: {mode} — {'; '.join(reasons)}")
+        if dry_run:
+            continue
+
+        started = time.perf_counter()
+        run_stage(stage, changed)
+        print(f"  {stage.name} finished in {time.perf_counter() - started:.2f}s")
+
+        # Later stages (and the saved state) see whatever this stage wrote.
+        corpus.refresh()
+        stages[stage.name] = snapshot(stage, corpus)
+        save_state(stages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Precompressed Static Assets
+
+Compresses every JSON and text asset of the built site (frontend/dist by
+default) at max-level gzip and brotli, prints per-file sizes and savings,
+and fails (exit code 1) when a file is over its size budget. This is the
+frontend postbuild step.
+
+Neither deploy target serves precompressed siblings (GitHub Pages and
+Vercel compress responses themselves), so by default nothing is written
+and the deploy artifact stays as vite built it. --write puts .gz and .br
+siblings next to each file, for a host or CDN that does serve them; they
+are only rewritten when their bytes change (gzip timestamps are zeroed).
+Brotli needs the optional ``brotli`` package; without it only gzip sizes
+are reported.
+
+Budgets follow what the content pipeline really produces. Its first
+default stage, interaction_plans (build_interaction_plans.py), writes a
+plan into every lesson: a pipeline run takes lessons.json from 1.3 MB as
+committed to 2.45 MB. The app reads lessons from the shards and only falls
+back to lessons.json without a manifest, but the file still ships, so its
+budget leaves room for that run plus growth.
+
+Usage:
+    python scripts/precompress_assets.py                  # frontend/dist
+    python scripts/precompress_assets.py frontend/public  # any directory
+    python scripts/precompress_assets.py --write          # also write .gz/.br siblings
+"""
+
+import fnmatch
+import gzip
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are skipped
+    brotli = None
+
+DEFAULT_ROOT = Path("frontend/dist")
+
+TEXT_EXTENSIONS = {".json", ".js", ".mjs", ".css", ".html", ".svg", ".txt", ".md", ".map", ".xml", ".webmanifest"}
+
+# Below this, compression headers outweigh the savings
+MIN_SIZE = 512
+
+# Max raw size per file, first matching pattern wins (paths relative to root)
+BUDGETS: List[Tuple[str, int]] = [
+    ("data/shards/lessons/*", 16 * 1024),
+    ("data/shards/*", 128 * 1024),
+    # 2.45 MB after `python scripts/pipeline.py` (800 lessons with interaction plans)
+    ("data/lessons.json", 4 * 1024 * 1024),
+    ("data/*.json", 2 * 1024 * 1024),
+    ("assets/*.png", 1536 * 1024),
+    ("*", 2 * 1024 * 1024),
+]
+
+FileReport = Dict[str, object]
+
+
+def budget_for(relative: str) -> Optional[int]:
+    for pattern, limit in BUDGETS:
+        if fnmatch.fnmatch(relative, pattern):
+            return limit
+    return None
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def compress_file(path: Path, write: bool = False) -> Tuple[int, int, Optional[int], int]:
+    """Compress one file, writing .gz (and .br) siblings if ``write``; return (raw, gz, br, files written)."""
+    data = path.read_bytes()
+    siblings = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        siblings[".br"] = brotli.compress(data, quality=11)
+    written = 0
+    if write:
+        for suffix, compressed in siblings.items():
+            written += write_if_changed(path.with_name(path.name + suffix), compressed)
+    br = siblings.get(".br")
+    return len(data), len(siblings[".gz"]), len(br) if br is not None else None, written
+
+
+def precompress(root: Path, write: bool = False) -> Tuple[List[FileReport], List[FileReport]]:
+    """Compress every text asset under ``root``; return (reports, over budget)."""
+    files = sorted(p for p in root.rglob("*") if p.is_file())
+    text_files = [p for p in files if p.suffix in TEXT_EXTENSIONS and p.stat().st_size >= MIN_SIZE]
+
+    with ThreadPoolExecutor() as pool:
+        results = dict(zip(text_files, pool.map(lambda path: compress_file(path, write), text_files)))
+
+    reports: List[FileReport] = []
+    over_budget: List[FileReport] = []
+    for path in files:
+        if path.suffix in (".gz", ".br"):
+            continue
+        relative = path.relative_to(root).as_posix()
+        raw = path.stat().st_size
+        report: FileReport = {"path": relative, "raw": raw}
+        if path in results:
+            report["raw"], report["gz"], report["br"], report["written"] = results[path]
+            reports.append(report)
+        limit = budget_for(relative)
+        if limit is not None and raw > limit:
+            over_budget.append({**report, "budget": limit})
+    return reports, over_budget
+
+
+def fmt_size(size: Optional[int]) -> str:
+    if size is None:
+        return "-"
+    return f"{size / 1024:.1f}K" if size < 1024 * 1024 else f"{size / 1024 / 1024:.2f}M"
+
+
+def saving(raw: int, compressed: Optional[int]) -> str:
+    return "-" if compressed is None or not raw else f"{100 - 100 * compressed / raw:.0f}%"
+
+
+def short_path(path: str, width: int = 40) -> str:
+    return path if len(path) <= width else "…" + path[-(width - 1):]
+
+
+def main() -> None:
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    write = "--write" in sys.argv[1:]
+    root = Path(args[0]) if args else DEFAULT_ROOT
+    if not root.is_dir():
+        raise SystemExit(f"Missing asset directory {root} (build the frontend first)")
+    if brotli is None:
+        print("brotli not installed: gzip only (pip install brotli)")
+
+    reports, over_budget = precompress(root, write)
+
+    print("=" * 72)
+    print(f"{'file':<40} {'raw':>8} {'gzip':>8} {'brotli':>8} {'saved':>5}")
+    print("=" * 72)
+    for report in sorted(reports, key=lambda r: r["raw"], reverse=True):
+        best = report["br"] if report["br"] is not None else report["gz"]
+        print(f"{short_path(report['path']):<40} {fmt_size(report['raw']):>8} {fmt_size(report['gz']):>8} "
+              f"{fmt_size(report['br']):>8} {saving(report['raw'], best):>5}")
+
+    raw_total = sum(r["raw"] for r in reports)
+    gz_total = sum(r["gz"] for r in reports)
+    br_total = sum(r["br"] for r in reports) if brotli is not None else None
+    written = sum(r["written"] for r in reports)
+    print(f"\n{len(reports)} files: {fmt_size(raw_total)} raw -> {fmt_size(gz_total)} gzip ({saving(raw_total, gz_total)})"
+          + (f", {fmt_size(br_total)} brotli ({saving(raw_total, br_total)})" if br_total is not None else ""))
+    if write:
+        print(f"{written} compressed siblings written, the rest unchanged")
+
+    if over_budget:
+        print(f"\n{len(over_budget)} files over their size budget:")
+        for report in over_budget:
+            print(f"  {report['path']}: {fmt_size(report['raw'])} > {fmt_size(report['budget'])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Profiling Runner
+
+Runs any script in scripts/ (or a pipeline stage by name) unmodified, as
+``__main__`` from the repo root, once per profiler:
+
+- a stack sampler (a background thread reading the main thread's frames
+  every --interval seconds): the timing pass. It gives the wall time and
+  phase breakdown and writes collapsed stacks, one "frame;frame;frame
+  count" line per distinct stack, which flamegraph.pl, speedscope and
+  inferno read directly;
+- cProfile (skipped with --sample): writes a .pstats file for snakeviz or
+  gprof2dot and prints the top functions by cumulative time;
+- tracemalloc (skipped with --no-memory): the peak traced memory and the
+  top allocation sites by line.
+
+cProfile and tracemalloc slow the code they watch, each unevenly, so the
+timing pass runs with only the sampler, and each pass is a fresh
+interpreter (``--worker``) that starts with no imports or in-memory caches
+from the one before. A script that keeps a cache on disk is cold only in
+the timing pass, which runs first. The later passes are skipped when the
+script fails.
+
+Samples are also sorted into phases by the innermost frame that belongs to
+one: "load" (json.load/loads, reading files, building the LessonStore),
+"serialize" (json.dump/dumps, writing files), "render" (matplotlib,
+seaborn, PIL) and otherwise "transform". The breakdown is the share of
+samples per phase scaled to the wall time. Time in C functions is charged
+to the Python frame that called them, and work done in child processes
+(process pools) is not seen.
+
+Results go to .profiles/<name>.folded, .pstats and .json (the summary).
+
+Usage:
+    python scripts/profile_script.py audit_engine.py
+    python scripts/profile_script.py concept_graph --sample --interval 0.001
+    python scripts/profile_script.py build_interaction_plans --no-memory
+    python scripts/profile_script.py verify_sql_solutions.py 1026 1051   # script arguments after the name
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import runpy
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PROFILES_DIR = Path(".profiles")
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_TOP = 20
+
+Frame = Tuple[str, str]  # (file name, function name)
+Stack = Tuple[Frame, ...]  # outermost first
+
+PHASES = ("load", "transform", "serialize", "render")
+# (phase, file name suffix or "", function names or None for any function in the file)
+PHASE_RULES: List[Tuple[str, str, Optional[Tuple[str, ...]]]] = [
+    ("load", "json/decoder.py", None),
+    ("load", "json/__init__.py", ("load", "loads")),
+    ("load", "lesson_store.py", ("load", "load_course", "__init__")),
+    ("load", "pathlib.py", ("read_text", "read_bytes")),
+    ("serialize", "json/encoder.py", None),
+    ("serialize", "json/__init__.py", ("dump", "dumps")),
+    ("serialize", "pathlib.py", ("write_text", "write_bytes")),
+    # Not iter_lessons/write_lessons themselves: transforms run in generators they drive
+    ("load", "lesson_stream.py", ("_fill", "peek", "expect", "value")),
+    ("serialize", "lesson_stream.py", ("_flush", "finish")),
+    ("serialize", "lesson_files.py", ("atomic_writer", "atomic_write_text")),
+    ("render", "/matplotlib/", None),
+    ("render", "/seaborn/", None),
+    ("render", "/PIL/", None),
+]
+
+
+def frame_phase(frame: Frame) -> Optional[str]:
+    filename, function = frame
+    for phase, suffix, functions in PHASE_RULES:
+        if suffix in filename and (functions is None or function in functions):
+            return phase
+    return None
+
+
+def stack_phase(stack: Stack) -> str:
+    """The phase of the innermost frame that has one; "transform" otherwise."""
+    for frame in reversed(stack):
+        phase = frame_phase(frame)
+        if phase is not None:
+            return phase
+    return "transform"
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer; stacks are counted, not stored per sample."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[Frame] = []
+            while frame is not None:
+                stack.append((frame.f_code.co_filename, frame.f_code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+
+def frame_label(frame: Frame) -> str:
+    filename, function = frame
+    return f"{function} ({Path(filename).name})"
+
+
+def folded_stacks(stacks: Counter, skip: int = 0) -> str:
+    """Collapsed stack format; ``skip`` drops the runner's own outer frames."""
+    lines = []
+    for stack, count in stacks.most_common():
+        labels = [frame_label(frame).replace(";", ",") for frame in stack[skip:]]
+        if labels:
+            lines.append(f"{';'.join(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def phase_breakdown(stacks: Counter, wall: float) -> Dict[str, Dict[str, float]]:
+    counts = {phase: 0 for phase in PHASES}
+    for stack, count in stacks.items():
+        counts[stack_phase(stack)] += count
+    total = sum(counts.values()) or 1
+    return {
+        phase: {"samples": count, "share": round(count / total, 4), "seconds": round(wall * count / total, 3)}
+        for phase, count in counts.items()
+    }
+
+
+def runner_depth(stacks: Counter) -> int:
+    """Frames above the script itself (this module and runpy), common to every sample."""
+    depth = 0
+    for stack in stacks:
+        for index, (filename, function) in enumerate(stack):
+            if function == "<module>" and Path(filename).name not in ("runpy.py", Path(__file__).name):
+                depth = index if not depth else min(depth, index)
+                break
+    return depth
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    filtered = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    return [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in filtered.statistics("lineno")[:limit]
+    ]
+
+
+def top_functions(stats_path: Path, limit: int) -> str:
+    out = io.StringIO()
+    pstats.Stats(str(stats_path), stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def resolve_target(target: str) -> Tuple[str, Path, Path]:
+    """(profile name, script path, working directory) for a script or pipeline stage name."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    from pipeline import STAGES
+
+    for stage in STAGES:
+        if stage.name == target:
+            return stage.name, stage.script, stage.cwd
+    script = Path(target)
+    if not script.exists():
+        script = Path("scripts") / (target if target.endswith(".py") else f"{target}.py")
+    if not script.exists():
+        known = ", ".join(stage.name for stage in STAGES)
+        raise SystemExit(f"No script or pipeline stage named {target!r} (stages: {known})")
+    return script.stem, script, Path(".")
+
+
+def run_script(script: Path, args: Sequence[str], cwd: Path) -> Any:
+    """Run ``script`` as __main__ in ``cwd``; return its exit code."""
+    previous_argv, previous_cwd = sys.argv, os.getcwd()
+    sys.argv = [str(script), *args]
+    os.chdir(cwd)
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as exc:
+        return exc.code
+    finally:
+        sys.argv = previous_argv
+        os.chdir(previous_cwd)
+    return 0
+
+
+def worker(pass_name: str, name: str, script: Path, cwd: Path, out_dir: Path, interval: float, top: int,
+           args: Sequence[str]) -> Dict[str, Any]:
+    """One profiling pass of ``script``, with only that pass's profiler running."""
+    sys.path.insert(0, str(script.parent))
+    result: Dict[str, Any] = {}
+    if pass_name == "time":
+        sampler = StackSampler(interval)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            result["exit_code"] = run_script(script, args, cwd)
+        finally:
+            wall = time.perf_counter() - started
+            sampler.stop()
+        (out_dir / f"{name}.folded").write_text(folded_stacks(sampler.stacks, runner_depth(sampler.stacks)))
+        result.update(wall=wall, samples=sampler.samples(), phases=phase_breakdown(sampler.stacks, wall))
+    elif pass_name == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result["exit_code"] = run_script(script, args, cwd)
+        finally:
+            profiler.disable()
+        profiler.dump_stats(out_dir / f"{name}.pstats")
+    elif pass_name == "memory":
+        tracemalloc.start()
+        try:
+            result["exit_code"] = run_script(script, args, cwd)
+            if not tracemalloc.is_tracing():
+                raise SystemExit(f"{script.name} stops tracemalloc itself; profile it with --no-memory")
+            result["peak"] = tracemalloc.get_traced_memory()[1]
+            result["allocations"] = top_allocations(tracemalloc.take_snapshot(), top)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_pass(pass_name: str, name: str, script: Path, cwd: Path, out_dir: Path, interval: float, top: int,
+             args: Sequence[str]) -> Dict[str, Any]:
+    """Run one pass in a fresh interpreter, so no pass sees another's imports, caches or profiler."""
+    with tempfile.NamedTemporaryFile(suffix=".json") as result_file:
+        completed = subprocess.run([
+            sys.executable, str(Path(__file__).resolve()), "--worker", pass_name, result_file.name, name,
+            str(script.resolve()), str(cwd), str(out_dir), str(interval), str(top), *args,
+        ])
+        if completed.returncode != 0:
+            # The script raised; its traceback is already on stderr
+            raise SystemExit(f"{script.name} failed in the {pass_name} pass")
+        return json.loads(Path(result_file.name).read_text())
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if args[:1] == ["--worker"]:
+        pass_name, result_path, name, script, cwd, out_dir, interval, top = args[1:9]
+        result = worker(pass_name, name, Path(script), Path(cwd), Path(out_dir), float(interval), int(top), args[9:])
+        Path(result_path).write_text(json.dumps(result))
+        return
+
+    options: Dict[str, Any] = {"interval": DEFAULT_INTERVAL, "top": DEFAULT_TOP, "out": PROFILES_DIR}
+    passes = ["time", "cprofile", "memory"]
+    # Runner options come before the target; everything after it is the script's
+    while args and args[0].startswith("--"):
+        flag = args.pop(0)
+        if flag == "--sample":
+            passes.remove("cprofile")
+        elif flag == "--no-memory":
+            passes.remove("memory")
+        elif flag in ("--interval", "--top", "--out"):
+            options[flag[2:]] = args.pop(0)
+        else:
+            raise SystemExit(f"Unknown option {flag}")
+    if not args:
+        raise SystemExit(__doc__)
+
+    name, script, cwd = resolve_target(args[0])
+    top = int(options["top"])
+    out_dir = Path(options["out"])
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for pass_name in passes:
+        results[pass_name] = run_pass(pass_name, name, script, cwd, out_dir, float(options["interval"]), top,
+                                      args[1:])
+        if results[pass_name]["exit_code"] not in (0, None):
+            break
+
+    timing = results["time"]
+    summary: Dict[str, Any] = {
+        "script": str(script),
+        "args": args[1:],
+        "exit_code": timing["exit_code"],
+        "wall_seconds": round(timing["wall"], 3),
+        "samples": timing["samples"],
+        "interval": float(options["interval"]),
+        "phases": timing["phases"],
+    }
+    if "memory" in results:
+        summary["peak_traced_mb"] = round(results["memory"]["peak"] / (1024 * 1024), 1)
+        summary["allocations"] = results["memory"]["allocations"]
+    (out_dir / f"{name}.json").write_text(json.dumps(summary, indent=2) + "\n")
+
+    print("\n" + "=" * 60)
+    print(f"PROFILE: {name}")
+    print("=" * 60)
+    if "cprofile" in results:
+        print(top_functions(out_dir / f"{name}.pstats", top))
+    print(f"Wall {summary['wall_seconds']}s, {summary['samples']} samples every {summary['interval'] * 1000:g} ms")
+    for phase, row in summary["phases"].items():
+        print(f"  {phase:<10} {row['seconds']:>8.3f}s  {row['share']:>6.1%}")
+    if "allocations" in summary:
+        print(f"\nPeak traced memory {summary['peak_traced_mb']} MB; top allocation sites:")
+        for row in summary["allocations"][:10]:
+            print(f"  {row['size_kb']:>10.1f} KB  {row['count']:>8}  {row['site']}")
+    outputs = [out_dir / f"{name}.folded", *([out_dir / f"{name}.pstats"] if "cprofile" in results else [])]
+    print(f"\n-> {', '.join(str(path) for path in outputs)}, {out_dir / f'{name}.json'}")
+    if summary["exit_code"] not in (0, None):
+        raise SystemExit(summary["exit_code"])
+
+
+if __name__ == "__main__":
+    main()
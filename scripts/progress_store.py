@@ -0,0 +1,236 @@
+"""
+User Progress Data Access
+
+Indexed access paths and completion rollups for user_progress in the app
+database (sql_app.db).
+
+- Composite indexes on user_progress (user_id, lesson_id) and
+  (lesson_id, status) turn per-user and per-lesson lookups into index
+  seeks instead of table scans.
+- ``chapter_progress`` holds one row per (user, chapter) with the number
+  of completed lessons. Triggers on user_progress and lessons adjust it by
+  one on every status change, progress row insert/delete, lesson move or
+  lesson delete, so it stays current whoever writes (the app, this module
+  or sync_database.py) and dashboard queries read a handful of rollup rows
+  instead of aggregating every submission.
+
+``ensure_progress_schema`` is idempotent; the rollup is rebuilt from
+user_progress once when it is first created (or with --rebuild).
+
+Usage:
+    from progress_store import open_progress_db, record_progress, course_progress
+
+    conn = open_progress_db()
+    record_progress(conn, user_id=1, lesson_id=3, status=COMPLETED, code="print(1)")
+    course_progress(conn, user_id=1)
+
+    python scripts/progress_store.py 1            # progress summary for user 1
+    python scripts/progress_store.py --rebuild    # recompute rollups
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DB_PATH = Path("sql_app.db")
+
+COMPLETED = "completed"
+ROLLUP_TABLE = "chapter_progress"
+
+PROGRESS_SCHEMA = f"""
+CREATE INDEX IF NOT EXISTS ix_user_progress_user_id_lesson_id ON user_progress (user_id, lesson_id);
+CREATE INDEX IF NOT EXISTS ix_user_progress_lesson_id_status ON user_progress (lesson_id, status);
+CREATE INDEX IF NOT EXISTS ix_lessons_chapter_id ON lessons (chapter_id);
+
+CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+    user_id INTEGER NOT NULL,
+    chapter_id INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, chapter_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS progress_rollup_insert AFTER INSERT ON user_progress
+WHEN new.status = '{COMPLETED}' BEGIN
+    INSERT INTO {ROLLUP_TABLE} (user_id, chapter_id, completed)
+    SELECT new.user_id, chapter_id, 1 FROM lessons WHERE id = new.lesson_id AND chapter_id IS NOT NULL
+    ON CONFLICT (user_id, chapter_id) DO UPDATE SET completed = completed + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS progress_rollup_delete AFTER DELETE ON user_progress
+WHEN old.status = '{COMPLETED}' BEGIN
+    UPDATE {ROLLUP_TABLE} SET completed = completed - 1
+    WHERE user_id = old.user_id AND chapter_id = (SELECT chapter_id FROM lessons WHERE id = old.lesson_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS progress_rollup_update_old AFTER UPDATE OF user_id, lesson_id, status ON user_progress
+WHEN old.status = '{COMPLETED}' BEGIN
+    UPDATE {ROLLUP_TABLE} SET completed = completed - 1
+    WHERE user_id = old.user_id AND chapter_id = (SELECT chapter_id FROM lessons WHERE id = old.lesson_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS progress_rollup_update_new AFTER UPDATE OF user_id, lesson_id, status ON user_progress
+WHEN new.status = '{COMPLETED}' BEGIN
+    INSERT INTO {ROLLUP_TABLE} (user_id, chapter_id, completed)
+    SELECT new.user_id, chapter_id, 1 FROM lessons WHERE id = new.lesson_id AND chapter_id IS NOT NULL
+    ON CONFLICT (user_id, chapter_id) DO UPDATE SET completed = completed + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS progress_rollup_lesson_move AFTER UPDATE OF chapter_id ON lessons
+WHEN old.chapter_id IS NOT new.chapter_id BEGIN
+    UPDATE {ROLLUP_TABLE} SET completed = completed - (
+        SELECT count(*) FROM user_progress p
+        WHERE p.lesson_id = old.id AND p.status = '{COMPLETED}' AND p.user_id = {ROLLUP_TABLE}.user_id
+    )
+    WHERE chapter_id = old.chapter_id;
+    INSERT INTO {ROLLUP_TABLE} (user_id, chapter_id, completed)
+    SELECT p.user_id, new.chapter_id, count(*) FROM user_progress p
+    WHERE p.lesson_id = new.id AND p.status = '{COMPLETED}' AND new.chapter_id IS NOT NULL
+    GROUP BY p.user_id
+    ON CONFLICT (user_id, chapter_id) DO UPDATE SET completed = completed + excluded.completed;
+END;
+
+CREATE TRIGGER IF NOT EXISTS progress_rollup_lesson_delete AFTER DELETE ON lessons
+WHEN old.chapter_id IS NOT NULL BEGIN
+    UPDATE {ROLLUP_TABLE} SET completed = completed - (
+        SELECT count(*) FROM user_progress p
+        WHERE p.lesson_id = old.id AND p.status = '{COMPLETED}' AND p.user_id = {ROLLUP_TABLE}.user_id
+    )
+    WHERE chapter_id = old.chapter_id;
+END;
+"""
+
+
+def ensure_progress_schema(conn: sqlite3.Connection) -> bool:
+    """Create indexes, rollup table and triggers; return True if the rollup was built now."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (ROLLUP_TABLE,)).fetchone()
+    conn.executescript(PROGRESS_SCHEMA)
+    if exists:
+        return False
+    rebuild_rollups(conn)
+    return True
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """Recompute chapter_progress from user_progress in one statement."""
+    with conn:
+        conn.execute(f"DELETE FROM {ROLLUP_TABLE}")
+        conn.execute(
+            f"INSERT INTO {ROLLUP_TABLE} (user_id, chapter_id, completed) "
+            "SELECT p.user_id, l.chapter_id, count(*) FROM user_progress p "
+            "JOIN lessons l ON l.id = p.lesson_id "
+            "WHERE p.status = ? AND l.chapter_id IS NOT NULL "
+            "GROUP BY p.user_id, l.chapter_id",
+            (COMPLETED,),
+        )
+
+
+def open_progress_db(path: Path = DB_PATH) -> sqlite3.Connection:
+    if not Path(path).exists():
+        raise SystemExit(f"Missing database at {path} (start the backend once to create it)")
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    ensure_progress_schema(conn)
+    return conn
+
+
+def get_progress(conn: sqlite3.Connection, user_id: int, lesson_id: int) -> Optional[sqlite3.Row]:
+    return conn.execute(
+        "SELECT * FROM user_progress WHERE user_id = ? AND lesson_id = ? ORDER BY id LIMIT 1",
+        (user_id, lesson_id),
+    ).fetchone()
+
+
+def record_progress(conn: sqlite3.Connection, user_id: int, lesson_id: int, status: str,
+                    code: Optional[str] = None) -> int:
+    """Insert or update the user's progress row for a lesson; return its id.
+
+    Completing a lesson stamps completed_at; the rollup follows via triggers.
+    """
+    completed_at = "CURRENT_TIMESTAMP" if status == COMPLETED else "NULL"
+    with conn:
+        row = get_progress(conn, user_id, lesson_id)
+        if row is None:
+            cursor = conn.execute(
+                "INSERT INTO user_progress (user_id, lesson_id, status, code_submitted, completed_at) "
+                f"VALUES (?, ?, ?, ?, {completed_at})",
+                (user_id, lesson_id, status, code),
+            )
+            return cursor.lastrowid
+        if row["status"] == COMPLETED and status == COMPLETED:
+            # Re-submitting a completed lesson keeps the original completion time
+            completed_at = "completed_at"
+        conn.execute(
+            f"UPDATE user_progress SET status = ?, code_submitted = coalesce(?, code_submitted), "
+            f"completed_at = {completed_at} WHERE id = ?",
+            (status, code, row["id"]),
+        )
+        return row["id"]
+
+
+def completed_lessons(conn: sqlite3.Connection, user_id: int) -> List[int]:
+    return [row[0] for row in conn.execute(
+        "SELECT lesson_id FROM user_progress WHERE user_id = ? AND status = ? ORDER BY lesson_id",
+        (user_id, COMPLETED),
+    )]
+
+
+def lesson_completions(conn: sqlite3.Connection, lesson_id: int) -> int:
+    """How many users completed a lesson (an index range count)."""
+    return conn.execute(
+        "SELECT count(*) FROM user_progress WHERE lesson_id = ? AND status = ?", (lesson_id, COMPLETED)
+    ).fetchone()[0]
+
+
+def chapter_progress(conn: sqlite3.Connection, user_id: int, course_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Per-chapter {chapter_id, title, completed, total} for one user, in course order."""
+    sql = (
+        "SELECT c.id AS chapter_id, c.course_id, c.title, coalesce(r.completed, 0) AS completed, "
+        "(SELECT count(*) FROM lessons l WHERE l.chapter_id = c.id) AS total "
+        f"FROM chapters c LEFT JOIN {ROLLUP_TABLE} r ON r.chapter_id = c.id AND r.user_id = ? "
+    )
+    params: List[Any] = [user_id]
+    if course_id is not None:
+        sql += "WHERE c.course_id = ? "
+        params.append(course_id)
+    sql += "ORDER BY c.course_id, c.order_index"
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def course_progress(conn: sqlite3.Connection, user_id: int) -> List[Dict[str, Any]]:
+    """Per-course {course_id, slug, title, completed, total, percent} for one user."""
+    totals: Dict[int, Dict[str, Any]] = {
+        row["id"]: {"course_id": row["id"], "slug": row["slug"], "title": row["title"], "completed": 0, "total": 0}
+        for row in conn.execute("SELECT id, slug, title FROM courses ORDER BY id")
+    }
+    for chapter in chapter_progress(conn, user_id):
+        course = totals.get(chapter["course_id"])
+        if course is not None:
+            course["completed"] += chapter["completed"]
+            course["total"] += chapter["total"]
+    for course in totals.values():
+        course["percent"] = round(100 * course["completed"] / course["total"], 1) if course["total"] else 0.0
+    return list(totals.values())
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    conn = open_progress_db()
+    try:
+        if "--rebuild" in args:
+            rebuild_rollups(conn)
+            print(f"Rebuilt {ROLLUP_TABLE}")
+        for user_id in (int(arg) for arg in args if not arg.startswith("--")):
+            user = conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+            if user is None:
+                print(f"No user {user_id}")
+                continue
+            print(f"{user['username']}: {user['xp']} XP, level {user['level']}, streak {user['current_streak']}")
+            for course in course_progress(conn, user_id):
+                print(f"  {course['title']:<28} {course['completed']:>4}/{course['total']:<4} {course['percent']:>5}%")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
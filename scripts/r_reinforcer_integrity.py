@@ -3,11 +3,11 @@ Step 0: R Reinforcer Integrity Check
 Verify every R concept has exactly 4 reinforcers
 """
 
-import json
 from collections import defaultdict
 
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+from lesson_store import LessonStore
+
+lessons = LessonStore.load().lessons
 
 # R concepts are 4-digit IDs (2000-2999)
 # R reinforcers are 5-digit IDs (20000-29999) where first 4 digits match concept
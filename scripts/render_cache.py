@@ -0,0 +1,119 @@
+"""
+Content-Addressed Render Cache
+
+Keeps the diagram/plot generators from re-rendering or rewriting PNGs that
+have not changed.
+
+- ``figure_key`` hashes everything a figure depends on: the drawing
+  function's source (plus its module's save_plot), its arguments, the
+  matplotlib/seaborn versions, the style (rcParams) it renders under,
+  digests of any data it reads (e.g. dataset_store snapshots) and the
+  directory it is saved into, so moving a generator's OUTPUT_DIR re-renders
+  into the new location instead of trusting the files left at the old one.
+- ``RenderCache`` maps each figure job to its last key and the hashes of
+  the files it wrote (.render_cache.json). A job whose key matches and whose
+  outputs are still on disk untouched is skipped without rendering.
+- ``save_figure`` renders into memory and only writes the file when the
+  bytes differ from what is already there, so a forced re-render leaves
+  unchanged files (and their mtimes, git status and CDN caches) alone.
+"""
+
+import filecmp
+import hashlib
+import inspect
+import io
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+CACHE_PATH = Path(".render_cache.json")
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def save_figure(fig: Any, path: Any, **savefig_kwargs: Any) -> bool:
+    """Save ``fig`` to ``path`` unless the file already holds the same bytes.
+
+    Returns True if the file was written.
+    """
+    path = Path(path)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=path.suffix.lstrip(".") or "png", **savefig_kwargs)
+    data = buffer.getvalue()
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def copy_if_changed(src: Any, dst: Any) -> bool:
+    """shutil.copy, skipped when ``dst`` already has the same contents."""
+    if Path(dst).exists() and filecmp.cmp(src, dst, shallow=False):
+        return False
+    shutil.copy(src, dst)
+    return True
+
+
+def library_versions() -> Dict[str, str]:
+    """Versions of the plotting libraries loaded in this process."""
+    versions = {}
+    for name in ("matplotlib", "seaborn", "pandas", "numpy"):
+        module = sys.modules.get(name)
+        if module is not None:
+            versions[name] = getattr(module, "__version__", "")
+    return versions
+
+
+def figure_key(func: Callable[..., Any], args: Sequence[Any], style: Dict[str, Any],
+               extra_sources: Iterable[Callable[..., Any]] = (), inputs: Iterable[str] = (),
+               output_dir: str = "") -> str:
+    """Hash of everything that determines the pixels of one figure."""
+    payload = {
+        "source": inspect.getsource(func),
+        "helpers": [inspect.getsource(helper) for helper in extra_sources],
+        "args": repr(tuple(args)),
+        "versions": library_versions(),
+        "style": sorted((name, repr(value)) for name, value in style.items()),
+        "inputs": list(inputs),
+        "output_dir": os.path.normpath(output_dir) if output_dir else "",
+    }
+    return hash_bytes(json.dumps(payload, sort_keys=True).encode())
+
+
+class RenderCache:
+    """Job id -> {"key": figure key, "outputs": {path: sha1}}."""
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None, path: Path = CACHE_PATH):
+        self.entries = entries or {}
+        self.path = path
+
+    @classmethod
+    def load(cls, path: Path = CACHE_PATH) -> "RenderCache":
+        if not path.exists():
+            return cls(path=path)
+        return cls(json.loads(path.read_text()), path)
+
+    def is_fresh(self, job_id: str, key: str) -> bool:
+        """True if the job last rendered with ``key`` and its files are untouched."""
+        entry = self.entries.get(job_id)
+        if not entry or entry["key"] != key or not entry["outputs"]:
+            return False
+        for output, digest in entry["outputs"].items():
+            output_path = Path(output)
+            if not output_path.is_file() or hash_bytes(output_path.read_bytes()) != digest:
+                return False
+        return True
+
+    def record(self, job_id: str, key: str, outputs: Iterable[str]) -> None:
+        self.entries[job_id] = {
+            "key": key,
+            "outputs": {output: hash_bytes(Path(output).read_bytes()) for output in outputs},
+        }
+
+    def save(self) -> None:
+        self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
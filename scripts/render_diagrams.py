@@ -0,0 +1,173 @@
+"""
+Parallel Diagram Renderer
+
+Gathers the figure jobs (``FIGURES``) from every diagram/plot generator and
+renders them in a process pool instead of one after another. Each job draws
+on its own matplotlib Figure (object-oriented API, Agg backend), so workers
+share no pyplot state. Per-figure timings are printed at the end.
+
+Each generator sets its matplotlib style at import time (generate_r_plots
+switches to a seaborn theme), so the rcParams each module ends up with are
+captured on import and restored around each of its jobs; a worker can render
+figures from every generator without one style leaking into another.
+
+Figures whose inputs have not changed since the last run are skipped
+(see render_cache.py); --force re-renders everything, still without
+rewriting files whose bytes come out the same.
+
+Usage:
+    python scripts/render_diagrams.py                  # everything
+    python scripts/render_diagrams.py sql r_plots      # selected generators
+    python scripts/render_diagrams.py --jobs 4
+    python scripts/render_diagrams.py --force
+"""
+
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from dataset_store import dataset_digest
+from render_cache import CACHE_PATH, RenderCache, figure_key
+
+GENERATORS = {
+    "python": "generate_python_diagrams",
+    "sql": "generate_sql_diagrams",
+    "r": "generate_r_diagrams",
+    "r_plots": "generate_r_plots",
+}
+
+# Steps that need other generators' output, run once the pool is done:
+# (generator, module function)
+AFTER_RENDER = [
+    ("r", "copy_generic_diagrams"),
+]
+
+Job = Tuple[str, int]  # (generator key, index into its FIGURES)
+
+# generator key -> (module, rcParams after import); filled per process
+_LOADED: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+
+
+def load_generator(key: str) -> Tuple[Any, Dict[str, Any]]:
+    """Import a generator once per process and capture the style it sets."""
+    if key not in _LOADED:
+        with matplotlib.rc_context():
+            module = importlib.import_module(GENERATORS[key])
+            style = {name: value for name, value in matplotlib.rcParams.items() if name != "backend"}
+            _LOADED[key] = (module, style)
+    return _LOADED[key]
+
+
+def job_label(func: Any, args: Sequence[Any]) -> str:
+    filenames = [arg for arg in args if isinstance(arg, str) and arg.endswith(".png")]
+    return f"{func.__name__}({filenames[0]})" if filenames else f"{func.__name__}()"
+
+
+def render_job(job: Job) -> Tuple[str, str, Optional[str], float, str]:
+    """Render one figure; return (generator, label, output path, seconds, log)."""
+    key, index = job
+    module, style = load_generator(key)
+    func, args = module.FIGURES[index]
+    log = StringIO()
+    started = time.perf_counter()
+    with matplotlib.rc_context(style), redirect_stdout(log):
+        path = func(*args)
+    return key, job_label(func, args), path, time.perf_counter() - started, log.getvalue()
+
+
+def collect_jobs(keys: Sequence[str]) -> List[Job]:
+    jobs = []
+    for key in keys:
+        module, _ = load_generator(key)
+        jobs.extend((key, index) for index in range(len(module.FIGURES)))
+    return jobs
+
+
+def job_cache_entry(job: Job) -> Tuple[str, str]:
+    """(cache job id, figure key) for one job."""
+    key, index = job
+    module, style = load_generator(key)
+    func, args = module.FIGURES[index]
+    helpers = [module.save_plot] if hasattr(module, "save_plot") else []
+    inputs = [dataset_digest(name) for name in getattr(module, "DATASETS", ())]
+    output_dir = getattr(module, "OUTPUT_DIR", "")
+    return f"{key}:{job_label(func, args)}", figure_key(func, args, style, helpers, inputs, output_dir)
+
+
+def render_all(
+    keys: Sequence[str],
+    max_workers: Optional[int] = None,
+    cache: Optional[RenderCache] = None,
+    force: bool = False,
+) -> Tuple[List[Tuple[str, str, Optional[str], float]], int]:
+    """Render every stale figure of the given generators in parallel.
+
+    Generators are imported in the parent first, so forked workers start with
+    the datasets and styles already loaded. Returns (timings, skipped count).
+    """
+    cache = cache or RenderCache()
+    jobs = []
+    cache_entries: Dict[Job, Tuple[str, str]] = {}
+    for job in collect_jobs(keys):
+        cache_entries[job] = job_cache_entry(job)
+        if force or not cache.is_fresh(*cache_entries[job]):
+            jobs.append(job)
+
+    results = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), max_workers or os.cpu_count() or 1)) as pool:
+            futures = {pool.submit(render_job, job): job for job in jobs}
+            for future in as_completed(futures):
+                key, label, path, seconds, log = future.result()
+                sys.stdout.write(log)
+                results.append((key, label, path, seconds))
+                if path:
+                    cache.record(*cache_entries[futures[future]], [path])
+
+    for key, func_name in AFTER_RENDER:
+        if key in keys:
+            module, _ = load_generator(key)
+            getattr(module, func_name)()
+    return results, len(cache_entries) - len(jobs)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    max_workers = None
+    if "--jobs" in args:
+        position = args.index("--jobs")
+        max_workers = int(args[position + 1])
+        del args[position:position + 2]
+    keys = [arg for arg in args if not arg.startswith("--")] or list(GENERATORS)
+    unknown = [key for key in keys if key not in GENERATORS]
+    if unknown:
+        raise SystemExit(f"Unknown generators: {', '.join(unknown)} (known: {', '.join(GENERATORS)})")
+
+    cache = RenderCache.load()
+    started = time.perf_counter()
+    results, skipped = render_all(keys, max_workers, cache, force="--force" in args)
+    wall = time.perf_counter() - started
+    cache.save()
+
+    print("\n" + "=" * 60)
+    print("FIGURE TIMINGS")
+    print("=" * 60)
+    for key, label, _, seconds in sorted(results, key=lambda r: r[3], reverse=True):
+        print(f"  {seconds:7.3f}s  {key:<8} {label}")
+    busy = sum(r[3] for r in results)
+    workers = max_workers or os.cpu_count()
+    print(f"\nRendered {len(results)} figures in {wall:.2f}s wall ({busy:.2f}s of rendering across {workers} workers)")
+    print(f"Skipped {skipped} unchanged figures (cache: {CACHE_PATH})")
+
+
+if __name__ == "__main__":
+    main()
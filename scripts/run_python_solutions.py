@@ -0,0 +1,267 @@
+"""
+Python Solution Runner
+
+Executes every Python lesson's solution_code and checks it against the
+output the lesson declares, instead of guessing from print() calls the way
+batch_c_quality_fix.py does.
+
+Solutions run in a pool of sandboxed worker subprocesses
+(solution_sandbox.py): each worker preloads numpy/pandas/matplotlib once and
+forks a fresh child per lesson, with a per-lesson timeout, rlimits and a
+scratch working directory. Captured stdout is compared with the lesson's
+declared expected output: the inline code or fenced block after an
+"Expected Output" marker. Placeholder text such as "Your code should print
+output from the print statements" does not count as a declaration, and runs
+of XXX in a declaration match any value.
+
+Statuses: match, mismatch, ran (no declared output), error, timeout,
+missing_module (an import the local environment lacks, e.g. sklearn).
+Results, including every captured stdout, go to
+scripts/solution_run_report.json.
+
+Usage:
+    python scripts/run_python_solutions.py              # all Python lessons
+    python scripts/run_python_solutions.py 12 13 115    # selected lessons
+    python scripts/run_python_solutions.py --jobs 8 --timeout 20
+    python scripts/run_python_solutions.py --strict     # exit 1 on failures
+"""
+
+import difflib
+import json
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from lesson_store import LessonStore
+
+REPORT_PATH = Path("scripts/solution_run_report.json")
+SANDBOX_SCRIPT = Path(__file__).resolve().parent / "solution_sandbox.py"
+
+DEFAULT_TIMEOUT = 10.0
+FAILING_STATUSES = ("mismatch", "error", "timeout")
+
+EXPECTED_MARKER_RE = re.compile(r'^.*\bExpected Output\b.*$', re.IGNORECASE | re.MULTILINE)
+INLINE_CODE_RE = re.compile(r'`([^`\n]+)`')
+FENCED_BLOCK_RE = re.compile(r'\A\s*(?:[^\n`#]*\n\s*)?```[\w-]*\n(.*?)```', re.DOTALL)
+PLACEHOLDER_RE = re.compile(
+    r'should print output|run your code|verify it matches|matches the solution|output should look',
+    re.IGNORECASE,
+)
+WILDCARD_RE = re.compile(r'X{3,}')
+MISSING_MODULE_RE = re.compile(r"ModuleNotFoundError: No module named '([^']+)'")
+
+
+def extract_expected_output(content: str) -> Optional[str]:
+    """The output a lesson declares for its solution, or None if it declares none."""
+    for marker in EXPECTED_MARKER_RE.finditer(content):
+        inline = INLINE_CODE_RE.search(marker.group(0))
+        if inline:
+            return inline.group(1)
+        rest = content[marker.end():]
+        block = FENCED_BLOCK_RE.match(rest)
+        if block:
+            return block.group(1)
+        first_line = rest.strip().split("\n", 1)[0]
+        if first_line and not PLACEHOLDER_RE.search(first_line) and not first_line.startswith(("#", "---")):
+            return first_line
+    return None
+
+
+def normalize_output(text: str) -> str:
+    lines = [line.rstrip() for line in text.strip("\n").splitlines()]
+    return "\n".join(lines).strip()
+
+
+def matches_expected(actual: str, expected: str) -> bool:
+    actual, expected = normalize_output(actual), normalize_output(expected)
+    if actual == expected:
+        return True
+    if WILDCARD_RE.search(expected):
+        pattern = "".join(
+            r"\S+?" if WILDCARD_RE.fullmatch(part) else re.escape(part)
+            for part in re.split(r"(X{3,})", expected)
+        )
+        return re.fullmatch(pattern, actual) is not None
+    return False
+
+
+def output_diff(actual: str, expected: str) -> List[str]:
+    return list(difflib.unified_diff(
+        normalize_output(expected).splitlines(), normalize_output(actual).splitlines(),
+        "expected", "actual", lineterm="", n=1,
+    ))
+
+
+class SandboxPool:
+    """A fixed set of solution_sandbox.py workers fed from one job queue."""
+
+    def __init__(self, size: int, hash_seed: int = 0):
+        self.size = max(1, size)
+        self.env = {
+            "PATH": os.environ.get("PATH", ""),
+            "HOME": os.environ.get("HOME", ""),
+            "MPLBACKEND": "Agg",
+            "PYTHONHASHSEED": str(hash_seed),
+            "PYTHONIOENCODING": "utf-8",
+        }
+
+    def spawn(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            # -s -P rather than -I: isolated mode would also ignore self.env's
+            # PYTHONHASHSEED and PYTHONIOENCODING, and the env is built from scratch anyway
+            [sys.executable, "-s", "-P", str(SANDBOX_SCRIPT)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8", env=self.env,
+        )
+
+    def run(self, jobs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        pending: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        for job in jobs:
+            pending.put(job)
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def serve() -> None:
+            worker = self.spawn()
+            try:
+                while True:
+                    try:
+                        job = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    worker.stdin.write(json.dumps(job) + "\n")
+                    worker.stdin.flush()
+                    line = worker.stdout.readline()
+                    if not line:
+                        # The worker itself died; report the job and start a fresh one
+                        results[job["id"]] = {"id": job["id"], "status": "error", "stdout": "",
+                                              "stderr": "sandbox worker crashed", "seconds": 0.0}
+                        worker = self.spawn()
+                        continue
+                    results[job["id"]] = json.loads(line)
+            finally:
+                worker.stdin.close()
+                worker.wait()
+
+        threads = [threading.Thread(target=serve) for _ in range(min(self.size, len(jobs)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+
+def classify(lesson: Dict[str, Any], run: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a sandbox result into a report entry."""
+    expected = extract_expected_output(lesson.get("content") or "")
+    entry: Dict[str, Any] = {
+        "lesson_id": int(run["id"]),
+        "title": lesson.get("title", ""),
+        "seconds": run["seconds"],
+        "stdout": run["stdout"],
+    }
+    if run["status"] == "timeout":
+        entry["status"] = "timeout"
+    elif run["status"] == "error":
+        missing = MISSING_MODULE_RE.search(run["stderr"])
+        entry["status"] = "missing_module" if missing else "error"
+        stderr = run["stderr"].strip().splitlines()
+        entry["error"] = missing.group(1) if missing else (stderr[-1] if stderr else "")
+    elif expected is None:
+        entry["status"] = "ran"
+    elif matches_expected(run["stdout"], expected):
+        entry["status"] = "match"
+    else:
+        entry["status"] = "mismatch"
+        entry["expected"] = expected
+        entry["diff"] = output_diff(run["stdout"], expected)
+    return entry
+
+
+def run_solutions(store: LessonStore, lesson_ids: Optional[Iterable[int]] = None, jobs: Optional[int] = None,
+                  timeout: float = DEFAULT_TIMEOUT, hash_seed: int = 0) -> List[Dict[str, Any]]:
+    """Run the selected Python lessons (default: all) and return report entries in id order."""
+    selected = set(lesson_ids) if lesson_ids is not None else None
+    lessons = {
+        str(lesson_id): lesson
+        for lesson_id, lesson in store.curriculum_lessons("python")
+        if lesson.get("solution_code") and (selected is None or lesson_id in selected)
+    }
+    work = [{"id": lesson_id, "code": lesson["solution_code"], "timeout": timeout} for lesson_id, lesson in lessons.items()]
+    results = SandboxPool(jobs or os.cpu_count() or 1, hash_seed).run(work)
+    return sorted((classify(lessons[key], run) for key, run in results.items()), key=lambda e: e["lesson_id"])
+
+
+def summarize(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    by_status: Dict[str, int] = {}
+    for entry in entries:
+        by_status[entry["status"]] = by_status.get(entry["status"], 0) + 1
+    missing = sorted({entry["error"] for entry in entries if entry["status"] == "missing_module"})
+    return {"total": len(entries), "by_status": by_status, "missing_modules": missing}
+
+
+def option_value(args: List[str], name: str) -> Optional[str]:
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return None
+
+
+def main(changed_ids: Optional[Set[str]] = None) -> None:
+    """Run solutions and write the report.
+
+    When ``changed_ids`` (lesson id strings) is given, only those lessons are
+    re-run and the rest are reused from the previous report.
+    """
+    args = sys.argv[1:]
+    jobs = option_value(args, "--jobs")
+    timeout = float(option_value(args, "--timeout") or DEFAULT_TIMEOUT)
+    values = {option_value(args, "--jobs"), option_value(args, "--timeout")}
+    lesson_ids = [int(arg) for arg in args if not arg.startswith("--") and arg not in values] or None
+
+    store = LessonStore.load()
+    previous: Dict[int, Dict[str, Any]] = {}
+    if changed_ids is not None and REPORT_PATH.exists():
+        previous = {entry["lesson_id"]: entry for entry in json.loads(REPORT_PATH.read_text())["results"]}
+        lesson_ids = [int(lesson_id) for lesson_id in changed_ids]
+
+    started = time.perf_counter()
+    entries = run_solutions(store, lesson_ids, int(jobs) if jobs else None, timeout)
+    elapsed = time.perf_counter() - started
+    ran = len(entries)
+
+    if previous:
+        rerun = {entry["lesson_id"] for entry in entries}
+        current = {lesson_id for lesson_id, lesson in store.curriculum_lessons("python") if lesson.get("solution_code")}
+        entries = sorted(
+            entries + [entry for lesson_id, entry in previous.items() if lesson_id in current - rerun],
+            key=lambda e: e["lesson_id"],
+        )
+    summary = summarize(entries)
+    REPORT_PATH.write_text(json.dumps({"summary": summary, "results": entries}, indent=2, ensure_ascii=False))
+
+    print("=" * 60)
+    print("PYTHON SOLUTION RUN")
+    print("=" * 60)
+    for status, count in sorted(summary["by_status"].items()):
+        print(f"  {status:<16} {count}")
+    if summary["missing_modules"]:
+        print(f"  (not installed here: {', '.join(summary['missing_modules'])})")
+    failures = [entry for entry in entries if entry["status"] in FAILING_STATUSES]
+    for entry in failures:
+        print(f"\n✗ {entry['lesson_id']} {entry['title']} [{entry['status']}]")
+        for line in entry.get("diff") or ([entry["error"]] if entry.get("error") else []):
+            print(f"    {line}")
+    print(f"\nRan {ran} solutions in {elapsed:.2f}s ({len(entries) - ran} reused) -> {REPORT_PATH}")
+
+    if "--strict" in args and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,38 +8,64 @@ Evaluates each reinforcer on 4 dimensions:
 4. Robustness (0-3): Clear task, clear outcome
 
 Also flags hidden prerequisites or implicit assumptions.
+
+Concept keywords are extracted once per concept, each reinforcer's text is
+lowercased once, and reinforcers are scored in a process pool. Scores are
+cached in .reinforcer_score_cache.json under a hash of the reinforcer's
+scored fields, its concept's content, its type and this scorer's source,
+so rescoring after an edit only recomputes the reinforcers it touched.
+
+Usage:
+    python scripts/score_r_reinforcers.py
+    python scripts/score_r_reinforcers.py --jobs 4
 """
 
+import hashlib
 import json
-import re
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from code_tokens import content_code, function_calls, significant_tokens
+from lesson_store import LessonStore
+
+SCORES_PATH = 'scripts/r_reinforcer_scores.json'
+CACHE_PATH = Path('.reinforcer_score_cache.json')
+
+# Editing any of these changes every cache key
+SCORER_SOURCES = [Path(__file__).resolve(), Path(__file__).resolve().parent / 'code_tokens.py']
+SCORED_FIELDS = ('content', 'starter_code', 'solution_code', 'expected_output')
+
+# Below this many reinforcers to score, a pool costs more than it saves
+MIN_PARALLEL_JOBS = 32
+
 def load_data():
     """Load course structure and lesson content."""
-    with open('frontend/public/data/course-r-fundamentals.json', 'r') as f:
-        course = json.load(f)
-    with open('frontend/public/data/lessons.json', 'r') as f:
-        lessons = json.load(f)
+    store = LessonStore.load()
+    course = store.courses['r']
+    lessons = store.lessons
     with open('scripts/r_reinforcer_audit_mapping.json', 'r') as f:
         mappings = json.load(f)
     return course, lessons, mappings
 
+@lru_cache(maxsize=None)
 def get_concept_keywords(concept_content):
-    """Extract key concepts/functions taught in the concept lesson."""
-    keywords = []
-    
-    # Look for code blocks and extract function names
-    code_blocks = re.findall(r'```r\n(.*?)```', concept_content, re.DOTALL)
-    for block in code_blocks:
-        # Extract function calls like filter(, ggplot(, etc.
-        funcs = re.findall(r'\b(\w+)\s*\(', block)
-        keywords.extend(funcs)
-    
-    # Look for inline code references
-    inline_code = re.findall(r'`(\w+)`', concept_content)
-    keywords.extend(inline_code)
-    
-    return list(set(keywords))
+    """Extract key concepts/functions taught in the concept lesson (lowercased, memoized per concept)."""
+    keywords = set()
+    
+    for language, code in content_code(concept_content, 'r'):
+        if language != 'r':
+            continue
+        # Function calls like filter(, ggplot(, etc.
+        keywords |= function_calls('r', code)
+        # Inline code references like `filter`
+        tokens = significant_tokens('r', code)
+        if len(tokens) == 1 and tokens[0][0] == 'name':
+            keywords.add(tokens[0][1])
+    
+    return tuple(keyword.lower() for keyword in keywords)
 
 def score_reinforcer(reinforcer_lesson, concept_lesson, reinforcer_type, all_previous_concepts):
     """
@@ -80,8 +106,9 @@ def score_reinforcer(reinforcer_lesson, concept_lesson, reinforcer_type, all_pre
     relevance_score = 0
     
     # Check if reinforcer mentions concept keywords
-    reinforcer_text = content + starter_code + solution_code
-    keyword_matches = sum(1 for kw in concept_keywords if kw.lower() in reinforcer_text.lower())
+    content_lower = content.lower()
+    reinforcer_text = (content + starter_code + solution_code).lower()
+    keyword_matches = sum(1 for kw in concept_keywords if kw in reinforcer_text)
     
     if keyword_matches >= 3:
         relevance_score = 3
@@ -93,7 +120,7 @@ def score_reinforcer(reinforcer_lesson, concept_lesson, reinforcer_type, all_pre
         score['notes'].append("⚠️ Low keyword overlap with concept")
     
     # Boost if explicit reference to concept
-    if 'above' in content.lower() or 'previous' in content.lower() or 'we learned' in content.lower():
+    if 'above' in content_lower or 'previous' in content_lower or 'we learned' in content_lower:
         relevance_score = min(3, relevance_score + 1)
     
     score['relevance'] = relevance_score
@@ -112,7 +139,7 @@ def score_reinforcer(reinforcer_lesson, concept_lesson, reinforcer_type, all_pre
     }
     
     # Extract functions used in solution
-    solution_funcs = re.findall(r'\b(\w+)\s*\(', solution_code) if solution_code else []
+    solution_funcs = function_calls('r', solution_code) if solution_code else frozenset()
     
     # Check for very advanced functions that might indicate a jump
     advanced_patterns = ['map(', 'reduce(', 'nest(', 'unnest_wider', 'across(', '{{', '!!']
@@ -122,7 +149,7 @@ def score_reinforcer(reinforcer_lesson, concept_lesson, reinforcer_type, all_pre
             score['notes'].append(f"⚠️ Uses advanced function: {pattern}")
     
     # Check if content has clear step-by-step guidance
-    if '1.' in content or '- ' in content or 'step' in content.lower():
+    if '1.' in content or '- ' in content or 'step' in content_lower:
         pass  # Good - has structured guidance
     else:
         difficulty_score -= 1
@@ -148,7 +175,7 @@ def score_reinforcer(reinforcer_lesson, concept_lesson, reinforcer_type, all_pre
     
     # Check for explanatory keywords
     why_how_keywords = ['because', 'why', 'how', 'when you', 'this works', 'notice', 'remember']
-    if any(kw in content.lower() for kw in why_how_keywords):
+    if any(kw in content_lower for kw in why_how_keywords):
         explanation_score = min(3, explanation_score + 1)
     else:
         score['notes'].append("Missing why/how explanation")
@@ -186,7 +213,7 @@ def score_reinforcer(reinforcer_lesson, concept_lesson, reinforcer_type, all_pre
         score['notes'].append("Missing expected output")
     
     # Clear task description?
-    if '🎯' in content or 'task' in content.lower() or 'your task' in content.lower():
+    if '🎯' in content or 'task' in content_lower:
         pass
     else:
         score['notes'].append("No clear task marker")
@@ -196,7 +223,127 @@ def score_reinforcer(reinforcer_lesson, concept_lesson, reinforcer_type, all_pre
     
     return score
 
-def main():
+def reinforcer_type(title):
+    """Determine reinforcer type from title."""
+    title = title.lower()
+    if 'analogy' in title:
+        return 'analogy'
+    elif 'variation' in title:
+        return 'variation'
+    elif 'fix' in title:
+        return 'fix_the_code'
+    elif 'challenge' in title:
+        return 'challenge'
+    return 'unknown'
+
+def scorer_version():
+    digest = hashlib.sha1()
+    for path in SCORER_SOURCES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def scored_fields(lesson):
+    if not lesson:
+        return None
+    return {field: lesson.get(field, '') for field in SCORED_FIELDS}
+
+def score_job(job):
+    """Process-pool entry point: (key, reinforcer fields, concept content, type) -> (key, score)."""
+    key, r_fields, concept_content, r_type = job
+    concept_lesson = {'content': concept_content} if concept_content is not None else None
+    return key, score_reinforcer(r_fields, concept_lesson, r_type, [])
+
+def reinforcer_jobs(mappings, lessons, version):
+    """One job per reinforcer, keyed by a hash of everything its score depends on."""
+    jobs = {}
+    for m in mappings:
+        concept_lesson = lessons.get(str(m['concept']['id']))
+        concept_content = concept_lesson.get('content', '') if concept_lesson else None
+        for r in m['reinforcers']:
+            r_fields = scored_fields(lessons.get(str(r['id'])))
+            r_type = reinforcer_type(r['title'])
+            payload = json.dumps([version, r_fields, concept_content, r_type], sort_keys=True)
+            jobs[r['id']] = (hashlib.sha1(payload.encode('utf-8')).hexdigest(), r_fields, concept_content, r_type)
+    return jobs
+
+def load_cache():
+    if not CACHE_PATH.exists():
+        return {}
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except ValueError:
+        return {}
+
+def score_reinforcers(mappings, lessons, workers=None):
+    """Score every mapped reinforcer, reusing cached scores; return ({id: score}, cache hits)."""
+    jobs = reinforcer_jobs(mappings, lessons, scorer_version())
+    cache = load_cache()
+    pending = list({job[0]: job for job in jobs.values() if job[0] not in cache}.values())
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(pending) >= MIN_PARALLEL_JOBS:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = dict(pool.map(score_job, pending, chunksize=max(1, len(pending) // (workers * 4))))
+    else:
+        results = dict(map(score_job, pending))
+    cache.update(results)
+
+    # Keep only the entries this mapping still uses
+    used = {job[0] for job in jobs.values()}
+    cache = {key: score for key, score in cache.items() if key in used}
+    CACHE_PATH.write_text(json.dumps(cache, sort_keys=True))
+    scores = {r_id: cache[job[0]] for r_id, job in jobs.items()}
+    return scores, len(jobs) - len(pending)
+
+def score_set(m, scores):
+    """Assemble one concept's reinforcer set from the audit mapping and per-reinforcer scores."""
+    concept_id = m['concept']['id']
+    
+    set_scores = {
+        'concept_id': concept_id,
+        'concept_title': m['concept']['title'],
+        'chapter': m['chapter'],
+        'concept_name': m['concept_name'],
+        'reinforcers': [],
+        'total_score': 0,
+        'avg_score': 0
+    }
+    
+    for r in m['reinforcers']:
+        r_id = r['id']
+        score = scores[r_id]
+        
+        total = score['relevance'] + score['difficulty_jump'] + score['explanation_quality'] + score['robustness']
+        
+        reinforcer_result = {
+            'id': r_id,
+            'title': r['title'],
+            'type': reinforcer_type(r['title']),
+            'relevance': score['relevance'],
+            'difficulty_jump': score['difficulty_jump'],
+            'explanation_quality': score['explanation_quality'],
+            'robustness': score['robustness'],
+            'total': total,
+            'notes': score['notes'],
+            'hidden_prereqs': score['hidden_prereqs']
+        }
+        
+        set_scores['reinforcers'].append(reinforcer_result)
+        set_scores['total_score'] += total
+    
+    set_scores['avg_score'] = set_scores['total_score'] / 4
+    return set_scores
+
+def main(changed_ids=None):
+    """Score every reinforcer set.
+
+    ``changed_ids`` (lesson id strings, passed by the pipeline) needs no
+    special handling: reinforcers whose inputs did not change are served
+    from the score cache.
+    """
+    args = sys.argv[1:]
+    workers = int(args[args.index('--jobs') + 1]) if '--jobs' in args[:-1] else None
+    
     print("Loading data...")
     course, lessons, mappings_data = load_data()
     
@@ -208,63 +355,11 @@ def main():
     
     print("Scoring reinforcers...\n")
     
+    scores, reused = score_reinforcers(mappings, lessons, workers)
+    
     for m in mappings:
-        concept_id = m['concept']['id']
-        concept_lesson = lessons.get(str(concept_id))
-        
-        set_scores = {
-            'concept_id': concept_id,
-            'concept_title': m['concept']['title'],
-            'chapter': m['chapter'],
-            'concept_name': m['concept_name'],
-            'reinforcers': [],
-            'total_score': 0,
-            'avg_score': 0
-        }
-        
-        # Build list of previous concept IDs for prereq checking
-        previous_concepts = []
-        
-        for r_idx, r in enumerate(m['reinforcers']):
-            r_id = r['id']
-            r_lesson = lessons.get(str(r_id))
-            
-            # Determine reinforcer type from title
-            title = r['title'].lower()
-            if 'analogy' in title:
-                r_type = 'analogy'
-            elif 'variation' in title:
-                r_type = 'variation'
-            elif 'fix' in title:
-                r_type = 'fix_the_code'
-            elif 'challenge' in title:
-                r_type = 'challenge'
-            else:
-                r_type = 'unknown'
-            
-            # Score the reinforcer
-            score = score_reinforcer(r_lesson, concept_lesson, r_type, previous_concepts)
-            
-            total = score['relevance'] + score['difficulty_jump'] + score['explanation_quality'] + score['robustness']
-            
-            reinforcer_result = {
-                'id': r_id,
-                'title': r['title'],
-                'type': r_type,
-                'relevance': score['relevance'],
-                'difficulty_jump': score['difficulty_jump'],
-                'explanation_quality': score['explanation_quality'],
-                'robustness': score['robustness'],
-                'total': total,
-                'notes': score['notes'],
-                'hidden_prereqs': score['hidden_prereqs']
-            }
-            
-            set_scores['reinforcers'].append(reinforcer_result)
-            set_scores['total_score'] += total
-            all_scores.append(reinforcer_result)
-        
-        set_scores['avg_score'] = set_scores['total_score'] / 4
+        set_scores = score_set(m, scores)
+        all_scores.extend(set_scores['reinforcers'])
         set_averages.append(set_scores)
     
     # Sort by average score (lowest first) for worst sets
@@ -320,10 +415,11 @@ def main():
         'worst_20': worst_20
     }
     
-    with open('scripts/r_reinforcer_scores.json', 'w') as f:
+    with open(SCORES_PATH, 'w') as f:
         json.dump(output, f, indent=2)
     
-    print(f"\n\nDetailed scores saved to scripts/r_reinforcer_scores.json")
+    print(f"\nScored {len(scores) - reused} reinforcers, reused {reused} cached scores")
+    print(f"\n\nDetailed scores saved to {SCORES_PATH}")
     print(f"\nOverall Average Score: {output['summary']['avg_score_overall']:.2f}/12")
 
 if __name__ == '__main__':
@@ -0,0 +1,128 @@
+"""
+Solution Sandbox Worker
+
+Long-lived worker process for run_python_solutions.py. It reads one JSON
+job per line on stdin ({"id", "code", "timeout"}) and answers with one JSON
+line per job ({"id", "status", "stdout", "stderr", "seconds"}).
+
+numpy, pandas and matplotlib are imported once at start-up; every job then
+runs in a forked child, so it gets those modules for free but cannot leak
+state (random seeds, pandas options, open figures, globals) into the next
+job. The child runs in a scratch directory with stdin closed, rlimits on
+CPU time, memory and written file size, and is killed at its wall-clock
+timeout.
+
+Run as ``python -s -P scripts/solution_sandbox.py`` with a minimal
+environment, so it imports nothing from the repo or user site-packages
+and its hash seed is the PYTHONHASHSEED it is given; it needs a POSIX
+os.fork.
+"""
+
+import importlib
+import json
+import os
+import resource
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import traceback
+from typing import Any, Dict
+
+PRELOAD = ("numpy", "pandas", "matplotlib", "matplotlib.pyplot")
+
+MAX_OUTPUT = 64 * 1024
+MEMORY_LIMIT = 2 * 1024 * 1024 * 1024
+FILE_SIZE_LIMIT = 16 * 1024 * 1024
+
+
+def preload() -> None:
+    for name in PRELOAD:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def limit_resources(timeout: float) -> None:
+    cpu_seconds = int(timeout) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    resource.setrlimit(resource.RLIMIT_AS, (MEMORY_LIMIT, MEMORY_LIMIT))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (FILE_SIZE_LIMIT, FILE_SIZE_LIMIT))
+
+
+def run_child(job: Dict[str, Any], workdir: str, stdout_fd: int, stderr_fd: int) -> None:
+    """Body of the forked child; never returns."""
+    exit_code = 1
+    try:
+        os.chdir(workdir)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        limit_resources(job["timeout"])
+        namespace = {"__name__": "__main__", "__builtins__": __builtins__}
+        exec(compile(job["code"], f"<lesson {job['id']}>", "exec"), namespace)
+        exit_code = 0
+    except SystemExit as exc:
+        exit_code = 0 if exc.code in (None, 0) else 1
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)
+
+
+def read_capped(handle: Any) -> str:
+    handle.seek(0)
+    data = handle.read(MAX_OUTPUT + 1)
+    text = data[:MAX_OUTPUT].decode("utf-8", errors="replace")
+    return text + "\n[output truncated]" if len(data) > MAX_OUTPUT else text
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix="lesson-")
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        started = time.perf_counter()
+        sys.stdout.flush()
+        pid = os.fork()
+        if pid == 0:
+            run_child(job, workdir, out.fileno(), err.fileno())
+
+        deadline = started + job["timeout"]
+        delay = 0.001
+        status = None
+        while status is None:
+            done, wait_status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                status = "ok" if os.waitstatus_to_exitcode(wait_status) == 0 else "error"
+            elif time.perf_counter() > deadline:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                status = "timeout"
+            else:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.02)
+        seconds = time.perf_counter() - started
+        result = {"id": job["id"], "status": status, "stdout": read_capped(out), "stderr": read_capped(err),
+                  "seconds": round(seconds, 4)}
+    shutil.rmtree(workdir, ignore_errors=True)
+    return result
+
+
+def main() -> None:
+    preload()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        result = run_job(json.loads(line))
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+SQL Lesson Fixture Database
+
+The tables SQL lesson solutions query (employees, departments, customers,
+orders, products, users, events, ...), built once as an in-memory SQLite
+database. employees/departments extend the rows the JOIN visualizations
+show (build_interaction_plans.DEFAULT_LEFT_TABLE / DEFAULT_RIGHT_TABLE), so
+a solution's result matches what the lesson draws.
+
+Lessons are not consistent about column names (orders.id vs
+orders.order_id, amount vs total, name vs customer_name), so each table
+carries the common aliases as extra columns holding the same values. Rows
+are generated from a fixed seed and never change between runs, which keeps
+result fingerprints stable.
+
+Connections also get small stand-ins for the PostgreSQL functions lessons
+use most (DATE_TRUNC, EXTRACT, LEAST, GREATEST, STDDEV); other
+PostgreSQL-only syntax is out of scope.
+
+Usage:
+    from sql_fixtures import build_template, clone_template
+
+    template = build_template()            # sqlite3.Connection
+    data = template.serialize()            # bytes, cheap to ship to workers
+    conn = clone_template(data)            # independent in-memory copy
+"""
+
+import math
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from build_interaction_plans import DEFAULT_LEFT_TABLE, DEFAULT_RIGHT_TABLE
+
+SEED = 42
+START_DATE = date(2024, 1, 1)
+
+Row = Tuple[Any, ...]
+# table -> (column DDL, rows)
+Fixture = Dict[str, Tuple[Sequence[str], List[Row]]]
+
+FIRST_NAMES = ["Alice", "Bob", "Charlie", "Diana", "Evan", "Fiona", "George", "Hannah", "Ivan", "Julia",
+               "Kevin", "Laura", "Mike", "Nina", "Oscar", "Paula"]
+LAST_NAMES = ["Smith", "Jones", "Brown", "Garcia", "Miller", "Davis", "Wilson", "Moore"]
+CITIES = [("New York", "NY", "USA"), ("Boston", "MA", "USA"), ("Chicago", "IL", "USA"),
+          ("Austin", "TX", "USA"), ("Toronto", "ON", "Canada"), ("London", None, "UK")]
+CATEGORIES = ["Electronics", "Books", "Clothing", "Home"]
+PRODUCTS = [("Laptop", 0, 999.99), ("Headphones", 0, 79.5), ("Phone", 0, 699.0), ("Novel", 1, 12.99),
+            ("Cookbook", 1, 24.0), ("T-Shirt", 2, 15.0), ("Jeans", 2, 49.99), ("Lamp", 3, 35.0),
+            ("Blender", 3, 89.0), ("Notebook", 1, 4.5)]
+ORDER_STATUSES = ["completed", "completed", "completed", "shipped", "pending", "cancelled"]
+CHANNELS = ["web", "mobile"]
+EVENT_TYPES = ["view", "view", "click", "purchase", "signup"]
+
+
+def day(offset: int) -> str:
+    return (START_DATE + timedelta(days=offset)).isoformat()
+
+
+def departments() -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "department_id INTEGER", "dept_id INTEGER", "name TEXT",
+               "department_name TEXT", "department TEXT", "location TEXT"]
+    locations = ["New York", "Chicago", "Austin"]
+    rows = [
+        (row["dept_id"], row["dept_id"], row["dept_id"], row["department"], row["department"], row["department"],
+         locations[index % len(locations)])
+        for index, row in enumerate(DEFAULT_RIGHT_TABLE)
+    ]
+    return columns, rows
+
+
+def employees() -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "emp_id INTEGER", "employee_id INTEGER", "name TEXT", "first_name TEXT",
+               "last_name TEXT", "email TEXT", "department TEXT", "department_id INTEGER", "dept_id INTEGER",
+               "salary REAL", "manager_id INTEGER", "hire_date TEXT", "title TEXT"]
+    names = {row["dept_id"]: row["department"] for row in DEFAULT_RIGHT_TABLE}
+    # The JOIN diagram rows first, then more staff; Hannah has no department
+    staff = [(row["id"], row["name"], row["dept_id"]) for row in DEFAULT_LEFT_TABLE]
+    staff += [(4, "Diana", 30), (5, "Evan", 20), (6, "Fiona", 30), (7, "George", 10), (8, "Hannah", None)]
+    salaries = [95000, 62000, 58000, 120000, 54000, 88000, 47000, 51000]
+    managers = [None, 1, 1, None, 2, 4, 3, 1]
+    titles = ["Sales Director", "Marketing Lead", "Account Executive", "Engineering Manager",
+              "Marketing Analyst", "Software Engineer", "Sales Associate", "Intern"]
+    rows = []
+    for index, (emp_id, name, dept_id) in enumerate(staff):
+        last = LAST_NAMES[index % len(LAST_NAMES)]
+        rows.append((emp_id, emp_id, emp_id, name, name, last, f"{name.lower()}@company.com", names.get(dept_id),
+                     dept_id, dept_id, salaries[index], managers[index], day(-900 + 97 * index), titles[index]))
+    return columns, rows
+
+
+def customers(rng: random.Random) -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "customer_id INTEGER", "name TEXT", "customer_name TEXT",
+               "first_name TEXT", "last_name TEXT", "email TEXT", "phone TEXT", "city TEXT", "state TEXT",
+               "country TEXT", "region TEXT", "segment TEXT", "status TEXT", "signup_date TEXT", "birth_date TEXT"]
+    rows = []
+    for customer_id in range(1, 13):
+        first = FIRST_NAMES[customer_id - 1]
+        last = LAST_NAMES[customer_id % len(LAST_NAMES)]
+        city, state, country = CITIES[customer_id % len(CITIES)]
+        email = None if customer_id in (4, 9) else f"{first.lower()}.{last.lower()}@example.com"
+        rows.append((customer_id, customer_id, f"{first} {last}", f"{first} {last}", first, last, email,
+                     f"555-01{customer_id:02d}", city, state, country, "North America" if country != "UK" else "Europe",
+                     rng.choice(["consumer", "business"]), "active" if customer_id % 5 else "inactive",
+                     day(-200 + 15 * customer_id), f"{1970 + 3 * customer_id}-0{1 + customer_id % 9}-15"))
+    return columns, rows
+
+
+def categories() -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "category_id INTEGER", "name TEXT", "category_name TEXT", "parent_id INTEGER"]
+    return columns, [(index + 1, index + 1, name, name, None) for index, name in enumerate(CATEGORIES)]
+
+
+def products() -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "product_id INTEGER", "name TEXT", "product_name TEXT", "product TEXT",
+               "category TEXT", "category_id INTEGER", "cat_id INTEGER", "price REAL", "cost REAL",
+               "stock INTEGER", "quantity INTEGER", "description TEXT", "is_active INTEGER", "supplier_id INTEGER",
+               "status TEXT", "sales REAL", "year INTEGER"]
+    rows = []
+    for product_id, (name, category, price) in enumerate(PRODUCTS, start=1):
+        category_id = None if product_id == 10 else category + 1
+        rows.append((product_id, product_id, name, name, name, CATEGORIES[category] if category_id else None,
+                     category_id, category_id, price, round(price * 0.6, 2), 5 * product_id, 5 * product_id,
+                     f"{name} ({CATEGORIES[category].lower()})", int(product_id != 7), 1 + product_id % 3,
+                     "in_stock", round(price * (20 - product_id), 2), 2023 + product_id % 2))
+    return columns, rows
+
+
+def orders(rng: random.Random) -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "order_id INTEGER", "customer_id INTEGER", "product_id INTEGER",
+               "product TEXT", "product_name TEXT", "quantity INTEGER", "price REAL", "amount REAL", "total REAL",
+               "order_amount REAL", "status TEXT", "order_status TEXT", "order_date TEXT", "ship_date TEXT",
+               "channel TEXT", "region TEXT", "processed INTEGER", "user_id INTEGER", "date TEXT", "month INTEGER",
+               "items_ordered INTEGER", "priority TEXT"]
+    rows = []
+    for order_id in range(1, 41):
+        customer_id = 1 + (order_id * 7) % 10  # customers 11 and 12 never order
+        product_id = rng.randint(1, len(PRODUCTS))
+        name, _, price = PRODUCTS[product_id - 1]
+        quantity = rng.randint(1, 3)
+        amount = round(price * quantity, 2)
+        status = rng.choice(ORDER_STATUSES)
+        offset = 9 * order_id + rng.randint(0, 6)
+        shipped = day(offset + rng.randint(1, 5)) if status in ("completed", "shipped") else None
+        rows.append((order_id, order_id, customer_id, product_id, name, name, quantity, price, amount, amount,
+                     amount, status, status, day(offset), shipped, rng.choice(CHANNELS),
+                     rng.choice(["North", "South", "East", "West"]), int(order_id % 4 == 0), customer_id,
+                     day(offset), int(day(offset)[5:7]), quantity * 4, "Urgent" if order_id % 6 == 0 else "Normal"))
+    return columns, rows
+
+
+def order_items(rng: random.Random) -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "order_id INTEGER", "product_id INTEGER", "quantity INTEGER",
+               "price REAL", "unit_price REAL"]
+    rows = []
+    for order_id in range(1, 41):
+        for product_id in sorted(rng.sample(range(1, len(PRODUCTS) + 1), rng.randint(1, 3))):
+            price = PRODUCTS[product_id - 1][2]
+            rows.append((len(rows) + 1, order_id, product_id, rng.randint(1, 4), price, price))
+    return columns, rows
+
+
+def users(rng: random.Random) -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "user_id INTEGER", "name TEXT", "username TEXT", "first_name TEXT",
+               "last_name TEXT", "email TEXT", "phone TEXT", "age INTEGER", "is_active INTEGER", "active INTEGER",
+               "status TEXT", "signup_date TEXT", "cohort TEXT", "country TEXT", "city TEXT", "created_at TEXT"]
+    rows = []
+    for user_id in range(1, 16):
+        first = FIRST_NAMES[user_id % len(FIRST_NAMES)]
+        last = LAST_NAMES[user_id % len(LAST_NAMES)]
+        signup = day(-120 + 11 * user_id)
+        active = int(rng.random() < 0.7)
+        city, _, country = CITIES[user_id % len(CITIES)]
+        rows.append((user_id, user_id, f"{first} {last}", f"{first.lower()}{user_id}", first, last,
+                     None if user_id % 6 == 0 else f"{first.lower()}{user_id}@mail.com",
+                     None if user_id % 4 == 0 else f"555-02{user_id:02d}", 18 + (user_id * 7) % 45, active, active,
+                     "active" if active else "inactive", signup, signup[:7], country, city, signup + " 09:00:00"))
+    return columns, rows
+
+
+def events(rng: random.Random) -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "event_id INTEGER", "user_id INTEGER", "event_type TEXT", "event TEXT",
+               "event_name TEXT", "event_date TEXT", "event_time TEXT", "event_timestamp TEXT", "created_at TEXT",
+               "page_url TEXT", "session_id INTEGER", "value REAL"]
+    rows = []
+    for event_id in range(1, 81):
+        user_id = rng.randint(1, 15)
+        event_type = rng.choice(EVENT_TYPES)
+        event_day = day(-30 + rng.randint(0, 59))
+        timestamp = f"{event_day} {rng.randint(8, 22):02d}:{rng.randint(0, 59):02d}:00"
+        rows.append((event_id, event_id, user_id, event_type, event_type, event_type, event_day, timestamp,
+                     timestamp, timestamp, rng.choice(["/home", "/products", "/cart", "/checkout"]),
+                     1 + event_id // 4, round(rng.random() * 100, 2) if event_type == "purchase" else None))
+    return columns, rows
+
+
+def sales(rng: random.Random) -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "sale_id INTEGER", "sale_date TEXT", "product_id INTEGER",
+               "category TEXT", "region TEXT", "quantity INTEGER", "amount REAL", "revenue REAL", "tax REAL",
+               "orders INTEGER", "month TEXT", "year INTEGER", "sales REAL"]
+    rows = []
+    for sale_id in range(1, 37):
+        product_id = rng.randint(1, len(PRODUCTS))
+        quantity = rng.randint(1, 5)
+        amount = round(PRODUCTS[product_id - 1][2] * quantity, 2)
+        sale_day = day(10 * sale_id)
+        rows.append((sale_id, sale_id, sale_day, product_id, CATEGORIES[PRODUCTS[product_id - 1][1]],
+                     rng.choice(["North", "South", "East", "West"]), quantity, amount, amount,
+                     round(amount * 0.08, 2), quantity if sale_id % 9 else 0, sale_day[:7], int(sale_day[:4]), amount))
+    return columns, rows
+
+
+def sessions(rng: random.Random) -> Tuple[Sequence[str], List[Row]]:
+    columns = ["id INTEGER PRIMARY KEY", "session_id INTEGER", "user_id INTEGER", "session_start TEXT",
+               "session_end TEXT", "page_url TEXT", "duration_seconds INTEGER"]
+    rows = []
+    for session_id in range(1, 21):
+        start = f"{day(rng.randint(0, 30))} {rng.randint(8, 20):02d}:00:00"
+        duration = rng.randint(30, 1800)
+        rows.append((session_id, session_id, rng.randint(1, 15), start, start, rng.choice(["/home", "/products"]),
+                     duration))
+    return columns, rows
+
+
+def small_tables(order_rows: List[Row]) -> Fixture:
+    """One-off tables single lessons demonstrate a feature on."""
+    by_year = {
+        year: [(row[0], row[2], row[8], f"{year}{row[13][4:]}") for row in order_rows if row[0] % 3 != year % 3]
+        for year in (2023, 2024)
+    }
+    order_columns = ["id INTEGER PRIMARY KEY", "customer_id INTEGER", "amount REAL", "order_date TEXT"]
+    return {
+        "t": (["x REAL", "col INTEGER", "val INTEGER", "grp TEXT"],
+              [(1.5, 10, 3, "a"), (2.5, 20, 7, "a"), (4.0, 20, 7, "b"), (None, 30, 1, "b"), (8.0, 40, 9, "b")]),
+        "contacts": (["id INTEGER PRIMARY KEY", "name TEXT", "phone TEXT", "email TEXT"],
+                     [(1, "Alice", "555-0101", "alice@example.com"), (2, "Bob", None, "bob@example.com"),
+                      (3, "Charlie", "555-0103", None), (4, "Diana", None, None)]),
+        "colors": (["color TEXT"], [("Red",), ("Green",), ("Blue",)]),
+        "sizes": (["size TEXT"], [("S",), ("M",), ("L",)]),
+        "stats": (["id INTEGER PRIMARY KEY", "total REAL", "count INTEGER"], [(1, 100.0, 4), (2, 50.0, 0), (3, 90.0, 3)]),
+        "inventory": (["id INTEGER PRIMARY KEY", "product_id INTEGER", "quantity INTEGER", "warehouse TEXT"],
+                      [(1, 1, 40, "East"), (2, 2, 150, "East"), (3, 3, 220, "West"), (4, 4, 90, "West")]),
+        "suppliers": (["id INTEGER PRIMARY KEY", "supplier_id INTEGER", "name TEXT", "country TEXT"],
+                      [(1, 1, "Acme Corp", "USA"), (2, 2, "Globex", "Canada"), (3, 3, "Alice Smith", "UK")]),
+        "orders_2023": (order_columns, by_year[2023]),
+        "orders_2024": (order_columns, by_year[2024]),
+    }
+
+
+def fixture_tables() -> Fixture:
+    rng = random.Random(SEED)
+    tables = {
+        "departments": departments(),
+        "employees": employees(),
+        "customers": customers(rng),
+        "categories": categories(),
+        "products": products(),
+        "orders": orders(rng),
+        "order_items": order_items(rng),
+        "users": users(rng),
+        "events": events(rng),
+        "sales": sales(rng),
+        "sessions": sessions(rng),
+    }
+    tables.update(small_tables(tables["orders"][1]))
+    return tables
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromisoformat(str(value).replace("T", " ")[:19])
+
+
+def date_trunc(unit: str, value: Any) -> Optional[str]:
+    moment = parse_timestamp(value)
+    if moment is None:
+        return None
+    unit = unit.lower()
+    if unit == "year":
+        moment = moment.replace(month=1, day=1)
+    elif unit == "quarter":
+        moment = moment.replace(month=3 * ((moment.month - 1) // 3) + 1, day=1)
+    elif unit == "month":
+        moment = moment.replace(day=1)
+    elif unit == "week":
+        moment = moment - timedelta(days=moment.weekday())
+    elif unit == "hour":
+        return moment.replace(minute=0, second=0).isoformat(" ")
+    return moment.date().isoformat()
+
+
+def extract(unit: str, value: Any) -> Optional[int]:
+    moment = parse_timestamp(value)
+    if moment is None:
+        return None
+    unit = unit.lower()
+    if unit == "quarter":
+        return (moment.month - 1) // 3 + 1
+    if unit == "dow":
+        return moment.isoweekday() % 7
+    if unit == "week":
+        return moment.isocalendar()[1]
+    return getattr(moment, unit)
+
+
+def least(*values: Any) -> Any:
+    present = [value for value in values if value is not None]
+    return min(present) if present else None
+
+
+def greatest(*values: Any) -> Any:
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+class StdDev:
+    """Sample standard deviation aggregate (PostgreSQL STDDEV)."""
+
+    def __init__(self) -> None:
+        self.values: List[float] = []
+
+    def step(self, value: Any) -> None:
+        if value is not None:
+            self.values.append(float(value))
+
+    def finalize(self) -> Optional[float]:
+        if len(self.values) < 2:
+            return None
+        mean = sum(self.values) / len(self.values)
+        return math.sqrt(sum((value - mean) ** 2 for value in self.values) / (len(self.values) - 1))
+
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    conn.create_function("DATE_TRUNC", 2, date_trunc, deterministic=True)
+    conn.create_function("EXTRACT", 2, extract, deterministic=True)
+    conn.create_function("LEAST", -1, least, deterministic=True)
+    conn.create_function("GREATEST", -1, greatest, deterministic=True)
+    conn.create_aggregate("STDDEV", 1, StdDev)
+
+
+def build_template() -> sqlite3.Connection:
+    """Create the fixture database in memory."""
+    conn = sqlite3.connect(":memory:")
+    register_functions(conn)
+    with conn:
+        for table, (columns, rows) in fixture_tables().items():
+            conn.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+            placeholders = ", ".join("?" for _ in columns)
+            conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+    return conn
+
+
+def connect_empty() -> sqlite3.Connection:
+    """Blank in-memory database with the same function stand-ins."""
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    register_functions(conn)
+    return conn
+
+
+def clone_template(data: bytes) -> sqlite3.Connection:
+    """Independent in-memory copy of a serialized template."""
+    conn = connect_empty()
+    conn.deserialize(data)
+    return conn
@@ -0,0 +1,317 @@
+"""
+Course Database Sync
+
+Upserts every course, chapter and lesson from frontend/public/data into the
+app database (sql_app.db) in a single transaction.
+
+Each synced row's content hash is kept in a ``sync_state`` table next to
+the row id it was written to, so a resync only sends rows whose content
+changed: after editing one lesson, one row is updated and nothing else is
+touched. Changed rows go through one prepared INSERT ... ON CONFLICT DO
+UPDATE statement per table (executemany), and the database is switched to
+WAL mode so the app can keep reading while a sync writes. The lessons
+full-text index (lesson_search.py) is created on first sync and follows
+every write through its triggers.
+
+Chapter ids are only unique within a course file, so chapters are keyed by
+"<course slug>/<chapter id>" and mapped to table ids on first sync (the
+course's own id when it is free, otherwise a new one). Lessons not listed
+in any course are synced without a chapter. ``xp_reward`` is app data: it
+is set when a lesson is first inserted and left alone afterwards. Rows a
+previous sync wrote whose source has since disappeared are deleted, except
+lessons that user_progress rows still point at: those are kept (and
+reported) so no progress is left pointing at a missing lesson.
+
+Rows that no sync wrote (the legacy content the backend seeded, e.g. the
+18 lessons in the committed sql_app.db) are overwritten in place when a
+current row has the same id. A legacy lesson replaced by a differently
+titled one would leave its user_progress rows crediting users with a
+lesson they never did, so the sync refuses while such rows exist;
+--clear-legacy-progress deletes them in the same transaction (the
+chapter_progress triggers follow). Progress on legacy lessons whose title
+matches is kept.
+
+Usage:
+    python scripts/sync_database.py                # sync into sql_app.db
+    python scripts/sync_database.py path/to/app.db
+    python scripts/sync_database.py --dry-run      # report what would change
+    python scripts/sync_database.py --clear-legacy-progress
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from lesson_search import ensure_search_index
+from lesson_store import DATA_DIR, LessonStore, iter_course_lessons
+
+DB_PATH = Path("sql_app.db")
+COURSES_PATH = DATA_DIR / "courses.json"
+
+DEFAULT_DIFFICULTY = "Beginner"
+LESSON_XP = 10
+BOSS_LESSON_XP = 50
+
+SYNC_STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    entity VARCHAR NOT NULL,
+    source_key VARCHAR NOT NULL,
+    row_id INTEGER NOT NULL,
+    hash VARCHAR NOT NULL,
+    PRIMARY KEY (entity, source_key)
+)
+"""
+
+# Columns written per table, id first; "insert_only" columns are set on
+# insert and never overwritten by later syncs.
+TABLES = {
+    "courses": {"columns": ("id", "slug", "title", "description", "difficulty"), "insert_only": ("difficulty",)},
+    "chapters": {"columns": ("id", "course_id", "title", "order_index", "is_boss"), "insert_only": ()},
+    "lessons": {
+        "columns": ("id", "chapter_id", "title", "content_markdown", "starter_code", "solution_code",
+                    "order_index", "xp_reward"),
+        "insert_only": ("xp_reward",),
+    },
+}
+
+# entity -> source key -> (row values, hash)
+SourceRows = Dict[str, Dict[str, Tuple[Dict[str, Any], str]]]
+
+
+def row_hash(row: Dict[str, Any], table: str) -> str:
+    """Hash of the columns a sync owns (insert-only columns excluded)."""
+    owned = {key: value for key, value in row.items() if key not in TABLES[table]["insert_only"]}
+    return hashlib.sha1(json.dumps(owned, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def upsert_sql(table: str) -> str:
+    columns = TABLES[table]["columns"]
+    updates = ", ".join(
+        f"{column} = excluded.{column}"
+        for column in columns[1:]
+        if column not in TABLES[table]["insert_only"]
+    )
+    placeholders = ", ".join(f":{column}" for column in columns)
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}")
+
+
+def connect(path: Path = DB_PATH) -> sqlite3.Connection:
+    # Autocommit mode: transactions are opened explicitly with BEGIN
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(SYNC_STATE_SCHEMA)
+    ensure_search_index(conn)
+    return conn
+
+
+def load_sync_state(conn: sqlite3.Connection) -> Dict[str, Dict[str, Tuple[int, str]]]:
+    state: Dict[str, Dict[str, Tuple[int, str]]] = {table: {} for table in TABLES}
+    for entity, source_key, row_id, digest in conn.execute("SELECT entity, source_key, row_id, hash FROM sync_state"):
+        state.setdefault(entity, {})[source_key] = (row_id, digest)
+    return state
+
+
+def chapter_ids(conn: sqlite3.Connection, state: Dict[str, Dict[str, Tuple[int, str]]],
+                courses: Sequence[Tuple[int, str, Dict[str, Any]]]) -> Dict[str, int]:
+    """Map "<slug>/<chapter id>" to a chapters.id, reusing earlier mappings."""
+    course_ids = {slug: course_id for course_id, slug, _ in courses}
+    mapping = {key: row_id for key, (row_id, _) in state["chapters"].items()}
+    owners = dict(conn.execute("SELECT id, course_id FROM chapters"))
+    owners.update({row_id: course_ids.get(key.split("/")[0]) for key, row_id in mapping.items()})
+    next_id = max([0, *owners]) + 1
+
+    for course_id, slug, course in courses:
+        for chapter in course.get("chapters", []):
+            key = f"{slug}/{chapter['id']}"
+            if key in mapping:
+                continue
+            owner = owners.get(chapter["id"], course_id)
+            row_id = chapter["id"] if owner == course_id else next_id
+            mapping[key] = row_id
+            owners[row_id] = course_id
+            next_id = max(next_id, row_id + 1)
+    return mapping
+
+
+def has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is not None
+
+
+def progress_counts(conn: sqlite3.Connection, lesson_ids: Sequence[int]) -> Dict[int, int]:
+    """user_progress rows per lesson, for the lessons that have any."""
+    if not lesson_ids or not has_table(conn, "user_progress"):
+        return {}
+    placeholders = ", ".join("?" * len(lesson_ids))
+    return dict(conn.execute(
+        f"SELECT lesson_id, count(*) FROM user_progress WHERE lesson_id IN ({placeholders}) GROUP BY lesson_id",
+        list(lesson_ids),
+    ))
+
+
+def replaced_legacy_lessons(conn: sqlite3.Connection, state: Dict[str, Dict[str, Tuple[int, str]]],
+                            rows: SourceRows) -> List[int]:
+    """Ids of lesson rows no sync wrote that this sync overwrites with a differently titled lesson."""
+    synced_ids = {row_id for row_id, _ in state["lessons"].values()}
+    titles = {row["id"]: row["title"] for row, _ in rows["lessons"].values()}
+    return sorted(
+        row_id for row_id, title in conn.execute("SELECT id, title FROM lessons")
+        if row_id not in synced_ids and row_id in titles and title != titles[row_id]
+    )
+
+
+def build_rows(store: LessonStore, course_list: List[Dict[str, Any]], chapter_map: Dict[str, int],
+               courses: Sequence[Tuple[int, str, Dict[str, Any]]]) -> SourceRows:
+    """Rows every table should contain, keyed by entity and source key."""
+    rows: SourceRows = {table: {} for table in TABLES}
+
+    def add(table: str, key: str, row: Dict[str, Any]) -> None:
+        rows[table][key] = (row, row_hash(row, table))
+
+    for entry in course_list:
+        add("courses", entry["slug"], {
+            "id": entry["id"],
+            "slug": entry["slug"],
+            "title": entry["title"],
+            "description": entry.get("description"),
+            "difficulty": entry.get("difficulty", DEFAULT_DIFFICULTY),
+        })
+
+    placement: Dict[str, Tuple[int, int, bool]] = {}
+    for course_id, slug, course in courses:
+        for index, chapter in enumerate(course.get("chapters", []), start=1):
+            add("chapters", f"{slug}/{chapter['id']}", {
+                "id": chapter_map[f"{slug}/{chapter['id']}"],
+                "course_id": course_id,
+                "title": chapter["title"],
+                "order_index": index,
+                "is_boss": bool(chapter.get("is_boss")),
+            })
+        positions: Dict[int, int] = {}
+        for chapter, _, ref in iter_course_lessons(course):
+            lesson_id = str(ref["id"])
+            if lesson_id in placement:
+                continue
+            chapter_row = chapter_map[f"{slug}/{chapter['id']}"]
+            positions[chapter_row] = positions.get(chapter_row, 0) + 1
+            placement[lesson_id] = (chapter_row, positions[chapter_row], bool(chapter.get("is_boss")))
+
+    for lesson_id, lesson in store.lessons.items():
+        chapter_row, order_index, is_boss = placement.get(lesson_id, (None, None, False))
+        add("lessons", lesson_id, {
+            "id": int(lesson_id),
+            "chapter_id": chapter_row,
+            "title": lesson.get("title"),
+            "content_markdown": lesson.get("content"),
+            "starter_code": lesson.get("starter_code"),
+            "solution_code": lesson.get("solution_code"),
+            "order_index": order_index,
+            "xp_reward": BOSS_LESSON_XP if is_boss else LESSON_XP,
+        })
+    return rows
+
+
+def sync(conn: sqlite3.Connection, store: LessonStore, course_list: List[Dict[str, Any]],
+         dry_run: bool = False, clear_legacy_progress: bool = False) -> Dict[str, Dict[str, int]]:
+    """Bring the content tables in line with the data files; return per-table counts.
+
+    Raises ValueError, writing nothing, when legacy lessons with progress
+    would be replaced and ``clear_legacy_progress`` is not set.
+    """
+    state = load_sync_state(conn)
+    courses = [
+        (entry["id"], entry["slug"], store.courses[name])
+        for entry in course_list
+        for name, course in store.courses.items()
+        if course.get("id") == entry["id"]
+    ]
+    rows = build_rows(store, course_list, chapter_ids(conn, state, courses), courses)
+
+    stats: Dict[str, Dict[str, int]] = {}
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        legacy_progress = progress_counts(conn, replaced_legacy_lessons(conn, state, rows))
+        if legacy_progress and not clear_legacy_progress:
+            listed = ", ".join(f"{lesson_id} ({count})" for lesson_id, count in legacy_progress.items())
+            raise ValueError(
+                f"Legacy lessons with user_progress rows would be replaced by different lessons: {listed}. "
+                "Rerun with --clear-legacy-progress to delete that progress."
+            )
+        stats["user_progress"] = {"cleared": sum(legacy_progress.values())}
+        if legacy_progress and not dry_run:
+            conn.executemany("DELETE FROM user_progress WHERE lesson_id = ?",
+                             [(lesson_id,) for lesson_id in legacy_progress])
+
+        # Parents first so lessons never point at a chapter that is not there yet
+        for table in TABLES:
+            synced = state[table]
+            existing = {row_id for (row_id,) in conn.execute(f"SELECT id FROM {table}")}
+            changed = [
+                (key, row, digest)
+                for key, (row, digest) in rows[table].items()
+                if synced.get(key, (None, None)) != (row["id"], digest) or row["id"] not in existing
+            ]
+            stale = [(key, row_id) for key, (row_id, _) in synced.items() if key not in rows[table]]
+            # Lessons someone has progress on stay, still tracked, until that progress is gone
+            kept = progress_counts(conn, [row_id for _, row_id in stale]) if table == "lessons" else {}
+            stale = [(key, row_id) for key, row_id in stale if row_id not in kept]
+            stats[table] = {
+                "inserted": sum(row["id"] not in existing for _, row, _ in changed),
+                "updated": sum(row["id"] in existing for _, row, _ in changed),
+                "deleted": len(stale),
+                "kept": len(kept),
+                "unchanged": len(rows[table]) - len(changed),
+            }
+            if dry_run:
+                continue
+
+            conn.executemany(upsert_sql(table), [row for _, row, _ in changed])
+            conn.executemany(
+                "INSERT OR REPLACE INTO sync_state (entity, source_key, row_id, hash) VALUES (?, ?, ?, ?)",
+                [(table, key, row["id"], digest) for key, row, digest in changed],
+            )
+            conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(row_id,) for _, row_id in stale])
+            conn.executemany("DELETE FROM sync_state WHERE entity = ? AND source_key = ?",
+                             [(table, key) for key, _ in stale])
+        conn.execute("ROLLBACK" if dry_run else "COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return stats
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    dry_run = "--dry-run" in args
+    clear_legacy_progress = "--clear-legacy-progress" in args
+    paths = [arg for arg in args if not arg.startswith("--")]
+    db_path = Path(paths[0]) if paths else DB_PATH
+    if not db_path.exists():
+        raise SystemExit(f"Missing database at {db_path} (start the backend once to create it)")
+
+    store = LessonStore.load()
+    course_list = json.loads(COURSES_PATH.read_text())
+    conn = connect(db_path)
+    try:
+        stats = sync(conn, store, course_list, dry_run=dry_run, clear_legacy_progress=clear_legacy_progress)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    finally:
+        conn.close()
+
+    print(f"{'Would sync' if dry_run else 'Synced'} {db_path}:")
+    for table in TABLES:
+        counts = stats[table]
+        kept = f", kept {counts['kept']} with progress" if counts["kept"] else ""
+        print(f"  {table:<9} inserted {counts['inserted']:>4}, updated {counts['updated']:>4}, "
+              f"deleted {counts['deleted']:>4}, unchanged {counts['unchanged']:>4}{kept}")
+    if stats["user_progress"]["cleared"]:
+        print(f"  user_progress on replaced legacy lessons: {stats['user_progress']['cleared']} rows "
+              f"{'would be ' if dry_run else ''}cleared")
+
+
+if __name__ == "__main__":
+    main()
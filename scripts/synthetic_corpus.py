@@ -0,0 +1,356 @@
+"""
+Synthetic Curriculum Corpus
+
+Builds lessons.json, course-*.json and courses.json corpora at a multiple of
+the real corpus's size (10x, 100x, 1000x) for offline load testing: run any
+stage from the output directory (``cd /tmp/corpus-x100 && python
+~/repo/scripts/audit_engine.py``) or through benchmark.py --scale.
+
+Nothing is invented from scratch; every piece is learned from the real
+corpus, per curriculum:
+- course shape: each synthetic chapter repeats a real chapter's concept
+  groups and, within a group, its units (a lesson, or an R concept with the
+  reinforcers that follow it, as create_r_reinforcers_*.py lays them out:
+  concept_id * 10 + 1..4);
+- reinforcer titles: the role prefix real reinforcers use at each position
+  ("Analogy", "Variation", "Fix the Code", "Challenge") plus a real subtitle;
+- content: the REQUIRED_HEADERS sections from audit_engine.py, each present
+  as often as it is in the real curriculum (so the audits find about as
+  much), filled with real prose paragraphs, task statements, expected
+  outputs and "Common Mistake" code;
+- code: real example blocks fenced with the curriculum's usual language tag,
+  and real starter/solution pairs. Numbers in the code are re-drawn per
+  lesson (consistently between starter and solution), so lessons do not
+  all share the same few memoized code blocks.
+
+Lessons get ids in the extended range (lesson_store.EXTENDED_ID_BASE) and
+synthetic chapters ids from SYNTHETIC_CHAPTER_BASE up, so they can never
+collide with real ones. Generation is deterministic for a given --seed.
+lessons.json is written one lesson at a time in the canonical indent=2
+format, so even 1000x never holds the whole corpus in memory.
+
+Usage:
+    python scripts/synthetic_corpus.py --scale 10 --out /tmp/corpus-x10
+    python scripts/synthetic_corpus.py --scale 1000 --out /tmp/corpus-x1000 --seed 7
+"""
+
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from audit_engine import REQUIRED_HEADERS
+from lesson_sections import lesson_outline
+from lesson_store import (
+    COURSE_PATHS, CURRICULA, DATA_DIR, EXTENDED_ID_BASE, LESSONS_PATH, Lesson, LessonStore, is_reinforcer_id,
+    iter_course_lessons,
+)
+from lesson_stream import write_lessons
+
+SYNTHETIC_CHAPTER_BASE = 100_000
+DEFAULT_SEED = 0
+COURSES_PATH = DATA_DIR / "courses.json"
+
+NUMBER_RE = re.compile(r"\b\d+\b")
+EMOJI_RE = re.compile(r"^([^\w\s`*#]+)\s")
+# Prose paragraphs worth reusing: plain text, not tables, lists, images or HTML
+PROSE_SKIP = ("#", "|", "!", "<", "-", "*", ">", "1.", "`")
+MIN_PARAGRAPH, MAX_PARAGRAPH = 40, 600
+
+Unit = int  # lessons in one unit: 1, or 1 + reinforcers for an R concept
+Group = Tuple[Optional[str], str, List[Unit]]  # (concept name, icon, units)
+
+
+def paragraphs(text: str) -> Iterator[str]:
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if MIN_PARAGRAPH <= len(paragraph) <= MAX_PARAGRAPH and not paragraph.startswith(PROSE_SKIP):
+            yield paragraph
+
+
+def first_paragraph(text: str) -> Optional[str]:
+    return next(paragraphs(text), None)
+
+
+class CurriculumTemplates:
+    """What lessons and courses in one curriculum look like, learned from the real corpus."""
+
+    def __init__(self, store: LessonStore, curriculum: str):
+        self.curriculum = curriculum
+        self.course = {key: value for key, value in store.courses[curriculum].items() if key != "chapters"}
+        self.chapters: List[Dict[str, Any]] = []
+        self.titles: List[str] = []
+        self.roles: Dict[int, str] = {}
+        self.subtitles: Dict[int, List[str]] = {}
+        self.prose: List[str] = []
+        self.tasks: List[str] = []
+        self.expected: List[str] = []
+        self.examples: List[str] = []
+        self.mistakes: List[str] = []
+        self.code_pairs: List[Tuple[str, str]] = []
+        self.tag_sets: List[List[str]] = []
+        self.emojis: List[str] = []
+        self.header_rates: Dict[str, float] = {}
+        self.fence = curriculum
+
+        self._learn_courses(store)
+        self._learn_lessons(store)
+
+    def _learn_courses(self, store: LessonStore) -> None:
+        for chapter in store.courses[self.curriculum].get("chapters", []):
+            groups: List[Group] = []
+            grouped = "concepts" in chapter
+            for group in (chapter.get("concepts", []) if grouped else [chapter]):
+                # A concept brings its reinforcers along whether or not the course lists them
+                units: List[Unit] = [
+                    1 + len(store.reinforcers.get(lesson_ref["id"], []))
+                    for lesson_ref in group.get("lessons", [])
+                    if not is_reinforcer_id(lesson_ref["id"])
+                ]
+                if units:
+                    groups.append((group.get("name"), group.get("icon", ""), units))
+            if groups:
+                self.chapters.append({"title": chapter["title"], "icon": chapter.get("icon", ""),
+                                      "is_boss": chapter.get("is_boss", False), "grouped": grouped,
+                                      "groups": groups})
+
+        role_counts: Dict[int, Dict[str, int]] = {}
+        for concept_id, reinforcer_ids in store.reinforcers.items():
+            for reinforcer_id in reinforcer_ids:
+                lesson = store.lessons[str(reinforcer_id)]
+                role, _, subtitle = lesson.get("title", "").partition(":")
+                position = reinforcer_id % 10
+                counts = role_counts.setdefault(position, {})
+                counts[role] = counts.get(role, 0) + 1
+                if subtitle.strip():
+                    self.subtitles.setdefault(position, []).append(subtitle.strip())
+        self.roles = {position: max(counts, key=counts.get) for position, counts in role_counts.items()}
+
+    def _learn_lessons(self, store: LessonStore) -> None:
+        languages: Dict[str, int] = {}
+        headers = {header: 0 for header in REQUIRED_HEADERS}
+        count = 0
+        for lesson_id, lesson in store.curriculum_lessons(self.curriculum):
+            count += 1
+            sections = lesson_outline(lesson)
+            if not is_reinforcer_id(lesson_id) and lesson.get("title"):
+                self.titles.append(lesson["title"])
+            for header in REQUIRED_HEADERS:
+                headers[header] += sections.has(header)
+            for block in sections.code_blocks:
+                if block.language:
+                    languages[block.language] = languages.get(block.language, 0) + 1
+            self.prose.extend(paragraphs(sections.prose))
+
+            heading = sections.sections[0].title if sections.sections else ""
+            emoji = EMOJI_RE.match(heading)
+            if emoji:
+                self.emojis.append(emoji.group(1))
+
+            task = sections.find("your task")
+            if task is not None:
+                statement = first_paragraph(lesson["content"][task.body_start:task.end])
+                if statement:
+                    self.tasks.append(statement)
+            label = sections.find_label("expected output")
+            if label is not None:
+                after = lesson["content"][label.start:].split("\n", 1)[-1]
+                expected = after.split("\n\n", 1)[0].strip()
+                if expected and not expected.startswith(("#", "```")):
+                    self.expected.append(expected)
+
+            for section in sections.sections:
+                target = self.mistakes if "mistake" in section.key else self.examples
+                target.extend(block.code for block in section.code_blocks
+                              if block.code.strip() and block.language in ("", self.curriculum))
+
+            starter, solution = lesson.get("starter_code") or "", lesson.get("solution_code") or ""
+            if solution.strip():
+                self.code_pairs.append((starter, solution))
+            if lesson.get("concept_tags"):
+                self.tag_sets.append(list(lesson["concept_tags"]))
+
+        self.header_rates = {header: hits / count for header, hits in headers.items()} if count else {}
+        if languages:
+            self.fence = max(languages, key=languages.get)
+        self.mistakes = self.mistakes or self.examples
+
+
+def redraw_numbers(code: str, numbers: Dict[str, str], rng: random.Random) -> str:
+    """Replace each integer literal, reusing ``numbers`` so paired code stays consistent."""
+    def replace(match: "re.Match[str]") -> str:
+        text = match.group()
+        if text not in numbers:
+            value = int(text)
+            numbers[text] = str(rng.randint(1, max(9, value * 2)))
+        return numbers[text]
+    return NUMBER_RE.sub(replace, code)
+
+
+class SyntheticCorpus:
+    """Course skeletons planned up front; lesson bodies generated lazily from them."""
+
+    def __init__(self, store: LessonStore, scale: int, seed: int = DEFAULT_SEED):
+        self.scale = scale
+        self.seed = seed
+        self.templates = {curriculum: CurriculumTemplates(store, curriculum) for curriculum in CURRICULA}
+        self.targets = {curriculum: len(store.by_curriculum[curriculum]) * scale for curriculum in CURRICULA}
+        # lesson id -> (curriculum, chapter id, chapter title, reinforcer position or 0)
+        self.placement: Dict[int, Tuple[str, int, str, int]] = {}
+        self.titles: Dict[int, str] = {}
+        self.courses = {curriculum: self._plan_course(curriculum) for curriculum in CURRICULA}
+
+    def _plan_course(self, curriculum: str) -> Dict[str, Any]:
+        templates = self.templates[curriculum]
+        rng = random.Random(f"{self.seed}:course:{curriculum}")
+        prefix = (CURRICULA.index(curriculum) + 1) * EXTENDED_ID_BASE
+        chapter_base = (CURRICULA.index(curriculum) + 1) * SYNTHETIC_CHAPTER_BASE
+        next_id = 0
+        planned = 0
+        chapters = []
+        while planned < self.targets[curriculum] and templates.chapters:
+            shape = templates.chapters[len(chapters) % len(templates.chapters)]
+            chapter_id = chapter_base + len(chapters)
+            title = f"{shape['title']} ({len(chapters) // len(templates.chapters) + 1})"
+            groups = []
+            for name, icon, units in shape["groups"]:
+                refs = []
+                for unit in units:
+                    lesson_id = prefix + next_id
+                    next_id += 1
+                    ids = [lesson_id] + [lesson_id * 10 + position for position in range(1, unit)]
+                    for position, member_id in enumerate(ids):
+                        self.placement[member_id] = (curriculum, chapter_id, title, position)
+                        self.titles[member_id] = self._title(curriculum, position, rng)
+                        refs.append({"id": member_id, "title": self.titles[member_id], "order": len(refs) + 1})
+                planned += len(refs)
+                groups.append({"name": name, "icon": icon, "lessons": refs})
+            chapter = {"id": chapter_id, "title": title, "icon": shape["icon"], "is_boss": shape["is_boss"]}
+            if shape["grouped"]:
+                chapter["concepts"] = groups
+            else:
+                chapter["lessons"] = [ref for group in groups for ref in group["lessons"]]
+            chapters.append(chapter)
+        return {**templates.course, "chapters": chapters}
+
+    def _title(self, curriculum: str, position: int, rng: random.Random) -> str:
+        templates = self.templates[curriculum]
+        if position:
+            role = templates.roles.get(position, "Practice")
+            subtitles = templates.subtitles.get(position) or templates.titles
+            return f"{role}: {rng.choice(subtitles)}"
+        return rng.choice(templates.titles)
+
+    def _content(self, templates: CurriculumTemplates, title: str, example: str, solution: str,
+                 rng: random.Random) -> str:
+        def include(header: str) -> bool:
+            return rng.random() < templates.header_rates.get(header, 1.0)
+
+        fence = templates.fence
+        emoji = rng.choice(templates.emojis) if templates.emojis else "📘"
+        parts = [f"# {emoji} {title}\n\n{rng.choice(templates.prose)}\n"]
+        if include("What You'll Learn"):
+            parts.append(f"## What You'll Learn\n{rng.choice(templates.prose)}\n")
+        if include("Why This Matters"):
+            parts.append(f"## Why This Matters\n{rng.choice(templates.prose)}\n")
+        heading = "## Example\n\n" if include("Example") else ""
+        parts.append(f"{heading}```{fence}\n{example.rstrip()}\n```\n\n{rng.choice(templates.prose)}\n")
+        if include("Your Task"):
+            task = rng.choice(templates.tasks) if templates.tasks else rng.choice(templates.prose)
+            parts.append(f"## 🎯 Your Task\n\n{task}\n")
+        if include("Expected Output") and templates.expected:
+            parts.append(f"**Expected Output:**\n{rng.choice(templates.expected)}\n")
+        if include("Common Mistake"):
+            wrong = rng.choice(templates.mistakes)
+            parts.append(f"## ⚠️ Common Mistake\n\n**Wrong:**\n```{fence}\n{wrong.rstrip()}\n```\n"
+                         f"{rng.choice(templates.prose)}\n\n**Fixed:**\n```{fence}\n{solution.rstrip()}\n```\n")
+        if include("No Hidden Prerequisites"):
+            parts.append("---\n\n✅ **No Hidden Prerequisites**: Uses only what earlier lessons introduced.\n")
+        return "\n".join(parts)
+
+    def lesson(self, lesson_id: int) -> Lesson:
+        curriculum, chapter_id, chapter_title, position = self.placement[lesson_id]
+        templates = self.templates[curriculum]
+        rng = random.Random(f"{self.seed}:{lesson_id}")
+        numbers: Dict[str, str] = {}
+        starter, solution = rng.choice(templates.code_pairs)
+        starter, solution = redraw_numbers(starter, numbers, rng), redraw_numbers(solution, numbers, rng)
+        example = redraw_numbers(rng.choice(templates.examples), numbers, rng)
+        lesson: Lesson = {
+            "id": lesson_id,
+            "title": self.titles[lesson_id],
+            "content": self._content(templates, self.titles[lesson_id], example, solution, rng),
+            "starter_code": starter,
+            "solution_code": solution,
+            "chapter_id": chapter_id,
+            "chapter_title": chapter_title,
+            "concept_tags": list(rng.choice(templates.tag_sets)) if templates.tag_sets else [],
+        }
+        if position and templates.expected:
+            lesson["expected_output"] = rng.choice(templates.expected)
+        return lesson
+
+    def lessons(self) -> Iterator[Tuple[str, Lesson]]:
+        """(id, lesson) for every planned lesson, built one at a time."""
+        for curriculum in CURRICULA:
+            for _, _, lesson_ref in iter_course_lessons(self.courses[curriculum]):
+                yield str(lesson_ref["id"]), self.lesson(lesson_ref["id"])
+
+    def __len__(self) -> int:
+        return len(self.placement)
+
+
+def write_corpus(root: Path, corpus: SyntheticCorpus, courses_index: Optional[List[Dict[str, Any]]] = None) -> None:
+    """Write the corpus under ``root`` laid out like the repo (frontend/public/data/...).
+
+    scripts/ is created empty for the reports stages write there.
+    """
+    (root / DATA_DIR).mkdir(parents=True, exist_ok=True)
+    (root / "scripts").mkdir(exist_ok=True)
+    write_lessons(root / LESSONS_PATH, corpus.lessons())
+    for curriculum, path in COURSE_PATHS.items():
+        (root / path).write_text(json.dumps(corpus.courses[curriculum], indent=2, ensure_ascii=False))
+    if courses_index is not None:
+        # course-<slug>.json
+        by_slug = {path.stem[len("course-"):]: corpus.courses[curriculum] for curriculum, path in COURSE_PATHS.items()}
+        index = []
+        for entry in courses_index:
+            course = by_slug.get(entry.get("slug"))
+            if course is not None:
+                lesson_count = sum(1 for _ in iter_course_lessons(course))
+                entry = {**entry, "chapters_count": len(course["chapters"]), "lessons_count": lesson_count}
+            index.append(entry)
+        (root / COURSES_PATH).write_text(json.dumps(index, indent=2, ensure_ascii=False))
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    scale = int(args[args.index("--scale") + 1]) if "--scale" in args else 10
+    seed = int(args[args.index("--seed") + 1]) if "--seed" in args else DEFAULT_SEED
+    if "--out" not in args:
+        raise SystemExit("Usage: python scripts/synthetic_corpus.py --scale N --out DIR [--seed N]")
+    root = Path(args[args.index("--out") + 1])
+
+    store = LessonStore.load()
+    started = time.perf_counter()
+    corpus = SyntheticCorpus(store, scale, seed)
+    courses_index = json.loads(COURSES_PATH.read_text()) if COURSES_PATH.exists() else None
+    write_corpus(root, corpus, courses_index)
+
+    print("=" * 60)
+    print(f"SYNTHETIC CORPUS x{scale}")
+    print("=" * 60)
+    for curriculum in CURRICULA:
+        planned = sum(1 for placement in corpus.placement.values() if placement[0] == curriculum)
+        chapters = len(corpus.courses[curriculum]["chapters"])
+        print(f"  {curriculum:<7} {planned:>7} lessons in {chapters:>5} chapters "
+              f"(fence {corpus.templates[curriculum].fence!r})")
+    size_mb = (root / LESSONS_PATH).stat().st_size / (1024 * 1024)
+    print(f"\n{len(corpus)} lessons ({size_mb:.1f} MB) in {time.perf_counter() - started:.2f}s -> {root / DATA_DIR}")
+
+
+if __name__ == "__main__":
+    main()
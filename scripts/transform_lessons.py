@@ -5,9 +5,11 @@ This script processes lessons.json and injects interactive component tags
 into lessons that don't already have them.
 """
 
-import json
 from pathlib import Path
 
+from lesson_sections import insert_at, outline
+from lesson_stream import iter_lessons, write_lessons
+
 INTERACTIVE_TAGS = ['<variableslider', '<draggablevaluebox', '<livecodeblock', '<parsonspuzzle', '<visualtable']
 
 def get_language_from_lesson_id(lesson_id: str) -> str:
@@ -32,64 +34,65 @@ Run this example to see how it works:
 
 '''
     
-    # Find the best insertion point
-    if '## 🎯 Your Task' in content:
-        insert_point = content.find('## 🎯 Your Task')
-        return content[:insert_point] + interactive_section + content[insert_point:]
-    elif '## Your Task' in content:
-        insert_point = content.find('## Your Task')
-        return content[:insert_point] + interactive_section + content[insert_point:]
-    elif '---' in content:
-        # Insert before the last horizontal rule
-        last_hr = content.rfind('---')
-        return content[:last_hr] + interactive_section + content[last_hr:]
-    else:
-        # Just append at the end
-        return content + interactive_section
+    # Insert before the task section, else before the last horizontal rule
+    sections = outline(content)
+    insert_point = sections.position_of('your task')
+    if insert_point is None:
+        insert_point = sections.last_rule()
+    return insert_at(content, insert_point, interactive_section)
+
+def transform_lesson(lesson_id: str, lesson_data: dict, stats: dict) -> dict:
+    """Inject an interaction into one lesson unless it already has one."""
+    try:
+        content = lesson_data.get('content', '')
+        
+        # Skip if already has interactive components
+        if any(tag in content.lower() for tag in INTERACTIVE_TAGS):
+            stats['skipped'] += 1
+            return lesson_data
+        
+        # Determine language
+        language = get_language_from_lesson_id(lesson_id)
+        
+        # Transform content
+        new_content = inject_interaction(content, language)
+        
+        if new_content != content:
+            lesson_data['content'] = new_content
+            lesson_data['interaction_required'] = True
+            stats['transformed'] += 1
+            print(f"✅ Transformed lesson {lesson_id}: {lesson_data.get('title', 'Unknown')}")
+        else:
+            stats['skipped'] += 1
+            
+    except Exception as e:
+        stats['errors'] += 1
+        print(f"❌ Error in lesson {lesson_id}: {e}")
+    return lesson_data
 
 def transform_lessons(input_path: str, output_path: str = None, dry_run: bool = True):
-    """Transform all lessons to include interactive components."""
+    """Transform all lessons to include interactive components.
     
-    with open(input_path, 'r') as f:
-        lessons = json.load(f)
+    Lessons are read and written one at a time (lesson_stream.py), so only
+    one lesson is in memory at once; output_path may be input_path.
+    """
     
     stats = {'transformed': 0, 'skipped': 0, 'errors': 0}
-    
-    for lesson_id, lesson_data in lessons.items():
-        try:
-            content = lesson_data.get('content', '')
-            
-            # Skip if already has interactive components
-            if any(tag in content.lower() for tag in INTERACTIVE_TAGS):
-                stats['skipped'] += 1
-                continue
-            
-            # Determine language
-            language = get_language_from_lesson_id(lesson_id)
-            
-            # Transform content
-            new_content = inject_interaction(content, language)
-            
-            if new_content != content:
-                lessons[lesson_id]['content'] = new_content
-                lessons[lesson_id]['interaction_required'] = True
-                stats['transformed'] += 1
-                print(f"✅ Transformed lesson {lesson_id}: {lesson_data.get('title', 'Unknown')}")
-            else:
-                stats['skipped'] += 1
-                
-        except Exception as e:
-            stats['errors'] += 1
-            print(f"❌ Error in lesson {lesson_id}: {e}")
+    transformed = (
+        (lesson_id, transform_lesson(lesson_id, lesson_data, stats))
+        for lesson_id, lesson_data in iter_lessons(Path(input_path))
+    )
     
     # Write output
     if not dry_run and output_path:
-        with open(output_path, 'w') as f:
-            json.dump(lessons, f, indent=2, ensure_ascii=False)
+        write_lessons(Path(output_path), transformed)
         print(f"\n✅ Written to {output_path}")
+    else:
+        for _ in transformed:
+            pass
     
     print(f"\n📊 Stats: {stats}")
-    return lessons, stats
+    return stats
 
 if __name__ == '__main__':
     import sys
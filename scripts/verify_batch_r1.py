@@ -2,12 +2,12 @@
 Final verification with improved token extractor
 """
 
-import json
-import re
+from code_tokens import content_code, function_calls, significant_tokens
+from lesson_sections import outline
+from lesson_store import LessonStore
 
 # Load lessons
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+lessons = LessonStore.load().lessons
 
 BATCH_R1 = {
     2002: [20021, 20022, 20023, 20024],
@@ -31,6 +31,9 @@ R_FUNCTIONS = {
     'arrange', 'desc', 'if_else', 'case_when', 'pivot_longer', 'pivot_wider',
 }
 
+# Operators reported as tokens
+TOKEN_OPERATORS = {'%>%', '<-', '$'}
+
 KNOWN_DATASETS = {'penguins', 'mpg', 'diamonds', 'table4a', 'flights', 'starwars'}
 
 REQUIRED_HEADERS = [
@@ -40,27 +43,23 @@ REQUIRED_HEADERS = [
 
 def extract_tokens(text):
     tokens = set()
-    func_matches = re.findall(r'\b([a-z_][a-z0-9_]*)\s*\(', text, re.IGNORECASE)
-    for f in func_matches:
-        if f.lower() in R_FUNCTIONS:
-            tokens.add(f.lower() + '()')
-    for ds in KNOWN_DATASETS:
-        if re.search(rf'\b{ds}\b', text, re.IGNORECASE):
-            tokens.add(ds)
-    if '%>%' in text:
-        tokens.add('%>%')
-    if '<-' in text:
-        tokens.add('<-')
-    if '$' in text:
-        tokens.add('$')
+    for language, code in content_code(text, 'r'):
+        if language != 'r':
+            continue
+        for name in function_calls('r', code):
+            if name.lower() in R_FUNCTIONS:
+                tokens.add(name.lower() + '()')
+        for kind, value in significant_tokens('r', code):
+            if kind == 'name' and value.lower() in KNOWN_DATASETS:
+                tokens.add(value.lower())
+            elif kind == 'keyword' and value in R_FUNCTIONS:
+                tokens.add(value + '()')
+            elif kind == 'op' and value in TOKEN_OPERATORS:
+                tokens.add(value)
     return tokens
 
 def check_headers(content):
-    missing = []
-    for h in REQUIRED_HEADERS:
-        if h not in content:
-            missing.append(h)
-    return missing
+    return outline(content).missing(REQUIRED_HEADERS)
 
 def has_pipe_bridge(content):
     """Check if content has pipe micro-bridge."""
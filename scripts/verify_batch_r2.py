@@ -2,11 +2,11 @@
 Batch R-2 Verification Script
 """
 
-import json
-import re
+from code_tokens import content_code, function_calls, significant_tokens
+from lesson_sections import outline
+from lesson_store import LessonStore
 
-with open('frontend/public/data/lessons.json', 'r') as f:
-    lessons = json.load(f)
+lessons = LessonStore.load().lessons
 
 BATCH_R2 = {
     2230: [22301, 22302, 22303, 22304],
@@ -35,33 +35,30 @@ R_FUNCTIONS = {
     'library', 'tibble', 'c', 'paste', 'round', 'nrow'
 }
 
+# Operators reported as tokens; [[ is printed as [[]]
+TOKEN_OPERATORS = {'%>%', '<-', '$', '[['}
+
 KNOWN_DATASETS = {'penguins', 'mtcars', 'band_members', 'band_instruments'}
 
 def extract_tokens(text):
     tokens = set()
-    func_matches = re.findall(r'\b([a-z_][a-z0-9_]*)\s*\(', text, re.IGNORECASE)
-    for f in func_matches:
-        if f.lower() in R_FUNCTIONS:
-            tokens.add(f.lower() + '()')
-    for ds in KNOWN_DATASETS:
-        if re.search(rf'\b{ds}\b', text, re.IGNORECASE):
-            tokens.add(ds)
-    if '%>%' in text:
-        tokens.add('%>%')
-    if '<-' in text:
-        tokens.add('<-')
-    if '$' in text:
-        tokens.add('$')
-    if '[[' in text:
-        tokens.add('[[]]')
+    for language, code in content_code(text, 'r'):
+        if language != 'r':
+            continue
+        for name in function_calls('r', code):
+            if name.lower() in R_FUNCTIONS:
+                tokens.add(name.lower() + '()')
+        for kind, value in significant_tokens('r', code):
+            if kind == 'name' and value.lower() in KNOWN_DATASETS:
+                tokens.add(value.lower())
+            elif kind == 'keyword' and value in R_FUNCTIONS:
+                tokens.add(value + '()')
+            elif kind == 'op' and value in TOKEN_OPERATORS:
+                tokens.add('[[]]' if value == '[[' else value)
     return tokens
 
 def check_headers(content):
-    missing = []
-    for h in REQUIRED_HEADERS:
-        if h not in content:
-            missing.append(h)
-    return missing
+    return outline(content).missing(REQUIRED_HEADERS)
 
 def detect_role(title):
     title_lower = title.lower()
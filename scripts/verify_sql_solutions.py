@@ -0,0 +1,259 @@
+"""
+SQL Solution Verifier
+
+Runs every SQL lesson's solution_code (ids 1000-1999) against the fixture
+database from sql_fixtures.py and stores a fingerprint of its result on the
+lesson, so answers can be compared by result set instead of by the
+normalized-string matching in frontend/src/utils/verifier.ts.
+
+The fixture is built once and serialized; each worker process receives the
+bytes once and deserializes a private in-memory copy per lesson, so
+solutions that INSERT, UPDATE or CREATE never see each other's changes.
+Solutions that create their own schema run on an empty database instead.
+
+Stored on the lesson as ``sql_result``:
+- kind "query": the last statement that returned rows; the fingerprint
+  hashes its row values (numbers as rounded floats, so 3 and 3.0 agree;
+  column names are left out because aliases vary). Rows are compared in
+  order only when the query has a top-level ORDER BY.
+- kind "tables": for solutions that only modify data or schema, the
+  fingerprint of the final contents, columns and indexes of every table
+  they wrote to.
+
+Solutions that fail on SQLite (PostgreSQL-only syntax, tables the fixture
+lacks) keep no fingerprint and are listed in
+scripts/sql_verify_report.json.
+
+Usage:
+    python scripts/verify_sql_solutions.py             # all SQL lessons
+    python scripts/verify_sql_solutions.py 1026 1051   # selected lessons
+    python scripts/verify_sql_solutions.py --dry-run   # report only, leave lessons.json
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from lesson_patches import PatchSet, apply_patch_sets
+from lesson_store import LessonStore
+from sql_fixtures import build_template, clone_template, connect_empty
+
+REPORT_PATH = Path("scripts/sql_verify_report.json")
+RESULT_FIELD = "sql_result"
+HASH_LENGTH = 16
+FLOAT_DIGITS = 6
+TIMEOUT_SECONDS = 2.0
+PREVIEW_ROWS = 20
+
+WRITE_ACTIONS = {
+    sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE, sqlite3.SQLITE_CREATE_TABLE,
+    sqlite3.SQLITE_CREATE_VIEW, sqlite3.SQLITE_ALTER_TABLE, sqlite3.SQLITE_CREATE_INDEX,
+}
+PARENS_RE = re.compile(r"\([^()]*\)")
+ORDER_BY_RE = re.compile(r"\border\s+by\b", re.IGNORECASE)
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+EXTRACT_RE = re.compile(r"\bEXTRACT\s*\(\s*(\w+)\s+FROM\s+", re.IGNORECASE)
+CAST_SUFFIX_RE = re.compile(r"::\w+(?:\(\d+(?:,\s*\d+)?\))?")
+
+_TEMPLATE: Optional[bytes] = None
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a script into complete statements (quotes, comments and triggers respected)."""
+    statements: List[str] = []
+    buffer = ""
+    for piece in sql.split(";"):
+        buffer += piece + ";"
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer)
+            buffer = ""
+    if COMMENT_RE.sub("", buffer).strip(" \n\t;"):
+        statements.append(buffer.rstrip(";"))
+    return [statement for statement in statements if COMMENT_RE.sub("", statement).strip(" \n\t;")]
+
+
+def translate(sql: str) -> str:
+    """Rewrite the PostgreSQL syntax sql_fixtures has stand-ins for."""
+    return CAST_SUFFIX_RE.sub("", EXTRACT_RE.sub(r"EXTRACT('\1', ", sql))
+
+
+def is_ordered(query: str) -> bool:
+    """True if ``query`` has an ORDER BY outside any parentheses (i.e. not in OVER/subqueries)."""
+    text = STRING_RE.sub("''", COMMENT_RE.sub("", query))
+    previous = None
+    while previous != text:
+        previous, text = text, PARENS_RE.sub("", text)
+    return bool(ORDER_BY_RE.search(text))
+
+
+def normalize_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return round(float(value), FLOAT_DIGITS)
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def fingerprint_rows(rows: Iterable[Sequence[Any]], ordered: bool) -> str:
+    normalized = [[normalize_value(value) for value in row] for row in rows]
+    if not ordered:
+        normalized.sort(key=lambda row: json.dumps(row, sort_keys=True, default=str))
+    payload = json.dumps(normalized, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def table_schema(conn: sqlite3.Connection, table: str) -> List[Any]:
+    """Column names/types and index definitions, so DDL-only solutions are told apart."""
+    columns = [[row[1], row[2].upper()] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    indexes = sorted(
+        [[row[1] for row in conn.execute(f'PRAGMA index_info("{index[1]}")')], index[2]]
+        for index in conn.execute(f'PRAGMA index_list("{table}")')
+    )
+    return [columns, indexes]
+
+
+def init_worker(template: bytes) -> None:
+    global _TEMPLATE
+    _TEMPLATE = template
+
+
+def verify_solution(job: Tuple[str, str]) -> Dict[str, Any]:
+    """Run one solution on a fresh copy of the fixture; return its result record.
+
+    Solutions that create a table the fixture already has (schema lessons)
+    are re-run on an empty database.
+    """
+    lesson_id, sql = job
+    record = run_solution(lesson_id, sql, clone_template(_TEMPLATE))
+    if record["status"] == "error" and re.fullmatch(r"table \S+ already exists", record["error"]):
+        record = run_solution(lesson_id, sql, connect_empty())
+    return record
+
+
+def run_solution(lesson_id: str, sql: str, conn: sqlite3.Connection) -> Dict[str, Any]:
+    written: Set[str] = set()
+
+    def authorize(action: int, arg1: Optional[str], arg2: Optional[str], *_: Any) -> int:
+        # CREATE INDEX names the index first and its table second
+        table = arg2 if action == sqlite3.SQLITE_CREATE_INDEX else arg1
+        if action in WRITE_ACTIONS and table and not table.startswith("sqlite_"):
+            written.add(table)
+        return sqlite3.SQLITE_OK
+
+    deadline = time.perf_counter() + TIMEOUT_SECONDS
+    conn.set_authorizer(authorize)
+    conn.set_progress_handler(lambda: int(time.perf_counter() > deadline), 10000)
+
+    started = time.perf_counter()
+    last_query: Optional[Tuple[str, List[str], List[Tuple[Any, ...]]]] = None
+    try:
+        for statement in split_statements(translate(sql)):
+            cursor = conn.execute(statement)
+            if cursor.description is not None:
+                last_query = (statement, [column[0] for column in cursor.description], cursor.fetchall())
+        conn.set_authorizer(None)
+        seconds = time.perf_counter() - started
+
+        preview: List[List[Any]] = []
+        if last_query is not None:
+            statement, columns, rows = last_query
+            ordered = is_ordered(statement)
+            result = {"kind": "query", "fingerprint": fingerprint_rows(rows, ordered), "columns": columns,
+                      "row_count": len(rows), "ordered": ordered}
+            preview = [list(row) for row in rows[:PREVIEW_ROWS]]
+        elif written:
+            tables = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (%s) ORDER BY name"
+                % ", ".join("?" for _ in written), sorted(written))]
+            rows = [[table, *row] for table in tables for row in conn.execute(f'SELECT * FROM "{table}"')]
+            schemas = [[table, "schema", table_schema(conn, table)] for table in tables]
+            result = {"kind": "tables", "fingerprint": fingerprint_rows(rows + schemas, ordered=False),
+                      "tables": tables, "row_count": len(rows)}
+        else:
+            return {"lesson_id": lesson_id, "status": "no_result"}
+    except sqlite3.Error as exc:
+        message = "timed out" if str(exc) == "interrupted" else str(exc)
+        return {"lesson_id": lesson_id, "status": "error", "error": message}
+    finally:
+        conn.close()
+    return {"lesson_id": lesson_id, "status": "ok", "seconds": round(seconds, 5), "result": result, "preview": preview}
+
+
+def verify_solutions(store: LessonStore, lesson_ids: Optional[Iterable[int]] = None,
+                     max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Verify the selected SQL lessons (default: all) in a process pool."""
+    selected = set(lesson_ids) if lesson_ids is not None else None
+    jobs = [
+        (str(lesson_id), lesson["solution_code"])
+        for lesson_id, lesson in store.curriculum_lessons("sql")
+        if lesson.get("solution_code") and (selected is None or lesson_id in selected)
+    ]
+    template = build_template().serialize()
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(template,)) as pool:
+        return list(pool.map(verify_solution, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def result_patches(store: LessonStore, records: List[Dict[str, Any]]) -> PatchSet:
+    """Patch only the lessons whose stored result changes."""
+    patches = PatchSet("verify_sql_solutions")
+    for record in records:
+        lesson = store.lessons[record["lesson_id"]]
+        result = record.get("result")
+        if lesson.get(RESULT_FIELD) == result:
+            continue
+        updated = {key: value for key, value in lesson.items() if key != RESULT_FIELD}
+        if result is not None:
+            updated[RESULT_FIELD] = result
+        patches.set(record["lesson_id"], updated)
+    return patches
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    dry_run = "--dry-run" in args
+    lesson_ids = [int(arg) for arg in args if not arg.startswith("--")] or None
+
+    store = LessonStore.load()
+    started = time.perf_counter()
+    records = verify_solutions(store, lesson_ids)
+    elapsed = time.perf_counter() - started
+
+    by_status: Dict[str, int] = {}
+    errors: Dict[str, List[str]] = {}
+    for record in records:
+        by_status[record["status"]] = by_status.get(record["status"], 0) + 1
+        if record["status"] == "error":
+            errors.setdefault(record["error"], []).append(record["lesson_id"])
+    REPORT_PATH.write_text(json.dumps({
+        "summary": {"total": len(records), "by_status": by_status},
+        "errors": [{"error": error, "lesson_ids": ids} for error, ids in sorted(errors.items(), key=lambda e: -len(e[1]))],
+    }, indent=2))
+
+    patches = result_patches(store, records)
+    if len(patches) and not dry_run:
+        apply_patch_sets([patches])
+
+    print("=" * 60)
+    print("SQL SOLUTION VERIFICATION")
+    print("=" * 60)
+    for status, count in sorted(by_status.items()):
+        print(f"  {status:<10} {count}")
+    for error, ids in sorted(errors.items(), key=lambda e: -len(e[1]))[:15]:
+        print(f"  ✗ {len(ids):>3}  {error}  ({', '.join(ids[:6])}{', …' if len(ids) > 6 else ''})")
+    print(f"\nVerified {len(records)} solutions in {elapsed:.2f}s; "
+          f"{len(patches)} lessons {'would change' if dry_run else 'updated'} -> {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Tests for scripts/lesson_stream.py: chunked decoding and the writer's formatting."""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from lesson_stream import _JsonStream, iter_lessons, write_lessons  # noqa: E402
+
+LESSONS = {
+    "1": {"id": 1, "title": "Välkommen", "score": 12.5, "tags": ["a", "b"], "meta": {"deep": [{"x": [1, [2, 3]]}]}},
+    "2": {"id": 2, "title": "Numbers", "values": [0, -1, 1e-07, 123456789, 3.14159], "flag": None, "ok": True},
+    "10": {"id": 10, "title": "Escapes \" \\ } ] ,", "code": "print({'a': 1})\n"},
+}
+
+
+class JsonStreamTest(unittest.TestCase):
+    def decode_all(self, text, chunk_size):
+        stream = _JsonStream(io.StringIO(text), chunk_size)
+        values = []
+        while stream.peek():
+            values.append(stream.value())
+        return values
+
+    def test_values_at_every_chunk_boundary(self):
+        text = ' 12.5 "ab" [1, {"k": [2.25, null]}] true -7e3 {} '
+        expected = [12.5, "ab", [1, {"k": [2.25, None]}], True, -7e3, {}]
+        for chunk_size in range(1, len(text) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.decode_all(text, chunk_size), expected)
+
+    def test_number_cut_at_chunk_boundary(self):
+        # "12" of "123.45" decodes on its own; the stream must read on
+        for text in ("123.45,", "123.45", "-0.5e10]"):
+            for chunk_size in range(1, 4):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    stream = _JsonStream(io.StringIO(text), chunk_size)
+                    self.assertEqual(stream.value(), json.loads(text.rstrip(",]")))
+
+    def test_truncated_value_raises(self):
+        stream = _JsonStream(io.StringIO('{"a": [1, 2'), 4)
+        with self.assertRaises(json.JSONDecodeError):
+            stream.value()
+
+    def test_expect_reports_what_it_found(self):
+        stream = _JsonStream(io.StringIO("  "), 1)
+        with self.assertRaisesRegex(ValueError, "end of file"):
+            stream.expect("{")
+
+
+class IterLessonsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "lessons.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, text, chunk_size):
+        self.path.write_text(text, encoding="utf-8")
+        return list(iter_lessons(self.path, chunk_size=chunk_size))
+
+    def test_indented_and_compact_files(self):
+        for text in (json.dumps(LESSONS, indent=2, ensure_ascii=False),
+                     json.dumps(LESSONS, separators=(",", ":"), ensure_ascii=False)):
+            for chunk_size in (1, 2, 7, 64, 1 << 16):
+                with self.subTest(compact=" " not in text[:3], chunk_size=chunk_size):
+                    self.assertEqual(self.read(text, chunk_size), list(LESSONS.items()))
+
+    def test_empty_file(self):
+        for text in ("{}", " { \n } \n"):
+            with self.subTest(text=text):
+                self.assertEqual(self.read(text, 1), [])
+
+    def test_rejects_non_object(self):
+        with self.assertRaises(ValueError):
+            self.read("[1, 2]", 4)
+
+
+class WriteLessonsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "lessons.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_json_dumps(self):
+        lessons = {str(i): {"id": i, "title": f"Lesson {i}"} for i in range(70)}
+        for sample in ({}, {"1": LESSONS["1"]}, LESSONS, lessons):
+            with self.subTest(count=len(sample)):
+                self.assertEqual(write_lessons(self.path, sample.items()), len(sample))
+                self.assertEqual(self.path.read_text(encoding="utf-8"),
+                                 json.dumps(sample, indent=2, ensure_ascii=False))
+
+    def test_rewrites_the_file_it_reads(self):
+        write_lessons(self.path, LESSONS.items())
+        write_lessons(self.path, ((lesson_id, lesson) for lesson_id, lesson in iter_lessons(self.path, chunk_size=8)
+                                  if lesson_id != "2"))
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8")),
+                         {k: v for k, v in LESSONS.items() if k != "2"})
+
+    def test_failure_leaves_file_and_no_temp(self):
+        write_lessons(self.path, LESSONS.items())
+        before = self.path.read_text(encoding="utf-8")
+
+        def failing():
+            yield "1", LESSONS["1"]
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            write_lessons(self.path, failing())
+        self.assertEqual(self.path.read_text(encoding="utf-8"), before)
+        self.assertEqual(os.listdir(self.tmp.name), ["lessons.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()